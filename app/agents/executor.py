@@ -1,30 +1,332 @@
-from typing import Callable, Dict, Any
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Deque, Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from ..utils.cache import DiskCache, LRUCache
+
+_MISSING = object()
+
+class TaskOptions(NamedTuple):
+    """
+    Execution settings of a registered task.
+    """
+    timeout: Optional[float] = None
+    retries: int = 0
+    backoff: float = 0.5
+    max_concurrency: Optional[int] = None
+    memoize: bool = False
+    persist: bool = False
+    version: Optional[str] = None
+    path_args: Tuple[str, ...] = ()
+
+def _fingerprint_path(path: Any) -> Dict[str, List[Any]]:
+    """
+    Describe a file path by its absolute path, size and modification time.
+
+    A path that cannot be read (e.g. missing) is described by its absolute
+    path alone, so the task still runs and reports its own error.
+
+    Args:
+        path (Any): A ``str`` or ``os.PathLike`` path.
+
+    Returns:
+        Dict[str, List[Any]]: A JSON-encodable fingerprint.
+    """
+    path = os.path.abspath(os.fspath(path))
+    try:
+        status = os.stat(path)
+    except OSError:
+        return {"__path__": [path]}
+    return {"__path__": [path, status.st_size, status.st_mtime_ns]}
+
+def _canonical(value: Any) -> Any:
+    """
+    Convert a kwarg value that JSON cannot encode into a stable, encodable form.
+
+    Used as the ``default`` of ``json.dumps``; values without a content-based
+    form raise TypeError so their calls are not memoized. ``os.PathLike``
+    values are keyed by their size and modification time as well, so editing
+    a file invalidates the results computed from it; ``str`` paths need the
+    task's ``path_args``.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: A JSON-encodable representation of the value.
+    """
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(json.dumps(item, sort_keys=True, default=_canonical) for item in value)}
+    if isinstance(value, bytes):
+        return {"__bytes__": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"__ndarray__": [str(value.dtype), list(value.shape), digest]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "__fspath__"):
+        return _fingerprint_path(value)
+    raise TypeError(f"Cannot build a memoization key from {type(value).__name__}")
+
+def _wake(waiter: asyncio.Future):
+    """
+    Resolve an async limiter waiter unless it was already cancelled.
+
+    Args:
+        waiter (asyncio.Future): The waiter.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
+
+class ConcurrencyLimiter:
+    """
+    A counter of running calls shared by threads and event loops.
+
+    Unlike ``asyncio.Semaphore`` it is not bound to one event loop, so calls
+    made from worker threads, from ``asyncio.run`` on different threads and
+    from a running loop all draw from the same slots.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the ConcurrencyLimiter class.
+
+        Args:
+            limit (int): Maximum number of slots held at once.
+        """
+        self.limit = limit
+        self.active = 0
+        self._condition = threading.Condition()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot, blocking the calling thread until one is free.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (no limit).
+
+        Returns:
+            bool: True if a slot was taken, False on timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.active < self.limit, timeout):
+                return False
+            self.active += 1
+            return True
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot without blocking the running event loop.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (no limit).
+
+        Returns:
+            bool: True if a slot was taken, False on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._condition:
+                if self.active < self.limit:
+                    self.active += 1
+                    return True
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+                await asyncio.wait_for(waiter, remaining)
+            except BaseException as e:
+                with self._condition:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                    else:
+                        # A release already picked this waiter; hand the wakeup on
+                        self._wake_one()
+                if isinstance(e, asyncio.TimeoutError):
+                    return False
+                raise
+
+    def release(self):
+        """
+        Free a slot and wake one waiting thread and one waiting coroutine.
+        """
+        with self._condition:
+            if self.active == 0:
+                raise ValueError("ConcurrencyLimiter released more often than acquired.")
+            self.active -= 1
+            self._condition.notify()
+            self._wake_one()
+
+    def _wake_one(self):
+        """
+        Wake the oldest waiting coroutine whose event loop is still running; the caller holds the lock.
+        """
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+                return
+            except RuntimeError:
+                continue
 
 class TaskExecutor:
     """
     A class to manage and execute tasks or workflows.
+
+    Tasks may be plain functions or ``async def`` coroutines. Each task can
+    have a timeout, a number of retries with exponential backoff, and a limit
+    on how many calls of it run at once, so expensive tools such as the LLM or
+    web search are not oversubscribed by concurrent agent sessions. The limit
+    holds across ``execute_task`` and ``execute_task_async`` and across event
+    loops. Async tasks are cancelled when they time out; sync tasks run on a
+    bounded worker pool when a timeout is set (or on the event loop's behalf)
+    and are abandoned, not interrupted, when it expires. An abandoned call keeps
+    its concurrency slot until it actually returns, so retries cannot pile up
+    on a tool that is still busy.
+
+    Deterministic tasks can be memoized: results are cached under a SHA-256 of
+    the task name, the function's qualified name, an optional ``version`` and
+    the canonical JSON kwargs, in an in-memory LRU and, for tasks registered
+    with ``persist=True``, a pickled SQLite tier that survives restarts. Bump
+    ``version`` when a task's code changes to stop serving old persisted
+    results. Calls whose kwargs have no stable serialization are not cached.
     """
 
-    def __init__(self):
+    def __init__(self, memo_size: int = 1024, memo_path: Optional[str] = None, max_workers: int = 32):
         """
         Initialize the TaskExecutor with an empty task registry.
+
+        Args:
+            memo_size (int): Maximum number of memoized results kept in memory. Defaults to 1024.
+            memo_path (str, optional): Path of the SQLite file for persisted results. Defaults to None.
+            max_workers (int): Maximum number of worker threads running sync tasks with a
+                timeout or on behalf of ``execute_task_async``. Defaults to 32.
         """
         self.tasks = {}
+        self.options: Dict[str, TaskOptions] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0, "failures": 0, "retries": 0, "timeouts": 0, "memo_hits": 0, "memo_misses": 0
+        }
+        self.memo = LRUCache(maxsize=memo_size)
+        self.memo_disk = DiskCache(memo_path, table="task_results") if memo_path else None
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._limiters: Dict[str, ConcurrencyLimiter] = {}
+        self._worker_pool: Optional[ThreadPoolExecutor] = None
 
-    def register_task(self, task_name: str, task_function: Callable):
+    def register_task(
+        self,
+        task_name: str,
+        task_function: Callable,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        max_concurrency: Optional[int] = None,
+        memoize: bool = False,
+        persist: bool = False,
+        version: Optional[str] = None,
+        path_args: Iterable[str] = ()
+    ):
         """
         Register a task with a name and its corresponding function.
 
         Args:
             task_name (str): The name of the task.
-            task_function (Callable): The function to execute the task.
+            task_function (Callable): The function or ``async def`` coroutine function to execute the task.
+            timeout (float, optional): Seconds after which an attempt fails. Defaults to None (no limit).
+            retries (int, optional): Number of extra attempts after a failure. Defaults to 0.
+            backoff (float, optional): Delay before the first retry in seconds; doubles on each
+                further retry. Defaults to 0.5.
+            max_concurrency (int, optional): Maximum number of attempts of this task running at
+                once, including timed-out attempts that have not returned yet. Defaults to None
+                (unlimited).
+            memoize (bool, optional): Cache results by task name and kwargs; only for
+                deterministic tasks. Defaults to False.
+            persist (bool, optional): Also store memoized results on disk; requires
+                ``memo_path``. Defaults to False.
+            version (str, optional): Part of the memoization key; change it when the task's
+                behaviour changes. Defaults to None.
+            path_args (Iterable[str], optional): Names of kwargs holding file paths (``str``,
+                ``os.PathLike`` or lists of them) that the task reads; memoization keys
+                include each file's size and modification time. Defaults to ().
         """
+        if retries < 0:
+            raise ValueError("retries must not be negative.")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if persist and self.memo_disk is None:
+            raise ValueError("persist=True requires the executor to be created with a memo_path.")
+
         self.tasks[task_name] = task_function
+        self.options[task_name] = TaskOptions(
+            timeout, retries, backoff, max_concurrency, memoize or persist, persist, version, tuple(path_args)
+        )
+        # Results of a previous registration under this name may come from different code
+        for key, _ in self.memo.items():
+            if key[0] == task_name:
+                self.memo.pop(key)
+        self._limiters.pop(task_name, None)
+        if max_concurrency is not None:
+            self._limiters[task_name] = ConcurrencyLimiter(max_concurrency)
 
     def execute_task(self, task_name: str, **kwargs: Dict[str, Any]) -> Any:
         """
         Execute a registered task by name with the provided arguments.
 
+        Async tasks are run to completion on a new event loop; inside a running
+        loop, use ``execute_task_async`` instead.
+
+        Args:
+            task_name (str): The name of the task to execute.
+            **kwargs (Dict[str, Any]): Arguments to pass to the task function.
+
+        Returns:
+            Any: The result of the task execution.
+        """
+        if task_name not in self.tasks:
+            raise ValueError(f"Task '{task_name}' is not registered.")
+        if inspect.iscoroutinefunction(self.tasks[task_name]):
+            return asyncio.run(self.execute_task_async(task_name, **kwargs))
+
+        options = self.options.get(task_name, TaskOptions())
+        key = self._memo_key(task_name, options, kwargs)
+        result = self._memo_get(key, options)
+        if result is not _MISSING:
+            return result
+
+        self._count("calls")
+        try:
+            for attempt in range(options.retries + 1):
+                try:
+                    result = self._call_sync(task_name, options.timeout, kwargs)
+                    self._memo_put(key, options, result)
+                    return result
+                except Exception:
+                    if attempt == options.retries:
+                        raise
+                    self._count("retries")
+                    time.sleep(options.backoff * 2 ** attempt)
+        except Exception as e:
+            self._count("failures")
+            raise RuntimeError(f"Failed to execute task '{task_name}': {e}")
+
+    async def execute_task_async(self, task_name: str, **kwargs: Dict[str, Any]) -> Any:
+        """
+        Execute a registered task on the running event loop.
+
+        Coroutine tasks are awaited and cancelled on timeout; sync tasks run on
+        the executor's worker pool so they do not block the loop.
+
         Args:
             task_name (str): The name of the task to execute.
             **kwargs (Dict[str, Any]): Arguments to pass to the task function.
@@ -35,11 +337,243 @@ class TaskExecutor:
         if task_name not in self.tasks:
             raise ValueError(f"Task '{task_name}' is not registered.")
 
+        options = self.options.get(task_name, TaskOptions())
+        key = self._memo_key(task_name, options, kwargs)
+        result = self._memo_get(key, options)
+        if result is not _MISSING:
+            return result
+
+        self._count("calls")
         try:
-            return self.tasks[task_name](**kwargs)
+            for attempt in range(options.retries + 1):
+                try:
+                    result = await self._call_async(task_name, options.timeout, kwargs)
+                    self._memo_put(key, options, result)
+                    return result
+                except Exception:
+                    if attempt == options.retries:
+                        raise
+                    self._count("retries")
+                    await asyncio.sleep(options.backoff * 2 ** attempt)
         except Exception as e:
+            self._count("failures")
             raise RuntimeError(f"Failed to execute task '{task_name}': {e}")
 
+    def clear_memo(self):
+        """
+        Drop all memoized results from memory and disk.
+        """
+        self.memo.clear()
+        if self.memo_disk is not None:
+            self.memo_disk.clear()
+
+    @staticmethod
+    def memo_key(
+        task_name: str,
+        kwargs: Dict[str, Any],
+        function: Optional[Callable] = None,
+        version: Optional[str] = None,
+        path_args: Iterable[str] = ()
+    ) -> str:
+        """
+        Build the content-addressed key of a task call.
+
+        Args:
+            task_name (str): The name of the task.
+            kwargs (Dict[str, Any]): The call's keyword arguments.
+            function (Callable, optional): The task function; its module and qualified
+                name are part of the key. Defaults to None.
+            version (str, optional): The task's version. Defaults to None.
+            path_args (Iterable[str], optional): Names of kwargs holding file paths, keyed by
+                their file's size and modification time. Defaults to ().
+
+        Returns:
+            str: A SHA-256 hex digest of the task identity and canonical JSON kwargs.
+
+        Raises:
+            TypeError: If a kwarg has no stable serialization.
+        """
+        path_kwargs = {}
+        for name in path_args:
+            value = kwargs.get(name)
+            if isinstance(value, (list, tuple)):
+                path_kwargs[name] = [_fingerprint_path(path) for path in value]
+            elif isinstance(value, str) or hasattr(value, "__fspath__"):
+                path_kwargs[name] = _fingerprint_path(value)
+        kwargs = {**kwargs, **path_kwargs}
+
+        identity = ""
+        if function is not None:
+            identity = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+        payload = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=_canonical)
+        return hashlib.sha256(f"{task_name}\0{identity}\0{version or ''}\0{payload}".encode("utf-8")).hexdigest()
+
+    def _memo_key(self, task_name: str, options: TaskOptions, kwargs: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Return the memoization key of a call, or None if the call is not memoized.
+
+        Args:
+            task_name (str): The name of the task.
+            options (TaskOptions): The task's settings.
+            kwargs (Dict[str, Any]): The call's keyword arguments.
+
+        Returns:
+            Optional[Tuple[str, str]]: The task name and the call's digest, or None.
+        """
+        if not options.memoize:
+            return None
+        try:
+            return task_name, self.memo_key(
+                task_name, kwargs, self.tasks[task_name], options.version, options.path_args
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def _memo_get(self, key: Optional[Tuple[str, str]], options: TaskOptions) -> Any:
+        """
+        Look up a memoized result in memory, then on disk.
+
+        Args:
+            key (Tuple[str, str], optional): The memoization key, or None if the call is not memoized.
+            options (TaskOptions): The task's settings.
+
+        Returns:
+            Any: The cached result, or ``_MISSING``.
+        """
+        if key is None:
+            return _MISSING
+        result = self.memo.get(key, _MISSING)
+        if result is _MISSING and options.persist:
+            blob = self.memo_disk.get(key[1])
+            if blob is not None:
+                result = pickle.loads(blob)
+                self.memo.put(key, result)
+        self._count("memo_misses" if result is _MISSING else "memo_hits")
+        return result
+
+    def _memo_put(self, key: Optional[Tuple[str, str]], options: TaskOptions, result: Any):
+        """
+        Store a memoized result; results that cannot be pickled are kept in memory only.
+
+        Args:
+            key (Tuple[str, str], optional): The memoization key, or None if the call is not memoized.
+            options (TaskOptions): The task's settings.
+            result (Any): The task's result.
+        """
+        if key is None:
+            return
+        self.memo.put(key, result)
+        if options.persist:
+            try:
+                blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return
+            self.memo_disk.put(key[1], blob)
+
+    def _call_sync(self, task_name: str, timeout: Optional[float], kwargs: Dict[str, Any]) -> Any:
+        """
+        Run one attempt of a sync task, on a worker thread if it has a timeout.
+
+        The timeout covers both waiting for a concurrency slot and the call itself.
+
+        Args:
+            task_name (str): The name of the task.
+            timeout (float, optional): Seconds to wait for the result.
+            kwargs (Dict[str, Any]): Arguments to pass to the task function.
+
+        Returns:
+            Any: The result of the task.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        limiter = self._limiters.get(task_name)
+        if limiter is not None and not limiter.acquire(timeout):
+            self._count("timeouts")
+            raise TimeoutError(f"timed out after {timeout}s waiting for a free slot")
+
+        if timeout is None:
+            try:
+                return self.tasks[task_name](**kwargs)
+            finally:
+                if limiter is not None:
+                    limiter.release()
+
+        future = self._submit(task_name, kwargs, limiter)
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+        except FutureTimeoutError:
+            future.cancel()
+            self._count("timeouts")
+            raise TimeoutError(f"timed out after {timeout}s")
+
+    async def _call_async(self, task_name: str, timeout: Optional[float], kwargs: Dict[str, Any]) -> Any:
+        """
+        Run one attempt of a task on the running event loop.
+
+        Args:
+            task_name (str): The name of the task.
+            timeout (float, optional): Seconds to wait for the result.
+            kwargs (Dict[str, Any]): Arguments to pass to the task function.
+
+        Returns:
+            Any: The result of the task.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        limiter = self._limiters.get(task_name)
+        if limiter is not None and not await limiter.acquire_async(timeout):
+            self._count("timeouts")
+            raise TimeoutError(f"timed out after {timeout}s waiting for a free slot")
+
+        remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+        function = self.tasks[task_name]
+        try:
+            if inspect.iscoroutinefunction(function):
+                try:
+                    return await asyncio.wait_for(function(**kwargs), remaining)
+                finally:
+                    if limiter is not None:
+                        limiter.release()
+            return await asyncio.wait_for(asyncio.wrap_future(self._submit(task_name, kwargs, limiter)), remaining)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            raise TimeoutError(f"timed out after {timeout}s")
+
+    def _submit(self, task_name: str, kwargs: Dict[str, Any], limiter: Optional[ConcurrencyLimiter]) -> Future:
+        """
+        Run a sync task on the worker pool; its slot is released when the call returns, even if abandoned.
+
+        Args:
+            task_name (str): The name of the task.
+            kwargs (Dict[str, Any]): Arguments to pass to the task function.
+            limiter (ConcurrencyLimiter, optional): The task's limiter, already acquired.
+
+        Returns:
+            Future: The future of the call.
+        """
+        with self._stats_lock:
+            if self._worker_pool is None:
+                self._worker_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-worker")
+        try:
+            future = self._worker_pool.submit(self.tasks[task_name], **kwargs)
+        except Exception:
+            if limiter is not None:
+                limiter.release()
+            raise
+        if limiter is not None:
+            future.add_done_callback(lambda _: limiter.release())
+        return future
+
+    def _count(self, counter: str, amount: int = 1):
+        """
+        Increment an execution counter.
+
+        Args:
+            counter (str): The name of the counter in ``stats``.
+            amount (int, optional): The increment. Defaults to 1.
+        """
+        with self._stats_lock:
+            self.stats[counter] += amount
+
 if __name__ == "__main__":
     # Example usage
     executor = TaskExecutor()
@@ -51,10 +585,61 @@ if __name__ == "__main__":
     def greet(name: str) -> str:
         return f"Hello, {name}!"
 
+    async def search(query: str) -> str:
+        await asyncio.sleep(0.1)
+        return f"Results for {query}"
+
     # Register tasks
     executor.register_task("add", add_numbers)
     executor.register_task("greet", greet)
+    executor.register_task("search", search, timeout=2.0, retries=2, max_concurrency=2)
 
     # Execute tasks
     print("Adding numbers:", executor.execute_task("add", a=5, b=3))
-    print("Greeting:", executor.execute_task("greet", name="Alice"))
\ No newline at end of file
+    print("Greeting:", executor.execute_task("greet", name="Alice"))
+
+    # Many concurrent sessions share one event loop; at most two searches run at once
+    async def sessions():
+        return await asyncio.gather(*(executor.execute_task_async("search", query=f"q{i}") for i in range(6)))
+
+    print("Searches:", asyncio.run(sessions()))
+
+    # Deterministic tasks can be memoized; the second call is served from the cache
+    def word_count(text: str) -> int:
+        time.sleep(0.5)
+        return len(text.split())
+
+    executor.register_task("word_count", word_count, memoize=True)
+    for _ in range(2):
+        start_time = time.perf_counter()
+        count = executor.execute_task("word_count", text="the quick brown fox")
+        print(f"Word count: {count} ({time.perf_counter() - start_time:.3f}s)")
+    print("Executor stats:", executor.stats)
+
+    # Tasks reading files by ``str`` path name those kwargs in path_args, so editing a file
+    # invalidates its cached results
+    import tempfile
+
+    def line_count(file_path: str) -> int:
+        with open(file_path, "r", encoding="utf-8") as file:
+            return sum(1 for _ in file)
+
+    executor.register_task("line_count", line_count, memoize=True, path_args=("file_path",))
+    with tempfile.TemporaryDirectory() as directory:
+        notes_path = os.path.join(directory, "notes.txt")
+        with open(notes_path, "w", encoding="utf-8") as file:
+            file.write("first\n")
+        assert executor.execute_task("line_count", file_path=notes_path) == 1
+        assert executor.execute_task("line_count", file_path=notes_path) == 1
+        misses = executor.stats["memo_misses"]
+        with open(notes_path, "a", encoding="utf-8") as file:
+            file.write("second\n")
+        assert executor.execute_task("line_count", file_path=notes_path) == 2
+        assert executor.stats["memo_misses"] == misses + 1
+        print("Line count after editing the file:", executor.execute_task("line_count", file_path=notes_path))
+
+        # A missing file is keyed by its path alone; the task's own error is reported
+        try:
+            executor.execute_task("line_count", file_path=os.path.join(directory, "missing.txt"))
+        except RuntimeError as e:
+            print("Missing file:", e)
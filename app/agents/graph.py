@@ -1,16 +1,31 @@
 import networkx as nx
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
+from .csr_graph import CSRGraph
+
+GRAPH_BACKENDS = ("networkx", "csr")
 
 class GraphManager:
     """
     A class to manage and process graph structures.
+
+    Backends:
+        - 'networkx': a NetworkX ``DiGraph``; flexible, but several dicts per node and edge.
+        - 'csr': a ``CSRGraph`` with integer node IDs and CSR adjacency arrays, which caches
+          the topological order and shortest-path trees; suits large graphs.
     """
 
-    def __init__(self):
+    def __init__(self, backend: str = "networkx"):
         """
         Initialize the GraphManager with an empty directed graph.
+
+        Args:
+            backend (str): 'networkx' or 'csr'. Defaults to 'networkx'.
         """
-        self.graph = nx.DiGraph()
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(f"Unsupported graph backend '{backend}'. Choose from {GRAPH_BACKENDS}.")
+
+        self.backend = backend
+        self.graph = nx.DiGraph() if backend == "networkx" else CSRGraph()
 
     def add_node(self, node_id: Any, **attributes: Dict[str, Any]):
         """
@@ -33,6 +48,15 @@ class GraphManager:
         """
         self.graph.add_edge(source, target, **attributes)
 
+    def add_edges_from(self, edges: Iterable[Tuple[Any, Any]]):
+        """
+        Add many directed edges at once.
+
+        Args:
+            edges (Iterable[Tuple[Any, Any]]): (source, target) pairs.
+        """
+        self.graph.add_edges_from(edges)
+
     def get_neighbors(self, node_id: Any) -> List[Any]:
         """
         Get the neighbors of a node.
@@ -43,8 +67,49 @@ class GraphManager:
         Returns:
             List[Any]: A list of neighboring nodes.
         """
+        if self.backend == "csr":
+            return self.graph.get_neighbors(node_id)
         return list(self.graph.successors(node_id))
 
+    def nodes(self) -> List[Any]:
+        """
+        Get all nodes in insertion order.
+
+        Returns:
+            List[Any]: The node identifiers.
+        """
+        if self.backend == "csr":
+            return self.graph.nodes()
+        return list(self.graph.nodes)
+
+    def get_predecessors(self, node_id: Any) -> List[Any]:
+        """
+        Get the nodes with an edge into a node.
+
+        Args:
+            node_id (Any): The node identifier.
+
+        Returns:
+            List[Any]: A list of predecessor nodes.
+        """
+        if self.backend == "csr":
+            return self.graph.get_predecessors(node_id)
+        return list(self.graph.predecessors(node_id))
+
+    def topological_order(self) -> List[Any]:
+        """
+        Order the nodes so that every edge points forward.
+
+        Returns:
+            List[Any]: The nodes in topological order.
+        """
+        if self.backend == "csr":
+            return self.graph.topological_order()
+        try:
+            return list(nx.topological_sort(self.graph))
+        except nx.NetworkXUnfeasible:
+            raise ValueError("The graph contains a cycle.")
+
     def shortest_path(self, source: Any, target: Any) -> List[Any]:
         """
         Find the shortest path between two nodes.
@@ -56,6 +121,8 @@ class GraphManager:
         Returns:
             List[Any]: A list of nodes representing the shortest path.
         """
+        if self.backend == "csr":
+            return self.graph.shortest_path(source, target)
         try:
             return nx.shortest_path(self.graph, source=source, target=target)
         except nx.NetworkXNoPath:
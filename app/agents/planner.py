@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .executor import TaskExecutor
 from .graph import GraphManager
+from .scheduler import DAGScheduler
 
 class TaskPlanner:
     """
@@ -17,6 +18,7 @@ class TaskPlanner:
         """
         self.executor = executor
         self.graph_manager = graph_manager
+        self.last_report: Dict[str, Any] = {}
 
     def add_task(self, task_name: str, dependencies: List[str] = None, **attributes: Dict[str, Any]):
         """
@@ -32,16 +34,32 @@ class TaskPlanner:
             for dependency in dependencies:
                 self.graph_manager.add_edge(dependency, task_name)
 
-    def execute_plan(self):
+    def execute_plan(
+        self,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        task_kwargs: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
-        Execute the planned tasks in the order of their dependencies.
+        Execute the planned tasks, running independent tasks concurrently.
+
+        Each task starts once all of its dependencies have finished. Tasks that
+        take an ``upstream`` argument receive their dependencies' results. The
+        per-task wall times and the critical path are stored in ``last_report``.
+
+        Args:
+            mode (str, optional): 'thread', 'process' or 'asyncio', see ``DAGScheduler``. Defaults to 'thread'.
+            max_workers (int, optional): Maximum number of tasks running at once. Defaults to None.
+            task_kwargs (Dict[str, Dict[str, Any]], optional): Extra keyword arguments per task name. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The result of each task by name.
         """
         try:
-            # Get the topological order of tasks
-            task_order = list(self.graph_manager.graph)
-            for task_name in task_order:
-                print(f"Executing task: {task_name}")
-                self.executor.execute_task(task_name)
+            scheduler = DAGScheduler(self.executor, mode=mode, max_workers=max_workers)
+            results = scheduler.run(self.graph_manager, task_kwargs)
+            self.last_report = scheduler.last_report
+            return results
         except Exception as e:
             raise RuntimeError(f"Failed to execute plan: {e}")
 
@@ -0,0 +1,308 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .executor import TaskExecutor
+from .graph import GraphManager
+
+SCHEDULER_MODES = ("thread", "process", "asyncio")
+
+def _timed_call(function: Callable, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+    """
+    Call a function and measure its wall time where it runs.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        function (Callable): The function to call.
+        kwargs (Dict[str, Any]): Keyword arguments for the call.
+
+    Returns:
+        Tuple[Any, float]: The result and the elapsed seconds.
+    """
+    start_time = time.perf_counter()
+    result = function(**kwargs)
+    return result, time.perf_counter() - start_time
+
+class DAGScheduler:
+    """
+    A class to run a task graph with independent tasks in parallel.
+
+    Ready tasks are tracked with Kahn's algorithm: a task is dispatched as soon
+    as all of its dependencies have finished, so a plan takes roughly as long as
+    its longest dependency chain instead of the sum of all tasks. Tasks that
+    declare an ``upstream`` parameter receive a dict of their dependencies'
+    results. After each run, ``last_report`` holds per-task wall times and the
+    critical path.
+
+    Modes:
+        - 'thread': a thread pool; suits I/O-bound tasks and tasks that release the GIL.
+        - 'process': a process pool; task functions, arguments and results must be picklable.
+        - 'asyncio': an event loop; tasks go through ``TaskExecutor.execute_task_async``, so
+          ``async def`` tasks are awaited, others run in threads, and task timeouts, retries
+          and concurrency limits apply.
+    """
+
+    def __init__(self, executor: TaskExecutor, mode: str = "thread", max_workers: Optional[int] = None):
+        """
+        Initialize the DAGScheduler class.
+
+        Args:
+            executor (TaskExecutor): The executor holding the registered tasks.
+            mode (str): 'thread', 'process' or 'asyncio'. Defaults to 'thread'.
+            max_workers (int, optional): Maximum number of tasks running at once. Defaults to
+                the pool's default.
+        """
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"Unsupported scheduler mode '{mode}'. Choose from {SCHEDULER_MODES}.")
+
+        self.executor = executor
+        self.mode = mode
+        self.max_workers = max_workers
+        self.last_report: Dict[str, Any] = {}
+
+    def run(self, graph_manager: GraphManager, task_kwargs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Run every task of a graph, respecting its edges as dependencies.
+
+        Args:
+            graph_manager (GraphManager): The task graph; an edge A -> B means B depends on A.
+            task_kwargs (Dict[str, Dict[str, Any]], optional): Extra keyword arguments per task name. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The result of each task by name.
+        """
+        if self.mode == "asyncio":
+            return asyncio.run(self.run_async(graph_manager, task_kwargs))
+
+        predecessors, successors = self._snapshot(graph_manager)
+        in_degree = {node: len(parents) for node, parents in predecessors.items()}
+        results: Dict[Any, Any] = {}
+        task_seconds: Dict[Any, float] = {}
+        start_time = time.perf_counter()
+
+        pool_class = ThreadPoolExecutor if self.mode == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=self.max_workers) as pool:
+            pending: Dict[Future, Any] = {}
+
+            def submit(node):
+                print(f"Executing task: {node}")
+                function, kwargs = self._prepare_call(node, predecessors, results, task_kwargs)
+                pending[pool.submit(_timed_call, function, kwargs)] = node
+
+            for node in [node for node, degree in in_degree.items() if degree == 0]:
+                submit(node)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    try:
+                        results[node], task_seconds[node] = future.result()
+                    except Exception as e:
+                        for other in pending:
+                            other.cancel()
+                        if self.mode == "process":
+                            raise RuntimeError(f"Failed to execute task '{node}': {e}")
+                        raise
+                    for child in successors[node]:
+                        in_degree[child] -= 1
+                        if in_degree[child] == 0:
+                            submit(child)
+
+        self._finish(predecessors, results, task_seconds, time.perf_counter() - start_time)
+        return results
+
+    async def run_async(
+        self, graph_manager: GraphManager, task_kwargs: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every task of a graph on the current event loop, see ``run``.
+
+        Args:
+            graph_manager (GraphManager): The task graph; an edge A -> B means B depends on A.
+            task_kwargs (Dict[str, Dict[str, Any]], optional): Extra keyword arguments per task name. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The result of each task by name.
+        """
+        predecessors, successors = self._snapshot(graph_manager)
+        in_degree = {node: len(parents) for node, parents in predecessors.items()}
+        results: Dict[Any, Any] = {}
+        task_seconds: Dict[Any, float] = {}
+        limiter = asyncio.Semaphore(self.max_workers) if self.max_workers else None
+        start_time = time.perf_counter()
+
+        async def run_task(node):
+            _, kwargs = self._prepare_call(node, predecessors, results, task_kwargs)
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                print(f"Executing task: {node}")
+                task_start = time.perf_counter()
+                result = await self.executor.execute_task_async(node, **kwargs)
+                return result, time.perf_counter() - task_start
+            finally:
+                if limiter is not None:
+                    limiter.release()
+
+        pending: Dict[asyncio.Task, Any] = {
+            asyncio.ensure_future(run_task(node)): node for node, degree in in_degree.items() if degree == 0
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = pending.pop(task)
+                    results[node], task_seconds[node] = task.result()
+                    for child in successors[node]:
+                        in_degree[child] -= 1
+                        if in_degree[child] == 0:
+                            pending[asyncio.ensure_future(run_task(child))] = child
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self._finish(predecessors, results, task_seconds, time.perf_counter() - start_time)
+        return results
+
+    def _snapshot(self, graph_manager: GraphManager) -> Tuple[Dict[Any, List[Any]], Dict[Any, List[Any]]]:
+        """
+        Copy the graph's adjacency so it can be read without touching the graph during the run.
+
+        Args:
+            graph_manager (GraphManager): The task graph.
+
+        Returns:
+            Tuple[Dict[Any, List[Any]], Dict[Any, List[Any]]]: Predecessors and successors of every node.
+        """
+        nodes = graph_manager.nodes()
+        predecessors = {node: graph_manager.get_predecessors(node) for node in nodes}
+        successors = {node: graph_manager.get_neighbors(node) for node in nodes}
+        return predecessors, successors
+
+    def _prepare_call(
+        self,
+        node: Any,
+        predecessors: Dict[Any, List[Any]],
+        results: Dict[Any, Any],
+        task_kwargs: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Tuple[Callable, Dict[str, Any]]:
+        """
+        Build the callable and keyword arguments for one task.
+
+        Args:
+            node (Any): The task name.
+            predecessors (Dict[Any, List[Any]]): Dependencies of every task.
+            results (Dict[Any, Any]): Results of finished tasks.
+            task_kwargs (Dict[str, Dict[str, Any]], optional): Extra keyword arguments per task name.
+
+        Returns:
+            Tuple[Callable, Dict[str, Any]]: The function to call and its keyword arguments.
+        """
+        if node not in self.executor.tasks:
+            raise ValueError(f"Task '{node}' is not registered.")
+
+        kwargs = dict((task_kwargs or {}).get(node, {}))
+        if "upstream" in inspect.signature(self.executor.tasks[node]).parameters:
+            kwargs["upstream"] = {parent: results[parent] for parent in predecessors[node]}
+
+        if self.mode == "process":
+            # The executor itself may hold unpicklable tasks, so only the function is sent
+            return self.executor.tasks[node], kwargs
+        return partial(self.executor.execute_task, node), kwargs
+
+    def _finish(
+        self,
+        predecessors: Dict[Any, List[Any]],
+        results: Dict[Any, Any],
+        task_seconds: Dict[Any, float],
+        wall_seconds: float
+    ):
+        """
+        Check that every task ran and compute the run report.
+
+        Args:
+            predecessors (Dict[Any, List[Any]]): Dependencies of every task.
+            results (Dict[Any, Any]): Results of finished tasks.
+            task_seconds (Dict[Any, float]): Wall time of every finished task.
+            wall_seconds (float): Wall time of the whole run.
+        """
+        if len(results) != len(predecessors):
+            blocked = [node for node in predecessors if node not in results]
+            raise ValueError(f"The task graph contains a cycle; tasks never became ready: {blocked}")
+
+        # Longest chain by summed task time, visiting tasks in dependency-depth order
+        finish: Dict[Any, float] = {}
+        previous: Dict[Any, Any] = {}
+        depths: Dict[Any, int] = {}
+        for node in sorted(task_seconds, key=lambda item: self._depth(item, predecessors, depths)):
+            parent = max(predecessors[node], key=lambda item: finish[item], default=None)
+            finish[node] = task_seconds[node] + (finish[parent] if parent is not None else 0.0)
+            previous[node] = parent
+
+        critical_path: List[Any] = []
+        node = max(finish, key=finish.get, default=None)
+        while node is not None:
+            critical_path.append(node)
+            node = previous[node]
+        critical_path.reverse()
+
+        self.last_report = {
+            "mode": self.mode,
+            "wall_seconds": wall_seconds,
+            "task_seconds": task_seconds,
+            "total_task_seconds": sum(task_seconds.values()),
+            "critical_path": critical_path,
+            "critical_path_seconds": finish[critical_path[-1]] if critical_path else 0.0,
+        }
+
+    @staticmethod
+    def _depth(node: Any, predecessors: Dict[Any, List[Any]], memo: Dict[Any, int]) -> int:
+        """
+        Length of the longest dependency chain ending at a node.
+
+        Args:
+            node (Any): The task name.
+            predecessors (Dict[Any, List[Any]]): Dependencies of every task.
+            memo (Dict[Any, int]): Depths computed so far.
+
+        Returns:
+            int: The number of tasks before this one on its longest chain.
+        """
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            missing = [parent for parent in predecessors[current] if parent not in memo]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            memo[current] = max((memo[parent] + 1 for parent in predecessors[current]), default=0)
+        return memo[node]
+
+if __name__ == "__main__":
+    # Example usage: a wide plan finishes in about the time of its longest chain
+    executor = TaskExecutor()
+    graph_manager = GraphManager()
+
+    def fetch(upstream):
+        time.sleep(0.2)
+        return 1
+
+    def combine(upstream):
+        return sum(upstream.values())
+
+    executor.register_task("combine", combine)
+    graph_manager.add_node("combine")
+    for i in range(8):
+        executor.register_task(f"fetch_{i}", fetch)
+        graph_manager.add_edge(f"fetch_{i}", "combine")
+
+    scheduler = DAGScheduler(executor, mode="thread", max_workers=8)
+    results = scheduler.run(graph_manager)
+    print("Combined result:", results["combine"])
+    print(f"Wall time: {scheduler.last_report['wall_seconds']:.2f}s, "
+          f"sum of task times: {scheduler.last_report['total_task_seconds']:.2f}s")
+    print("Critical path:", scheduler.last_report["critical_path"])
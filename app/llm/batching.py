@@ -0,0 +1,233 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+class GenerationRequest(NamedTuple):
+    """
+    A prompt waiting to be generated, with the future its caller waits on.
+    """
+    prompt: str
+    params: Tuple[int, float, int]
+    future: Future
+    enqueued_at: float
+
+class DynamicBatcher:
+    """
+    A scheduler that merges concurrent generation requests into batched ``generate`` calls.
+
+    A single worker thread takes the first waiting request, then keeps
+    collecting requests for up to ``window_ms`` milliseconds or until
+    ``max_batch_size`` are waiting. Requests with the same sampling parameters
+    are left-padded into one ``LocalLLM.generate_batch`` call and each caller's
+    future receives its own result. ``max_length`` is honoured per prompt, so a
+    caller's output does not depend on which other requests share its batch.
+    """
+
+    def __init__(self, llm, max_batch_size: int = 8, window_ms: float = 5.0):
+        """
+        Initialize the DynamicBatcher class.
+
+        Args:
+            llm (LocalLLM): The model to generate with.
+            max_batch_size (int): Maximum number of prompts per ``generate`` call. Defaults to 8.
+            window_ms (float): How long to wait for more requests after the first one, in
+                milliseconds. Defaults to 5.0.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+        self._queue: "queue.Queue[Optional[GenerationRequest]]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Guards ``_closed`` so no request is queued after the stop sentinel
+        self._state_lock = threading.Lock()
+        self._closed = False
+        self._reset_counters()
+        self._worker = threading.Thread(target=self._run, name="llm-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str, max_length: int = 50, temperature: float = 1.0, top_k: int = 50) -> Future:
+        """
+        Queue a prompt for generation.
+
+        Args:
+            prompt (str): Input prompt for the model.
+            max_length (int, optional): Maximum length of the generated text. Defaults to 50.
+            temperature (float, optional): Sampling temperature. Defaults to 1.0.
+            top_k (int, optional): Top-k sampling. Defaults to 50.
+
+        Returns:
+            Future: Resolves to the generated text, or raises the generation error.
+        """
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("DynamicBatcher is closed.")
+            self._queue.put(GenerationRequest(prompt, (max_length, temperature, top_k), future, time.perf_counter()))
+        return future
+
+    def close(self):
+        """
+        Stop accepting requests and wait for queued ones to finish.
+        """
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """
+        Throughput and latency counters for tuning the batching window.
+
+        Returns:
+            Dict[str, float]: Request, batch and token counts, average batch size,
+            generated tokens per second of generation time, and average and maximum
+            queue wait in milliseconds.
+        """
+        with self._lock:
+            requests = self._requests
+            return {
+                "requests": requests,
+                "batches": self._batches,
+                "average_batch_size": requests / self._batches if self._batches else 0.0,
+                "generated_tokens": self._generated_tokens,
+                "tokens_per_second": (
+                    self._generated_tokens / self._generation_seconds if self._generation_seconds else 0.0
+                ),
+                "average_queue_wait_ms": self._queue_wait_seconds / requests * 1000 if requests else 0.0,
+                "max_queue_wait_ms": self._max_queue_wait_seconds * 1000,
+            }
+
+    def reset_metrics(self):
+        """
+        Reset the throughput and latency counters.
+        """
+        with self._lock:
+            self._reset_counters()
+
+    def _reset_counters(self):
+        """
+        Zero all metric counters. Callers hold the lock, except during initialization.
+        """
+        self._requests = 0
+        self._batches = 0
+        self._generated_tokens = 0
+        self._generation_seconds = 0.0
+        self._queue_wait_seconds = 0.0
+        self._max_queue_wait_seconds = 0.0
+
+    def _run(self):
+        """
+        Run the worker loop, then fail any requests it left in the queue.
+        """
+        try:
+            self._process()
+        finally:
+            # Also reached if the worker dies, so later submits fail instead of hanging
+            with self._state_lock:
+                self._closed = True
+            self._fail_pending(RuntimeError("DynamicBatcher is closed."))
+
+    def _fail_pending(self, error: Exception):
+        """
+        Resolve every queued request with an error, so no caller waits forever.
+
+        Args:
+            error (Exception): The error set on the requests' futures.
+        """
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None and not request.future.done():
+                request.future.set_exception(error)
+
+    def _process(self):
+        """
+        Worker loop: collect a batch, generate it, repeat until closed.
+        """
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.window_ms / 1000.0
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+
+            groups: Dict[Tuple[int, float, int], List[GenerationRequest]] = {}
+            for request in batch:
+                groups.setdefault(request.params, []).append(request)
+            for params, requests in groups.items():
+                self._generate(params, requests)
+            if stop:
+                return
+
+    def _generate(self, params: Tuple[int, float, int], requests: List[GenerationRequest]):
+        """
+        Run one batched ``generate`` call and resolve the callers' futures.
+
+        Args:
+            params (Tuple[int, float, int]): The shared (max_length, temperature, top_k).
+            requests (List[GenerationRequest]): The requests to generate.
+        """
+        started_at = time.perf_counter()
+        max_length, temperature, top_k = params
+        try:
+            texts, generated_tokens = self.llm.generate_batch(
+                [request.prompt for request in requests],
+                max_length=max_length,
+                temperature=temperature,
+                top_k=top_k,
+                return_num_tokens=True
+            )
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+        finished_at = time.perf_counter()
+
+        for request, text in zip(requests, texts):
+            request.future.set_result(text)
+
+        with self._lock:
+            waits = [started_at - request.enqueued_at for request in requests]
+            self._requests += len(requests)
+            self._batches += 1
+            self._generated_tokens += generated_tokens
+            self._generation_seconds += finished_at - started_at
+            self._queue_wait_seconds += sum(waits)
+            self._max_queue_wait_seconds = max(self._max_queue_wait_seconds, *waits)
+
+if __name__ == "__main__":
+    # Example usage: eight concurrent callers served by batched generate calls
+    from concurrent.futures import ThreadPoolExecutor
+    from .local_llm import LocalLLM
+
+    llm = LocalLLM("gpt2")
+    batcher = DynamicBatcher(llm, max_batch_size=8, window_ms=10)
+    prompts = [f"Fact number {i} about vector search:" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda prompt: batcher.submit(prompt, max_length=40).result(), prompts))
+    for text in results:
+        print(text)
+    print("Batching metrics:", batcher.metrics)
+    batcher.close()
@@ -1,42 +1,191 @@
+import copy
 import os
+import threading
+import time
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache, TextIteratorStreamer
+from ..utils.cache import LRUCache
+
+QUANTIZATION_MODES = ("int8", "4bit")
+
+def _current_rss_bytes() -> int:
+    """
+    Return the current resident set size of this process.
+
+    Reads ``/proc/self/statm`` on Linux and falls back to ``psutil`` when it is
+    installed. Returns 0 where neither is available, so memory deltas are never
+    computed from the peak RSS.
+
+    Returns:
+        int: The resident memory in bytes, or 0 if it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+def _conv1d_to_linear(module: torch.nn.Module):
+    """
+    Replace GPT-2 style ``Conv1D`` layers with equivalent ``torch.nn.Linear`` layers in place.
+
+    ``quantize_dynamic`` only handles ``nn.Linear``, while GPT-2 family models
+    implement their attention and MLP projections as ``Conv1D`` (a linear layer
+    with a transposed weight); without this only ``lm_head`` would be quantized.
+
+    Args:
+        module (torch.nn.Module): The model or submodule to convert.
+    """
+    try:
+        from transformers.pytorch_utils import Conv1D
+    except ImportError:
+        return
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, dtype=child.weight.dtype)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
 
 class LocalLLM:
     """
     A class to manage and run a local language model (LLM).
+
+    Prompts can be split into a shared ``prefix`` (system prompt, retrieved
+    context) and the rest. The key/value cache of each prefix is computed once
+    and kept in a small LRU cache, so later prompts with the same prefix only
+    encode their own tokens before generation starts.
+
+    With ``lazy_load`` the weights are only read on the first call that needs
+    them, so processes that never generate pay nothing at startup. Weights are
+    loaded with ``low_cpu_mem_usage`` (safetensors checkpoints are memory-mapped
+    instead of copied), and can be quantized: 'int8' applies dynamic int8
+    quantization to the ``torch.nn.Linear`` layers on CPU (GPT-2 style ``Conv1D``
+    projections are converted to ``Linear`` first) or loads 8-bit weights
+    with bitsandbytes on CUDA; '4bit' loads 4-bit bitsandbytes weights and
+    requires CUDA.
     """
 
-    def __init__(self, model_name_or_path: str, device: str = None):
+    def __init__(
+        self,
+        model_name_or_path: str,
+        device: str = None,
+        prefix_cache_size: int = 8,
+        lazy_load: bool = False,
+        quantization: Optional[str] = None,
+        use_safetensors: Optional[bool] = None,
+        response_cache=None
+    ):
         """
         Initialize the LocalLLM class.
 
         Args:
             model_name_or_path (str): Path to the model or model name from Hugging Face.
             device (str, optional): Device to run the model on ('cpu' or 'cuda'). Defaults to auto-detection.
+            prefix_cache_size (int, optional): Number of prompt prefixes whose key/value cache is kept. Defaults to 8.
+            lazy_load (bool, optional): Defer loading until the model is first used. Defaults to False.
+            quantization (str, optional): 'int8' or '4bit'. Defaults to None (full precision).
+            use_safetensors (bool, optional): Require (True) or forbid (False) safetensors weights.
+                Defaults to None, which prefers safetensors when the checkpoint has them.
+            response_cache (ResponseCache, optional): Cache of responses to deterministic
+                ``generate`` calls. Defaults to None.
         """
+        if quantization is not None and quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization '{quantization}'. Choose from {QUANTIZATION_MODES}.")
+
         self.model_name_or_path = model_name_or_path
         self.device = device if device else ('cuda' if torch.cuda.is_available() else 'cpu')
+        if quantization == "4bit" and not self.device.startswith("cuda"):
+            raise ValueError("4-bit quantization requires a CUDA device; use 'int8' on CPU.")
+
+        self.quantization = quantization
+        self.use_safetensors = use_safetensors
+        self.prefix_cache = LRUCache(maxsize=prefix_cache_size)
+        self.batcher = None
+        self.response_cache = response_cache
+        self.load_stats: Dict[str, float] = {}
+        self._load_lock = threading.Lock()
 
         # Load the model and tokenizer
         self.tokenizer = None
         self.model = None
-        self._load_model()
+        if not lazy_load:
+            self._load_model()
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Whether the model and tokenizer have been loaded.
+        """
+        return self.model is not None
+
+    def _ensure_loaded(self):
+        """
+        Load the model and tokenizer if they are not loaded yet. Safe to call from several threads.
+        """
+        if self.model is None:
+            with self._load_lock:
+                if self.model is None:
+                    self._load_model()
 
     def _load_model(self):
         """
-        Load the model and tokenizer.
+        Load the model and tokenizer, recording the load time and memory growth in ``load_stats``.
         """
         try:
             print(f"Loading model from {self.model_name_or_path} on {self.device}...")
+            rss_before = _current_rss_bytes()
+            start_time = time.perf_counter()
+
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name_or_path)
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name_or_path)
-            self.model.to(self.device)
-            print("Model loaded successfully.")
+            load_kwargs: Dict[str, Any] = {"low_cpu_mem_usage": True, "use_safetensors": self.use_safetensors}
+            on_cuda = self.device.startswith("cuda")
+            if self.quantization and on_cuda:
+                from transformers import BitsAndBytesConfig
+
+                if self.quantization == "4bit":
+                    load_kwargs["quantization_config"] = BitsAndBytesConfig(
+                        load_in_4bit=True, bnb_4bit_compute_dtype=torch.float16
+                    )
+                else:
+                    load_kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+                load_kwargs["device_map"] = self.device
+
+            model = AutoModelForCausalLM.from_pretrained(self.model_name_or_path, **load_kwargs)
+            if self.quantization == "int8" and not on_cuda:
+                _conv1d_to_linear(model)
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            elif "device_map" not in load_kwargs:
+                model.to(self.device)
+            model.eval()
+            self.model = model
+
+            rss_after = _current_rss_bytes()
+            self.load_stats = {
+                "load_seconds": time.perf_counter() - start_time,
+                "rss_before_mb": rss_before / 2 ** 20,
+                "rss_after_mb": rss_after / 2 ** 20,
+                "rss_delta_mb": (rss_after - rss_before) / 2 ** 20
+            }
+            print(f"Model loaded successfully in {self.load_stats['load_seconds']:.2f}s "
+                  f"(+{self.load_stats['rss_delta_mb']:.0f} MB RSS).")
         except Exception as e:
             raise RuntimeError(f"Failed to load model: {e}")
 
-    def generate(self, prompt: str, max_length: int = 50, temperature: float = 1.0, top_k: int = 50):
+    def generate(
+        self, prompt: str, max_length: int = 50, temperature: float = 1.0, top_k: int = 50, prefix: Optional[str] = None
+    ):
         """
         Generate text from the model based on a given prompt.
 
@@ -45,23 +194,253 @@ class LocalLLM:
             max_length (int, optional): Maximum length of the generated text. Defaults to 50.
             temperature (float, optional): Sampling temperature. Defaults to 1.0.
             top_k (int, optional): Top-k sampling. Defaults to 50.
+            prefix (str, optional): Shared text placed before the prompt whose key/value cache is
+                reused across calls. Defaults to None.
 
         Returns:
             str: Generated text.
         """
+        cache_params = None
+        if self.response_cache is not None:
+            self._ensure_loaded()
+            if self._is_deterministic(temperature):
+                cache_params = {"max_length": max_length, "temperature": temperature, "top_k": top_k}
+                cached = self.response_cache.get(prompt, cache_params, prefix=prefix)
+                if cached is not None:
+                    return cached
+
+        if self.batcher is not None and prefix is None:
+            text = self.batcher.submit(prompt, max_length=max_length, temperature=temperature, top_k=top_k).result()
+        else:
+            self._ensure_loaded()
+            try:
+                outputs = self.model.generate(
+                    **self._prepare_inputs(prompt, prefix),
+                    max_length=max_length,
+                    temperature=temperature,
+                    top_k=top_k,
+                    pad_token_id=self.tokenizer.eos_token_id
+                )
+                text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            except Exception as e:
+                raise RuntimeError(f"Failed to generate text: {e}")
+
+        if cache_params is not None:
+            self.response_cache.put(prompt, cache_params, text, prefix=prefix)
+        return text
+
+    def _is_deterministic(self, temperature: float) -> bool:
+        """
+        Check whether ``generate`` returns the same text for the same prompt.
+
+        ``generate`` does not request sampling, so it decodes greedily unless the
+        model's generation config enables sampling.
+
+        Args:
+            temperature (float): The requested sampling temperature.
+
+        Returns:
+            bool: True if responses may be cached.
+        """
+        return temperature == 0 or not getattr(self.model.generation_config, "do_sample", False)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_length: int = 50,
+        temperature: float = 1.0,
+        top_k: int = 50,
+        return_num_tokens: bool = False
+    ) -> Union[List[str], Tuple[List[str], int]]:
+        """
+        Generate text for several prompts in one ``generate`` call.
+
+        Prompts are left-padded so that every sequence ends at the same position
+        and new tokens are appended directly after each prompt. ``max_length``
+        applies to each prompt's own length, as in ``generate``: the batch runs
+        for the largest number of new tokens any prompt is allowed, and each
+        output is cut back to its own allowance, so a prompt gets the same
+        budget whichever prompts it is batched with.
+
+        Args:
+            prompts (List[str]): Input prompts for the model.
+            max_length (int, optional): Maximum length of each generated text. Defaults to 50.
+            temperature (float, optional): Sampling temperature. Defaults to 1.0.
+            top_k (int, optional): Top-k sampling. Defaults to 50.
+            return_num_tokens (bool, optional): Also return the number of newly generated tokens. Defaults to False.
+
+        Returns:
+            Union[List[str], Tuple[List[str], int]]: One generated text per prompt, plus the
+            generated token count if ``return_num_tokens`` is set.
+        """
+        self._ensure_loaded()
         try:
-            inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
-            outputs = self.model.generate(
-                inputs["input_ids"],
+            pad_token_id = self.tokenizer.pad_token_id
+            if pad_token_id is None:
+                pad_token_id = self.tokenizer.eos_token_id
+            # Tokenize one by one and pad here, leaving the shared tokenizer's settings untouched
+            prompt_ids = [self.tokenizer(prompt)["input_ids"] for prompt in prompts]
+            padded_length = max(len(ids) for ids in prompt_ids)
+            new_token_limits = [max(max_length - len(ids), 0) for ids in prompt_ids]
+            input_ids = torch.full((len(prompts), padded_length), pad_token_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(prompts), padded_length), dtype=torch.long)
+            for row, ids in enumerate(prompt_ids):
+                if ids:
+                    input_ids[row, -len(ids):] = torch.tensor(ids, dtype=torch.long)
+                    attention_mask[row, -len(ids):] = 1
+
+            new_tokens = [[] for _ in prompts]
+            if max(new_token_limits) > 0:
+                outputs = self.model.generate(
+                    input_ids=input_ids.to(self.device),
+                    attention_mask=attention_mask.to(self.device),
+                    max_new_tokens=max(new_token_limits),
+                    temperature=temperature,
+                    top_k=top_k,
+                    pad_token_id=pad_token_id
+                )
+                generated = outputs[:, padded_length:].tolist()
+                new_tokens = [tokens[:limit] for tokens, limit in zip(generated, new_token_limits)]
+            texts = [
+                self.tokenizer.decode(ids + tokens, skip_special_tokens=True)
+                for ids, tokens in zip(prompt_ids, new_tokens)
+            ]
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate text: {e}")
+
+        if not return_num_tokens:
+            return texts
+        return texts, sum(token != pad_token_id for tokens in new_tokens for token in tokens)
+
+    def enable_batching(self, max_batch_size: int = 8, window_ms: float = 5.0):
+        """
+        Route ``generate`` calls without a prefix through a dynamic batcher.
+
+        Concurrent callers are then served by shared, left-padded ``generate``
+        calls instead of one batch-size-1 call each.
+
+        Args:
+            max_batch_size (int, optional): Maximum number of prompts per ``generate`` call. Defaults to 8.
+            window_ms (float, optional): How long to collect requests after the first one, in
+                milliseconds. Defaults to 5.0.
+
+        Returns:
+            DynamicBatcher: The batcher, whose ``metrics`` report tokens/sec and queue wait.
+        """
+        from .batching import DynamicBatcher
+
+        self.disable_batching()
+        self.batcher = DynamicBatcher(self, max_batch_size=max_batch_size, window_ms=window_ms)
+        return self.batcher
+
+    def disable_batching(self):
+        """
+        Stop the dynamic batcher, if any, after its queued requests finish.
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+
+    def stream(
+        self, prompt: str, max_length: int = 50, temperature: float = 1.0, top_k: int = 50, prefix: Optional[str] = None
+    ) -> Generator[str, None, None]:
+        """
+        Generate text from the model, yielding it piece by piece as tokens are produced.
+
+        Generation runs on a background thread; the prompt itself is not yielded.
+
+        Args:
+            prompt (str): Input prompt for the model.
+            max_length (int, optional): Maximum length of the generated text. Defaults to 50.
+            temperature (float, optional): Sampling temperature. Defaults to 1.0.
+            top_k (int, optional): Top-k sampling. Defaults to 50.
+            prefix (str, optional): Shared text placed before the prompt whose key/value cache is
+                reused across calls. Defaults to None.
+
+        Yields:
+            str: The next piece of generated text.
+        """
+        self._ensure_loaded()
+        try:
+            streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+            generate_kwargs = dict(
+                self._prepare_inputs(prompt, prefix),
                 max_length=max_length,
                 temperature=temperature,
                 top_k=top_k,
-                pad_token_id=self.tokenizer.eos_token_id
+                pad_token_id=self.tokenizer.eos_token_id,
+                streamer=streamer
             )
-            return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
         except Exception as e:
             raise RuntimeError(f"Failed to generate text: {e}")
 
+        errors = []
+
+        def run():
+            try:
+                self.model.generate(**generate_kwargs)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        for text in streamer:
+            if text:
+                yield text
+        thread.join()
+        if errors:
+            raise RuntimeError(f"Failed to generate text: {errors[0]}")
+
+    def _prepare_inputs(self, prompt: str, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Tokenize a prompt into ``generate`` arguments, attaching a cached prefix if given.
+
+        Args:
+            prompt (str): The prompt text following the prefix.
+            prefix (str, optional): The shared prefix. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: 'input_ids' and 'attention_mask', plus 'past_key_values' with a
+            private copy of the prefix cache when a prefix is given.
+        """
+        if prefix is None:
+            inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
+            return {"input_ids": inputs["input_ids"], "attention_mask": inputs["attention_mask"]}
+
+        prefix_ids, prefix_cache = self._get_prefix_cache(prefix)
+        prompt_ids = self.tokenizer(prompt, return_tensors="pt", add_special_tokens=False)["input_ids"].to(self.device)
+        input_ids = torch.cat([prefix_ids, prompt_ids], dim=-1)
+        # generate() extends the cache in place, so every call works on its own copy
+        past_key_values = copy.deepcopy(prefix_cache)
+        if prompt_ids.shape[-1] == 0:
+            # At least one input token must be left for the model to process
+            past_key_values.crop(prefix_ids.shape[-1] - 1)
+        return {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            "past_key_values": past_key_values
+        }
+
+    def _get_prefix_cache(self, prefix: str) -> Tuple[torch.Tensor, DynamicCache]:
+        """
+        Return the token IDs and key/value cache of a prefix, computing them on first use.
+
+        Args:
+            prefix (str): The prefix text.
+
+        Returns:
+            Tuple[torch.Tensor, DynamicCache]: The prefix token IDs and its key/value cache.
+        """
+        entry = self.prefix_cache.get(prefix)
+        if entry is None:
+            prefix_ids = self.tokenizer(prefix, return_tensors="pt")["input_ids"].to(self.device)
+            with torch.no_grad():
+                outputs = self.model(prefix_ids, past_key_values=DynamicCache(), use_cache=True)
+            entry = (prefix_ids, outputs.past_key_values)
+            self.prefix_cache.put(prefix, entry)
+        return entry
+
     def save_model(self, save_path: str):
         """
         Save the model and tokenizer to a specified path.
@@ -69,6 +448,7 @@ class LocalLLM:
         Args:
             save_path (str): Path to save the model and tokenizer.
         """
+        self._ensure_loaded()
         try:
             os.makedirs(save_path, exist_ok=True)
             self.tokenizer.save_pretrained(save_path)
@@ -80,12 +460,32 @@ class LocalLLM:
 if __name__ == "__main__":
     # Example usage
     model_path = "gpt2"  # Replace with your local model path or Hugging Face model name
-    llm = LocalLLM(model_path)
+
+    # Startup cost: a lazy model costs nothing until first use; compare load time and RSS growth
+    lazy_llm = LocalLLM(model_path, lazy_load=True, quantization="int8")
+    print(f"Lazy model loaded at startup: {lazy_llm.is_loaded}, RSS: {_current_rss_bytes() / 2 ** 20:.0f} MB")
+    lazy_llm.generate("Hello", max_length=10)
+    print("Int8 load stats:", lazy_llm.load_stats)
+
+    from .response_cache import ResponseCache
+
+    llm = LocalLLM(model_path, response_cache=ResponseCache(model_path))
+    print("Full-precision load stats:", llm.load_stats)
 
     prompt = "Once upon a time"
     print("Generating text...")
     generated_text = llm.generate(prompt, max_length=100)
     print("Generated text:", generated_text)
+    llm.generate(prompt, max_length=100)
+    print("Response cache:", llm.response_cache.stats)
+
+    # Stream tokens as they are produced, reusing the key/value cache of a shared prefix
+    context = "You are a helpful assistant. Answer using the context below.\nContext: FAISS is a vector search library.\n"
+    for question in ["Question: What is FAISS?\nAnswer:", "Question: Who uses FAISS?\nAnswer:"]:
+        for text in llm.stream(question, max_length=120, prefix=context):
+            print(text, end="", flush=True)
+        print()
+    print("Prefix cache:", llm.prefix_cache.stats)
 
     # Save the model (optional)
     save_directory = "./saved_model"
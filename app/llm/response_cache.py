@@ -0,0 +1,238 @@
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Hashable, Optional
+import faiss
+import numpy as np
+from ..utils.cache import LRUCache
+
+class ResponseCache:
+    """
+    A two-tier cache of generated responses.
+
+    The exact tier maps a hash of (model, prompt, sampling parameters) to the
+    response. The optional semantic tier embeds prompts with an
+    ``EmbeddingGenerator`` and keeps them in a small inner-product FAISS index,
+    so a new prompt whose cosine similarity to a cached one reaches the
+    threshold (and that uses the same parameters) reuses its response. A
+    shared ``prefix`` such as retrieved context is not embedded, since the
+    embedding model truncates long inputs and would only see the prefix;
+    instead a hash of it must match exactly, like the parameters. Both
+    tiers are LRU-bounded; evicting a semantic entry also removes its vector.
+    Only responses of deterministic (non-sampled) generation should be cached.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        embedding_generator=None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 1024
+    ):
+        """
+        Initialize the ResponseCache class.
+
+        Args:
+            model_name (str): Name of the model whose responses are cached; part of every key.
+            max_entries (int): Maximum number of exact entries. Defaults to 1024.
+            ttl (float, optional): Seconds after which entries of both tiers expire. Defaults to None.
+            embedding_generator (EmbeddingGenerator, optional): Enables the semantic tier. Defaults to None.
+            similarity_threshold (float): Minimum cosine similarity for a semantic hit. Defaults to 0.95.
+            max_semantic_entries (int): Maximum number of semantic entries. Defaults to 1024.
+        """
+        self.model_name = model_name
+        self.exact = LRUCache(maxsize=max_entries, ttl=ttl)
+        self.embedding_generator = embedding_generator
+        self.similarity_threshold = similarity_threshold
+        self.semantic: Optional[LRUCache] = None
+        self.semantic_index: Optional[faiss.IndexIDMap2] = None
+        if embedding_generator is not None:
+            self.semantic = LRUCache(maxsize=max_semantic_entries, ttl=ttl, on_evict=self._remove_vector)
+        self._next_id = 0
+        self._lock = threading.RLock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def params_key(self, params: Dict[str, Any], prefix: Optional[str] = None) -> str:
+        """
+        Serialize sampling parameters and the prompt prefix into a stable string.
+
+        Args:
+            params (Dict[str, Any]): The generation parameters.
+            prefix (str, optional): The shared text placed before the prompt. Defaults to None.
+
+        Returns:
+            str: The model name, the parameters as canonical JSON and a SHA-256 of the prefix.
+        """
+        prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest() if prefix else ""
+        return self.model_name + "\0" + json.dumps(params, sort_keys=True, default=str) + "\0" + prefix_hash
+
+    def make_key(self, prompt: str, params: Dict[str, Any], prefix: Optional[str] = None) -> str:
+        """
+        Build the exact-tier key of a prompt.
+
+        Args:
+            prompt (str): The prompt without its prefix.
+            params (Dict[str, Any]): The generation parameters.
+            prefix (str, optional): The shared text placed before the prompt. Defaults to None.
+
+        Returns:
+            str: A SHA-256 hex digest of the model, parameters, prefix and prompt.
+        """
+        return hashlib.sha256((self.params_key(params, prefix) + "\0" + prompt).encode("utf-8")).hexdigest()
+
+    def get(self, prompt: str, params: Dict[str, Any], prefix: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached response, first exactly and then semantically.
+
+        Args:
+            prompt (str): The prompt without its prefix.
+            params (Dict[str, Any]): The generation parameters.
+            prefix (str, optional): The shared text placed before the prompt; must match
+                exactly. Defaults to None.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+        """
+        response = self.exact.get(self.make_key(prompt, params, prefix))
+        if response is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return response
+
+        if self.semantic is not None:
+            response = self._semantic_get(prompt, self.params_key(params, prefix))
+            if response is not None:
+                with self._lock:
+                    self.semantic_hits += 1
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, prompt: str, params: Dict[str, Any], response: str, prefix: Optional[str] = None):
+        """
+        Cache a response in both tiers.
+
+        Args:
+            prompt (str): The prompt without its prefix.
+            params (Dict[str, Any]): The generation parameters.
+            response (str): The generated response.
+            prefix (str, optional): The shared text placed before the prompt. Defaults to None.
+        """
+        self.exact.put(self.make_key(prompt, params, prefix), response)
+        if self.semantic is None:
+            return
+
+        vector = self._embed(prompt)
+        with self._lock:
+            if self.semantic_index is None:
+                self.semantic_index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+            entry_id = self._next_id
+            self._next_id += 1
+            self.semantic_index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self.semantic.put(entry_id, (self.params_key(params, prefix), response))
+
+    def clear(self):
+        """
+        Remove all entries. Counters are kept.
+        """
+        with self._lock:
+            self.exact.clear()
+            if self.semantic is not None:
+                self.semantic.clear()
+                self.semantic_index = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit, miss, eviction and size counters of both tiers.
+
+        Returns:
+            Dict[str, Any]: The statistics.
+        """
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+                "exact_size": len(self.exact),
+                "exact_evictions": self.exact.evictions,
+                "semantic_size": len(self.semantic) if self.semantic is not None else 0,
+                "semantic_evictions": self.semantic.evictions if self.semantic is not None else 0,
+            }
+
+    def _semantic_get(self, prompt: str, params_key: str, candidates: int = 4) -> Optional[str]:
+        """
+        Find the response of the most similar cached prompt with the same parameters and prefix.
+
+        Args:
+            prompt (str): The prompt without its prefix.
+            params_key (str): The serialized generation parameters and prefix hash.
+            candidates (int): Number of nearest prompts checked. Defaults to 4.
+
+        Returns:
+            Optional[str]: The cached response, or None if no prompt is similar enough.
+        """
+        with self._lock:
+            if self.semantic_index is None or self.semantic_index.ntotal == 0:
+                return None
+        vector = self._embed(prompt)
+        with self._lock:
+            if self.semantic_index is None:
+                return None
+            scores, ids = self.semantic_index.search(vector, candidates)
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id == -1 or score < self.similarity_threshold:
+                    break
+                entry = self.semantic.get(int(entry_id))
+                if entry is not None and entry[0] == params_key:
+                    return entry[1]
+        return None
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        """
+        Embed a prompt as an L2-normalised float32 row vector.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            np.ndarray: A (1, dimension) matrix.
+        """
+        return self.embedding_generator.generate_embeddings([prompt], normalize=True)
+
+    def _remove_vector(self, entry_id: Hashable, value: Any):
+        """
+        Drop the vector of an evicted semantic entry from the FAISS index.
+
+        Args:
+            entry_id (Hashable): The entry's FAISS ID.
+            value (Any): The evicted (parameters, response) pair.
+        """
+        if self.semantic_index is not None:
+            self.semantic_index.remove_ids(np.array([entry_id], dtype=np.int64))
+
+if __name__ == "__main__":
+    # Example usage
+    from ..rag.embeddings import EmbeddingGenerator
+
+    cache = ResponseCache("gpt2", embedding_generator=EmbeddingGenerator(), similarity_threshold=0.9)
+    params = {"max_length": 50, "temperature": 1.0, "top_k": 50}
+    cache.put("What is FAISS?", params, "FAISS is a library for similarity search.")
+    print("Exact:", cache.get("What is FAISS?", params))
+    print("Near-duplicate:", cache.get("What is FAISS ?", params))
+    print("Different parameters:", cache.get("What is FAISS?", {**params, "max_length": 100}))
+
+    # With a long shared context, only the question is compared semantically
+    context = "Context: " + "FAISS indexes dense vectors. " * 200
+    cache.put("What does FAISS index?", params, "Dense vectors.", prefix=context)
+    print("Same context, other question:", cache.get("Who maintains FAISS?", params, prefix=context))
+    print("Same question, other context:", cache.get("What does FAISS index?", params, prefix="Context: none"))
+    print("Stats:", cache.stats)
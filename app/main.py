@@ -1,23 +1,30 @@
+import os
 from typing import Generator
-from agents.executor import TaskExecutor
-from agents.planner import TaskPlanner
-from agents.graph import GraphManager
-from rag.loader import DataLoader
-from rag.chunking import TextChunker
-from rag.embeddings import EmbeddingGenerator
-from rag.vector_store import VectorStoreManager
-from rag.retriever import RetrieverManager
-from tools.search_tool import SearchTool
-from langchain.schema import Document
-from sentence_transformers import SentenceTransformer
+from app.agents.executor import TaskExecutor
+from app.agents.planner import TaskPlanner
+from app.agents.graph import GraphManager
+from app.rag.loader import DataLoader
+from app.rag.chunking import TextChunker
+from app.rag.embedding_cache import EmbeddingCache
+from app.rag.embeddings import EmbeddingGenerator
+from app.rag.ingestion import IngestionPipeline
+from app.rag.lexical_index import InvertedIndex
+from app.rag.manifest import FileManifest
+from app.rag.vector_store import DEFAULT_INDEX_DIRECTORY, VectorStoreManager
+from app.rag.reranker import CrossEncoderReranker
+from app.rag.retriever import RetrieverManager
+from app.tools.search_tool import SearchTool
 
 
 def main():
     # Initialize components
     print("Initializing components...")
     data_loader = DataLoader()
-    chunker = TextChunker(chunk_size=100, overlap=20)
-    embedding_generator = EmbeddingGenerator()
+    # Repeated chunks (headers, footers, boilerplate) are embedded once across runs
+    embedding_cache = EmbeddingCache(disk_path=os.path.join(DEFAULT_INDEX_DIRECTORY, "embedding_cache.sqlite"))
+    embedding_generator = EmbeddingGenerator(cache=embedding_cache, normalize=True)
+    # Chunk by tokens of the embedding model so chunks fit its input window
+    chunker = TextChunker(chunk_size=200, overlap=20, tokenizer=embedding_generator.model.tokenizer)
     graph_manager = GraphManager()
     executor = TaskExecutor()
     planner = TaskPlanner(executor, graph_manager)
@@ -28,25 +35,61 @@ def main():
     pdf_files = data_loader.list_files(extensions=[".pdf"])
     print(f"Found {len(pdf_files)} PDF files.")
 
-    for pdf_file in pdf_files:
-        print(f"Processing file: {pdf_file}")
-        # Example: Load file content (assuming text-based PDFs)
-        content = data_loader.load_file(pdf_file)
+    # Re-ingest only the files that were added or changed since the last run
+    manifest = FileManifest().load()
+    store_exists = VectorStoreManager.exists() and InvertedIndex.exists()
+    if not store_exists:
+        manifest.clear()
+    elif not manifest.entries:
+        # Without a manifest the stored chunks cannot be matched to files, so every file
+        # would be ingested again on top of them; rebuild the store from scratch instead
+        print("Manifest missing or empty; rebuilding the vector store.")
+        store_exists = False
+    changes = data_loader.detect_changes(manifest.entries, extensions=[".pdf"])
+    has_changes = bool(changes["added"] or changes["changed"] or changes["removed"])
+    print(
+        f"Files: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+        f"{len(changes['removed'])} removed, {len(changes['unchanged'])} unchanged."
+    )
 
-        # Process chunks one at a time to avoid MemoryError
-        print("Generating embeddings...")
-        documents = []
-        for chunk in chunker.chunk_text(content):
-            embedding = embedding_generator.generate_embeddings([chunk])  # Process one chunk at a time
-            documents.append(Document(page_content=chunk))
+    vector_store = None
+    lexical_index = InvertedIndex()
+    if store_exists:
+        # An unchanged index is memory-mapped; one that will be modified is read into RAM
+        print("Loading persisted vector store...")
+        vector_store = VectorStoreManager.load(embedding_generator, mmap=not has_changes)
+        lexical_index = InvertedIndex.load()
 
-        # Create vector store
-        print("Creating vector store...")
-        vector_store = VectorStoreManager.create_vectorstore(documents, embedding_generator.model)
+    ingestion = IngestionPipeline(chunker, embedding_generator, batch_size=64, lexical_index=lexical_index)
+    if has_changes:
+        print("Synchronizing vector store with data directory...")
+        vector_store, changes = ingestion.sync_directory(
+            data_loader, manifest, vector_store, extensions=[".pdf"], changes=changes,
+            workers=os.cpu_count()
+        )
+        stats = ingestion.stats
+        print(
+            f"Embedded {stats['chunks']} chunks in {stats['seconds']:.2f}s "
+            f"({stats['chunks_per_second']:.1f} chunks/sec)."
+        )
+        print(f"Embedding cache: {embedding_cache.stats}")
+        if vector_store is not None:
+            print("Saving vector store...")
+            VectorStoreManager.save(vector_store)
+            lexical_index.save()
+    else:
+        # Record refreshed mtimes so unchanged files are not re-hashed next run
+        for file_path in changes["unchanged"]:
+            manifest.update(file_path, changes["fingerprints"][file_path])
+    manifest.save()
 
-        # Create retriever
+    if vector_store is not None:
+        # Create retriever; BM25 catches exact terms such as part numbers that embeddings blur,
+        # and a cross-encoder picks the best 4 of the 20 fused candidates
         print("Creating retriever...")
-        retriever = RetrieverManager.get_retriever(vector_store)
+        hybrid_retriever = RetrieverManager.get_hybrid_retriever(vector_store, lexical_index, k=20)
+        reranker = CrossEncoderReranker(max_candidates=20, latency_budget_ms=200)
+        retriever = RetrieverManager.get_reranking_retriever(hybrid_retriever, reranker, k=4)
 
         # Example: Search and retrieve
         query = "Example query"
@@ -56,6 +99,18 @@ def main():
         for result in results:
             print(result.page_content)
 
+        # Example: answer several queries with one embedding pass and one index search
+        cached_retriever = RetrieverManager.get_cached_retriever(vector_store)
+        queries = ["Example query", "Another example query"]
+        for batch_query, documents in zip(queries, cached_retriever.batch_retrieve(queries)):
+            print(f"{batch_query}: {len(documents)} results")
+
+        # Example: scope retrieval to one file; the filter is applied inside the FAISS search
+        if pdf_files:
+            scoped_retriever = RetrieverManager.get_cached_retriever(vector_store, filter={"source": pdf_files[0]})
+            for result in scoped_retriever.invoke(query):
+                print(f"{result.metadata.get('source')} p.{result.metadata.get('page')}: {result.page_content[:80]}")
+
     # Example: Task planning and execution
     print("Planning and executing tasks...")
 
@@ -0,0 +1,689 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from ..utils.cache import LRUCache
+from ..utils.logger import Logger
+
+_MISSING = object()
+_logger = None
+
+def _get_logger():
+    """
+    Return the logger of the memory backends, creating it on first use.
+
+    Returns:
+        logging.Logger: The logger.
+    """
+    global _logger
+    if _logger is None:
+        _logger = Logger("app.memory", log_file=os.path.join("logs", "memory.log")).get_logger()
+    return _logger
+
+class InMemoryBackend:
+    """
+    A storage backend keeping Memory's stores in process-local LRU caches.
+
+    The fastest option, but nothing survives a restart and every worker
+    process has its own view.
+    """
+
+    def open(self, name: str, maxsize: int, ttl: Optional[float] = None) -> LRUCache:
+        """
+        Create the store of one Memory namespace.
+
+        Args:
+            name (str): The namespace, e.g. 'entries' or 'sessions'.
+            maxsize (int): Maximum number of entries kept.
+            ttl (float, optional): Seconds after which an entry expires. Defaults to None.
+
+        Returns:
+            LRUCache: The store.
+        """
+        return LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def flush(self):
+        """
+        Nothing to flush; writes are applied immediately.
+        """
+
+    def close(self):
+        """
+        Nothing to release.
+        """
+
+class BatchedStore:
+    """
+    The store of one Memory namespace on a shared persistent backend.
+
+    Values are pickled. Reads go through an in-process LRU of unpickled
+    values, so hot keys are served without touching the database; the backend
+    clears these caches whenever another process has written. Writes are
+    staged in the backend and applied in batches. The store has the same
+    interface as ``LRUCache`` (get, put, pop, clear, items, len).
+
+    Unpickling runs arbitrary code embedded in the data, so the database must
+    only be writable by trusted processes.
+    """
+
+    def __init__(self, backend: "BatchedBackend", name: str, maxsize: int, ttl: Optional[float], cache_size: int):
+        """
+        Initialize the BatchedStore class.
+
+        Args:
+            backend (BatchedBackend): The backend holding the data.
+            name (str): The namespace.
+            maxsize (int): Maximum number of entries; the least recently written are evicted.
+            ttl (float, optional): Seconds after its last write that an entry expires.
+            cache_size (int): Maximum number of values kept in the in-process cache.
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Invalid store name: {name}")
+
+        self.backend = backend
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Values with their absolute expiry time (0.0 for never)
+        self.cache = LRUCache(maxsize=cache_size)
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value, from the in-process cache if it is still valid.
+
+        Args:
+            key (Hashable): The key to look up.
+            default (Any, optional): Returned if the key is missing or expired. Defaults to None.
+
+        Returns:
+            Any: The stored value, or ``default``.
+        """
+        key = str(key)
+        self.backend.sync()
+        entry = self.cache.get(key)
+        if entry is None:
+            row = self.backend.pending_entry(self.name, key)
+            if row is _MISSING:
+                row = self.backend.read(self, key)
+            if row is None:
+                return default
+            entry = (pickle.loads(row[0]), row[1])
+            self.cache.put(key, entry)
+
+        value, expires_at = entry
+        if expires_at and expires_at <= time.time():
+            self.cache.pop(key)
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value; it is visible to this process at once and to others after the next flush.
+
+        Args:
+            key (Hashable): The key to store the value under.
+            value (Any): The value to store; must be picklable.
+        """
+        key = str(key)
+        expires_at = time.time() + self.ttl if self.ttl else 0.0
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.cache.put(key, (value, expires_at))
+        self.backend.stage(self.name, key, (blob, expires_at))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove an entry without counting it as an eviction.
+
+        Args:
+            key (Hashable): The key to remove.
+            default (Any, optional): Returned if the key is missing. Defaults to None.
+
+        Returns:
+            Any: The removed value, or ``default``.
+        """
+        value = self.get(key, _MISSING)
+        self.cache.pop(str(key))
+        self.backend.stage(self.name, str(key), None)
+        return default if value is _MISSING else value
+
+    def clear(self):
+        """
+        Remove all entries of this store. Counters are kept.
+        """
+        self.backend.clear_store(self)
+        self.cache.clear()
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """
+        Snapshot all live entries. Reads the whole store; meant for statistics and tooling.
+
+        Returns:
+            List[Tuple[str, Any]]: (key, value) pairs.
+        """
+        self.backend._flush()
+        return [(key, pickle.loads(blob)) for key, blob in self.backend.scan(self)]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        self.backend._flush()
+        return self.backend.count(self)
+
+class BatchedBackend:
+    """
+    Shared machinery of the persistent backends: write batching and cache invalidation.
+
+    Writes of all stores are collected and applied in one transaction when
+    ``batch_size`` are pending, every ``flush_interval`` seconds from a
+    background thread, and on ``flush``/``close``. Before each read the backend
+    compares a change counter maintained by the database with the last value it
+    saw, at most every ``sync_interval`` seconds; if another process has
+    written since, all in-process caches are cleared. Other workers therefore
+    see a write at most ``flush_interval + sync_interval`` seconds late, and
+    concurrent writes to the same key are last-writer-wins.
+    A failed background flush is logged and its writes are kept for the next
+    attempt; the error is raised again by the next ``flush`` or ``close``.
+    Subclasses implement the database access.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        cache_size: int = 1024,
+        sync_interval: float = 0.01
+    ):
+        """
+        Initialize the BatchedBackend class.
+
+        Args:
+            batch_size (int): Number of pending writes that triggers a flush. Defaults to 64.
+            flush_interval (float): Maximum seconds a write stays pending. Defaults to 0.05.
+            cache_size (int): Maximum number of values cached in-process per store. Defaults to 1024.
+            sync_interval (float): Minimum seconds between checks for writes of other processes;
+                0 checks on every read. Defaults to 0.01.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self.sync_interval = sync_interval
+        self._synced_at = 0.0
+        self.stores: Dict[str, BatchedStore] = {}
+        self._pending: Dict[Tuple[str, str], Optional[Tuple[bytes, float]]] = {}
+        self._lock = threading.RLock()
+        self._seen_version = self.remote_version()
+        self._flush_error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run_flusher, name="memory-flusher", daemon=True)
+        self._flusher.start()
+
+    def open(self, name: str, maxsize: int, ttl: Optional[float] = None) -> BatchedStore:
+        """
+        Create the store of one Memory namespace.
+
+        Args:
+            name (str): The namespace, e.g. 'entries' or 'sessions'.
+            maxsize (int): Maximum number of entries kept.
+            ttl (float, optional): Seconds after its last write that an entry expires. Defaults to None.
+
+        Returns:
+            BatchedStore: The store.
+        """
+        store = BatchedStore(self, name, maxsize, ttl, self.cache_size)
+        with self._lock:
+            self.create(store)
+            self.stores[name] = store
+        return store
+
+    def stage(self, name: str, key: str, entry: Optional[Tuple[bytes, float]]):
+        """
+        Queue a write, or a delete if ``entry`` is None.
+
+        Args:
+            name (str): The store name.
+            key (str): The key.
+            entry (Tuple[bytes, float], optional): The pickled value and its expiry time.
+        """
+        with self._lock:
+            self._pending[(name, key)] = entry
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def pending_entry(self, name: str, key: str) -> Any:
+        """
+        Return a write of this process that is not flushed yet.
+
+        Args:
+            name (str): The store name.
+            key (str): The key.
+
+        Returns:
+            Any: The pending (blob, expiry) pair, None for a pending delete, or ``_MISSING``.
+        """
+        with self._lock:
+            return self._pending.get((name, key), _MISSING)
+
+    def flush(self):
+        """
+        Apply all pending writes in one transaction.
+
+        Raises:
+            RuntimeError: If the writes fail, or if a background flush failed since the last call.
+        """
+        with self._lock:
+            error, self._flush_error = self._flush_error, None
+            self._flush()
+        if error is not None:
+            raise error
+
+    def _flush(self):
+        """
+        Apply all pending writes in one transaction, keeping them pending if it fails.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                self.write(batch)
+            except Exception as e:
+                # Keep the writes so the next flush retries them, unless newer ones replaced them
+                batch.update(self._pending)
+                self._pending = batch
+                raise RuntimeError(f"Failed to flush memory writes: {e}")
+
+    def sync(self):
+        """
+        Clear the in-process caches if another process has written since the last check.
+        """
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            self._synced_at = now
+            version = self.remote_version()
+            if version != self._seen_version:
+                self._seen_version = version
+                for store in self.stores.values():
+                    store.cache.clear()
+
+    def clear_store(self, store: BatchedStore):
+        """
+        Delete all entries of a store, including its pending writes.
+
+        Args:
+            store (BatchedStore): The store to clear.
+        """
+        with self._lock:
+            self._pending = {item: entry for item, entry in self._pending.items() if item[0] != store.name}
+            self.delete_all(store)
+
+    def close(self):
+        """
+        Stop the background flusher and flush pending writes.
+
+        Raises:
+            RuntimeError: If the writes fail, or if a background flush failed since the last ``flush``.
+        """
+        if not self._stop.is_set():
+            self._stop.set()
+            self._flusher.join()
+            self.flush()
+
+    def _run_flusher(self):
+        """
+        Background loop flushing pending writes every ``flush_interval`` seconds.
+        """
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self._flush()
+            except Exception as e:
+                with self._lock:
+                    # Log once per failure streak rather than every interval
+                    if self._flush_error is None:
+                        _get_logger().error(f"Background flush of memory writes failed: {e}")
+                    self._flush_error = e
+
+    # Database access, implemented by subclasses
+    def remote_version(self) -> int:
+        """
+        Read the database's change counter, which moves when another process writes.
+        """
+        raise NotImplementedError
+
+    def create(self, store: BatchedStore):
+        """
+        Prepare the database for a new store.
+        """
+        raise NotImplementedError
+
+    def read(self, store: BatchedStore, key: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Read the pickled value and expiry time of a live entry, or None.
+        """
+        raise NotImplementedError
+
+    def write(self, batch: Dict[Tuple[str, str], Optional[Tuple[bytes, float]]]):
+        """
+        Apply a batch of writes and deletes atomically, then evict expired and excess entries.
+        """
+        raise NotImplementedError
+
+    def scan(self, store: BatchedStore) -> List[Tuple[str, bytes]]:
+        """
+        Read the keys and pickled values of all live entries of a store.
+        """
+        raise NotImplementedError
+
+    def count(self, store: BatchedStore) -> int:
+        """
+        Count the live entries of a store.
+        """
+        raise NotImplementedError
+
+    def delete_all(self, store: BatchedStore):
+        """
+        Delete every entry of a store.
+        """
+        raise NotImplementedError
+
+class SQLiteBackend(BatchedBackend):
+    """
+    A storage backend in a SQLite database in WAL mode, shared by all worker processes.
+
+    WAL lets readers in every process proceed while one process writes.
+    ``PRAGMA data_version`` changes only when another connection commits, which
+    makes the cross-process invalidation check a single cheap query. Each store
+    is a table; expired entries and the least recently written entries beyond
+    ``maxsize`` are deleted when a batch is flushed.
+
+    Values are stored pickled and unpickled on read, which can execute
+    arbitrary code: only use a database file on trusted storage that no
+    untrusted user or process can write to.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        cache_size: int = 1024,
+        sync_interval: float = 0.01
+    ):
+        """
+        Initialize the SQLiteBackend class.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            batch_size (int): Number of pending writes that triggers a flush. Defaults to 64.
+            flush_interval (float): Maximum seconds a write stays pending. Defaults to 0.05.
+            cache_size (int): Maximum number of values cached in-process per store. Defaults to 1024.
+            sync_interval (float): Minimum seconds between checks for writes of other processes.
+                Defaults to 0.01.
+        """
+        self.path = path
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            raise RuntimeError(f"Failed to open memory database {path}: {e}")
+        super().__init__(
+            batch_size=batch_size, flush_interval=flush_interval, cache_size=cache_size, sync_interval=sync_interval
+        )
+
+    def close(self):
+        """
+        Flush pending writes and close the database connection.
+        """
+        super().close()
+        with self._lock:
+            self._connection.close()
+
+    def remote_version(self) -> int:
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def create(self, store: BatchedStore):
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS memory_{store.name} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS memory_{store.name}_updated ON memory_{store.name} (updated_at)"
+            )
+
+    def read(self, store: BatchedStore, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT value, expires_at FROM memory_{store.name} "
+                "WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+
+    def write(self, batch: Dict[Tuple[str, str], Optional[Tuple[bytes, float]]]):
+        now = time.time()
+        with self._connection:
+            for name, store in self.stores.items():
+                upserts = [(key, entry[0], entry[1], now) for (store_name, key), entry in batch.items()
+                           if store_name == name and entry is not None]
+                deletes = [(key,) for (store_name, key), entry in batch.items() if store_name == name and entry is None]
+                if not upserts and not deletes:
+                    continue
+                table = f"memory_{name}"
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)", upserts
+                )
+                self._connection.executemany(f"DELETE FROM {table} WHERE key = ?", deletes)
+
+                expired = self._connection.execute(
+                    f"SELECT key FROM {table} WHERE expires_at > 0 AND expires_at <= ?", (now,)
+                ).fetchall()
+                size = self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] - len(expired)
+                overflow = self._connection.execute(
+                    f"SELECT key FROM {table} WHERE expires_at = 0 OR expires_at > ? ORDER BY updated_at LIMIT ?",
+                    (now, max(size - store.maxsize, 0))
+                ).fetchall()
+                evicted = expired + overflow
+                self._connection.executemany(f"DELETE FROM {table} WHERE key = ?", evicted)
+                for (key,) in evicted:
+                    store.cache.pop(key)
+                store.evictions += len(evicted)
+
+    def scan(self, store: BatchedStore) -> List[Tuple[str, bytes]]:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT key, value FROM memory_{store.name} WHERE expires_at = 0 OR expires_at > ?", (time.time(),)
+            ).fetchall()
+
+    def count(self, store: BatchedStore) -> int:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM memory_{store.name} WHERE expires_at = 0 OR expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+    def delete_all(self, store: BatchedStore):
+        with self._connection:
+            self._connection.execute(f"DELETE FROM memory_{store.name}")
+
+class RedisBackend(BatchedBackend):
+    """
+    A storage backend on a Redis-protocol server (Redis, Valkey, KeyDB, ...), shared by all workers.
+
+    Requires the ``redis`` package. Values are plain keys with a native expiry;
+    a sorted set per store records write times for ``maxsize`` eviction, and a
+    counter key is incremented with every batch so other processes know when to
+    drop their caches. Each read costs one round trip for the counter, but hot
+    values are neither transferred nor unpickled again.
+
+    Values are stored pickled and unpickled on read, which can execute
+    arbitrary code: only use a server that requires authentication and is
+    reachable solely by trusted clients.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "memory",
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        cache_size: int = 1024,
+        sync_interval: float = 0.01
+    ):
+        """
+        Initialize the RedisBackend class.
+
+        Args:
+            url (str): URL of the server. Defaults to 'redis://localhost:6379/0'.
+            prefix (str): Prefix of every key written. Defaults to 'memory'.
+            batch_size (int): Number of pending writes that triggers a flush. Defaults to 64.
+            flush_interval (float): Maximum seconds a write stays pending. Defaults to 0.05.
+            cache_size (int): Maximum number of values cached in-process per store. Defaults to 1024.
+            sync_interval (float): Minimum seconds between checks for writes of other processes.
+                Defaults to 0.01.
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(f"RedisBackend requires the 'redis' package: {e}")
+
+        self.prefix = prefix
+        self.version_key = f"{prefix}:version"
+        try:
+            self.client = redis.Redis.from_url(url)
+            self.client.ping()
+        except Exception as e:
+            raise RuntimeError(f"Failed to connect to Redis at {url}: {e}")
+        super().__init__(
+            batch_size=batch_size, flush_interval=flush_interval, cache_size=cache_size, sync_interval=sync_interval
+        )
+
+    def close(self):
+        """
+        Flush pending writes and close the connection pool.
+        """
+        super().close()
+        self.client.close()
+
+    def _data_key(self, store: BatchedStore, key: str) -> str:
+        return f"{self.prefix}:data:{store.name}:{key}"
+
+    def _index_key(self, store: BatchedStore) -> str:
+        return f"{self.prefix}:index:{store.name}"
+
+    def _bump_version(self, pipeline):
+        """
+        Increment the change counter as the last command of a pipeline and execute it.
+
+        Our own caches stay valid if no other process wrote in between.
+
+        Args:
+            pipeline: The Redis pipeline.
+
+        Returns:
+            list: The pipeline results.
+        """
+        pipeline.incr(self.version_key)
+        results = pipeline.execute()
+        if results[-1] == self._seen_version + 1:
+            self._seen_version = results[-1]
+        return results
+
+    def remote_version(self) -> int:
+        return int(self.client.get(self.version_key) or 0)
+
+    def create(self, store: BatchedStore):
+        pass
+
+    def read(self, store: BatchedStore, key: str) -> Optional[Tuple[bytes, float]]:
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.get(self._data_key(store, key))
+        pipeline.pttl(self._data_key(store, key))
+        blob, remaining_ms = pipeline.execute()
+        if blob is None:
+            return None
+        return blob, time.time() + remaining_ms / 1000.0 if remaining_ms > 0 else 0.0
+
+    def write(self, batch: Dict[Tuple[str, str], Optional[Tuple[bytes, float]]]):
+        now = time.time()
+        pipeline = self.client.pipeline(transaction=True)
+        for (name, key), entry in batch.items():
+            store = self.stores[name]
+            if entry is None:
+                pipeline.delete(self._data_key(store, key))
+                pipeline.zrem(self._index_key(store), key)
+            else:
+                blob, expires_at = entry
+                expiry_ms = max(int((expires_at - now) * 1000), 1) if expires_at else None
+                pipeline.set(self._data_key(store, key), blob, px=expiry_ms)
+                pipeline.zadd(self._index_key(store), {key: now})
+        self._bump_version(pipeline)
+
+        for store in {self.stores[name] for name, _ in batch}:
+            index_key = self._index_key(store)
+            pipeline = self.client.pipeline(transaction=True)
+            if store.ttl:
+                pipeline.zremrangebyscore(index_key, "-inf", now - store.ttl)
+            pipeline.zcard(index_key)
+            overflow = pipeline.execute()[-1] - store.maxsize
+            if overflow > 0:
+                evicted = [key.decode("utf-8") for key, _ in self.client.zpopmin(index_key, overflow)]
+                pipeline = self.client.pipeline(transaction=True)
+                pipeline.delete(*(self._data_key(store, key) for key in evicted))
+                self._bump_version(pipeline)
+                for key in evicted:
+                    store.cache.pop(key)
+                store.evictions += len(evicted)
+
+    def scan(self, store: BatchedStore) -> List[Tuple[str, bytes]]:
+        keys = [key.decode("utf-8") for key in self.client.zrange(self._index_key(store), 0, -1)]
+        if not keys:
+            return []
+        blobs = self.client.mget([self._data_key(store, key) for key in keys])
+        return [(key, blob) for key, blob in zip(keys, blobs) if blob is not None]
+
+    def count(self, store: BatchedStore) -> int:
+        if store.ttl:
+            self.client.zremrangebyscore(self._index_key(store), "-inf", time.time() - store.ttl)
+        return self.client.zcard(self._index_key(store))
+
+    def delete_all(self, store: BatchedStore):
+        keys = [key.decode("utf-8") for key in self.client.zrange(self._index_key(store), 0, -1)]
+        pipeline = self.client.pipeline(transaction=True)
+        if keys:
+            pipeline.delete(*(self._data_key(store, key) for key in keys))
+        pipeline.delete(self._index_key(store))
+        self._bump_version(pipeline)
+
+if __name__ == "__main__":
+    # Example usage: two backends on one file stand in for two worker processes
+    path = "memory_example.sqlite"
+    worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+    store_a = worker_a.open("entries", maxsize=1000)
+    store_b = worker_b.open("entries", maxsize=1000)
+
+    store_a.put("greeting", "hello")
+    worker_a.flush()
+    print("Worker B reads:", store_b.get("greeting"))
+
+    store_b.put("greeting", "hi")
+    worker_b.flush()
+    time.sleep(worker_a.sync_interval)
+    print("Worker A sees the update:", store_a.get("greeting"))
+
+    start_time = time.perf_counter()
+    for _ in range(10_000):
+        store_a.get("greeting")
+    print(f"Cached read: {(time.perf_counter() - start_time) / 10_000 * 1e6:.1f} us")
+
+    worker_a.close()
+    worker_b.close()
+    os.remove(path)
@@ -1,13 +1,80 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from .backends import InMemoryBackend
+from .session import Session, Turn, extractive_summary
+
 class Memory:
     """
     A class to manage memory for storing and retrieving data.
+
+    Besides a key/value store, Memory keeps the conversation of each session.
+    Both are bounded so RAM stays flat however long the service runs: keys and
+    sessions are evicted least recently used first and expire after a TTL, and
+    each session keeps only its latest turns verbatim, summarizing older ones
+    (see ``Session``). With an ``EmbeddingGenerator``, past turns are embedded
+    and the most relevant ones can be recalled for a new query, so prompts
+    carry a fixed number of useful turns instead of the whole history.
+
+    Storage is pluggable: the default ``InMemoryBackend`` keeps everything in
+    process, while ``SQLiteBackend`` and ``RedisBackend`` persist keys and
+    sessions and share them between worker processes. Sessions are read,
+    updated and written back whole, so concurrent turns of the same session
+    in different processes are last-writer-wins.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: Optional[float] = None,
+        max_sessions: int = 1000,
+        session_ttl: Optional[float] = 3600.0,
+        max_turns: int = 20,
+        max_session_bytes: int = 32_768,
+        max_summary_bytes: int = 4096,
+        max_recall_turns: int = 500,
+        summarizer: Optional[Callable[[List[Turn], str], str]] = None,
+        embedding_generator=None,
+        backend=None,
+        max_recall_bytes: int = 1_048_576
+    ):
         """
         Initialize the Memory class with an empty storage.
+
+        Args:
+            max_entries (int): Maximum number of key/value entries. Defaults to 10000.
+            ttl (float, optional): Seconds after which a key/value entry expires. Defaults to None.
+            max_sessions (int): Maximum number of sessions kept. Defaults to 1000.
+            session_ttl (float, optional): Seconds after its last turn that a session expires.
+                Defaults to 3600.
+            max_turns (int): Maximum number of verbatim turns per session. Defaults to 20.
+            max_session_bytes (int): Maximum UTF-8 bytes of verbatim turns plus summary per
+                session. Defaults to 32768.
+            max_summary_bytes (int): Maximum UTF-8 bytes of a session summary. Defaults to 4096.
+            max_recall_turns (int): Maximum number of embedded turns kept per session for
+                recall. Defaults to 500.
+            summarizer (Callable[[List[Turn], str], str], optional): Folds old turns into a
+                session summary. Defaults to ``extractive_summary``.
+            embedding_generator (EmbeddingGenerator, optional): Enables recall. Defaults to None.
+            backend (optional): Storage backend, e.g. ``SQLiteBackend``. Defaults to an
+                ``InMemoryBackend``.
+            max_recall_bytes (int): Maximum bytes of text and vectors kept per session for
+                recall. Defaults to 1048576.
         """
-        self.storage = {}
+        self.backend = backend or InMemoryBackend()
+        self.storage = self.backend.open("entries", maxsize=max_entries, ttl=ttl)
+        self.sessions = self.backend.open("sessions", maxsize=max_sessions, ttl=session_ttl)
+        self.session_settings = {
+            "max_turns": max_turns,
+            "max_bytes": max_session_bytes,
+            "max_summary_bytes": max_summary_bytes,
+            "max_recall_turns": max_recall_turns,
+            "summarizer": summarizer,
+            "max_recall_bytes": max_recall_bytes,
+        }
+        self.embedding_generator = embedding_generator
+        self._lock = threading.RLock()
 
     def store(self, key: str, value: any):
         """
@@ -17,7 +84,7 @@ class Memory:
             key (str): The key to store the value under.
             value (any): The value to store.
         """
-        self.storage[key] = value
+        self.storage.put(key, value)
 
     def retrieve(self, key: str) -> any:
         """
@@ -38,18 +105,237 @@ class Memory:
         Args:
             key (str): The key of the value to delete.
         """
-        if key in self.storage:
-            del self.storage[key]
+        self.storage.pop(key)
 
     def clear(self):
         """
         Clear all data from memory.
         """
         self.storage.clear()
+        self.sessions.clear()
+
+    def add_turn(self, session_id: str, role: str, content: str, vector: Optional[np.ndarray] = None) -> Turn:
+        """
+        Append a message to a session, creating the session if needed.
+
+        Args:
+            session_id (str): The session identifier.
+            role (str): Who wrote the message, e.g. 'user' or 'assistant'.
+            content (str): The message text.
+            vector (np.ndarray, optional): A precomputed normalised embedding of the content.
+                Computed when recall is enabled and none is given. Defaults to None.
+
+        Returns:
+            Turn: The stored turn.
+        """
+        if vector is None and self.embedding_generator is not None:
+            vector = self._embed(content)
+        turn = Turn(role, content, time.time(), vector)
+
+        with self._lock:
+            session = self._get_session(session_id)
+            if session is None:
+                session = Session(session_id, **self.session_settings)
+            turn = session.add(turn)
+            # Re-inserting refreshes the session's TTL on every turn
+            self.sessions.put(session_id, session)
+        return turn
+
+    def get_history(self, session_id: str) -> List[Turn]:
+        """
+        Get the verbatim (not yet summarized) turns of a session.
+
+        Args:
+            session_id (str): The session identifier.
+
+        Returns:
+            List[Turn]: The turns, oldest first.
+        """
+        session = self._get_session(session_id)
+        if session is None:
+            return []
+        with self._lock:
+            return list(session.turns)
+
+    def get_summary(self, session_id: str) -> str:
+        """
+        Get the summary of a session's older turns.
+
+        Args:
+            session_id (str): The session identifier.
+
+        Returns:
+            str: The summary, or an empty string.
+        """
+        session = self._get_session(session_id)
+        return session.summary if session is not None else ""
+
+    def recall(self, session_id: str, query: str, k: int = 4, query_vector: Optional[np.ndarray] = None) -> List[Turn]:
+        """
+        Find the past turns of a session most relevant to a query.
+
+        Turns still in the verbatim window are skipped, as they are already part
+        of the history. Requires an ``embedding_generator``.
+
+        Args:
+            session_id (str): The session identifier.
+            query (str): The query text.
+            k (int): Number of turns to return. Defaults to 4.
+            query_vector (np.ndarray, optional): A precomputed normalised embedding of the query. Defaults to None.
+
+        Returns:
+            List[Turn]: The most relevant turns, best first.
+        """
+        if self.embedding_generator is None:
+            raise ValueError("Recall requires Memory to be created with an embedding_generator.")
+
+        session = self._get_session(session_id)
+        if session is None or not session.archive:
+            return []
+        if query_vector is None:
+            query_vector = self._embed(query)
+        with self._lock:
+            return [turn for turn, _ in session.recall(query_vector, k)]
+
+    def build_context(self, session_id: str, query: str, k: int = 4, query_vector: Optional[np.ndarray] = None) -> str:
+        """
+        Assemble a prompt from a session's summary, recalled turns, recent turns and a new input.
+
+        Args:
+            session_id (str): The session identifier.
+            query (str): The new input.
+            k (int): Number of past turns to recall. Defaults to 4.
+            query_vector (np.ndarray, optional): A precomputed normalised embedding of the query. Defaults to None.
+
+        Returns:
+            str: The prompt text.
+        """
+        sections = []
+        summary = self.get_summary(session_id)
+        if summary:
+            sections.append(f"Summary of earlier conversation:\n{summary}")
+        if self.embedding_generator is not None and k > 0:
+            recalled = self.recall(session_id, query, k, query_vector)
+            if recalled:
+                lines = "\n".join(f"{turn.role}: {turn.content}" for turn in recalled)
+                sections.append(f"Relevant earlier turns:\n{lines}")
+        history = self.get_history(session_id)
+        if history:
+            lines = "\n".join(f"{turn.role}: {turn.content}" for turn in history)
+            sections.append(f"Recent conversation:\n{lines}")
+        sections.append(f"Current input:\n{query}")
+        return "\n\n".join(sections)
+
+    def process(self, data: Any, session_id: str = "default", k: int = 4, role: str = "user") -> str:
+        """
+        Turn new input into a memory-augmented prompt and record it in the session.
+
+        Args:
+            data (Any): A string, a list of strings or documents, or any object with a
+                meaningful ``str``.
+            session_id (str): The session identifier. Defaults to 'default'.
+            k (int): Number of past turns to recall. Defaults to 4.
+            role (str): The role the input is recorded under. Defaults to 'user'.
+
+        Returns:
+            str: The prompt text for the LLM.
+        """
+        text = self._to_text(data)
+        vector = self._embed(text) if self.embedding_generator is not None else None
+        context = self.build_context(session_id, text, k, query_vector=vector)
+        self.add_turn(session_id, role, text, vector)
+        return context
+
+    def end_session(self, session_id: str):
+        """
+        Drop a session and its history.
+
+        Args:
+            session_id (str): The session identifier.
+        """
+        self.sessions.pop(session_id)
+
+    def flush(self):
+        """
+        Write pending changes to the storage backend.
+        """
+        self.backend.flush()
+
+    def close(self):
+        """
+        Flush pending changes and release the storage backend.
+        """
+        self.backend.close()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Size and eviction counters of the key/value store and the sessions.
+
+        Returns:
+            Dict[str, Any]: The statistics.
+        """
+        with self._lock:
+            sessions = [session for _, session in self.sessions.items()]
+            return {
+                "entries": len(self.storage),
+                "entry_evictions": self.storage.evictions,
+                "sessions": len(sessions),
+                "session_evictions": self.sessions.evictions,
+                "session_bytes": sum(session.total_size for session in sessions),
+                "recall_bytes": sum(session.archive_bytes for session in sessions),
+                "turns": sum(len(session.turns) for session in sessions),
+                "summarized_turns": sum(session.summarized_turns for session in sessions),
+                "recallable_turns": sum(len(session.archive) for session in sessions),
+            }
+
+    def _get_session(self, session_id: str) -> Optional[Session]:
+        """
+        Load a session and attach the configured summarizer, which is not stored with it.
+
+        Args:
+            session_id (str): The session identifier.
+
+        Returns:
+            Optional[Session]: The session, or None if it does not exist or has expired.
+        """
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.summarizer = self.session_settings["summarizer"] or extractive_summary
+        return session
+
+    @staticmethod
+    def _to_text(data: Any) -> str:
+        """
+        Convert pipeline input into text.
+
+        Args:
+            data (Any): A string, a list of strings or documents, or any other object.
+
+        Returns:
+            str: The text.
+        """
+        if isinstance(data, str):
+            return data
+        if isinstance(data, (list, tuple)):
+            return "\n\n".join(getattr(item, "page_content", None) or str(item) for item in data)
+        return getattr(data, "page_content", None) or str(data)
+
+    def _embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text as an L2-normalised float32 vector.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            np.ndarray: A vector of the embedding dimension.
+        """
+        return self.embedding_generator.generate_embeddings([text], normalize=True)[0]
 
 if __name__ == "__main__":
     # Example usage
-    memory = Memory()
+    memory = Memory(max_turns=4)
 
     # Store data
     memory.store("key1", "value1")
@@ -63,6 +349,26 @@ if __name__ == "__main__":
     memory.delete("key1")
     print("Key1 after deletion:", memory.retrieve("key1"))
 
+    # Conversation memory: older turns are summarized once the window is full
+    for question in ["How do I reset the pump? It keeps beeping.", "Where is the filter?",
+                     "How often should I change it?", "Which model number do I have?"]:
+        prompt = memory.process(question, session_id="alice")
+        memory.add_turn("alice", "assistant", f"Answer to: {question}")
+    print(prompt)
+    print("Memory stats:", memory.stats)
+
     # Clear memory
     memory.clear()
-    print("Memory after clearing:", memory.storage)
\ No newline at end of file
+    print("Memory after clearing:", memory.stats)
+
+    # Persistent memory shared by worker processes
+    import os
+    from .backends import SQLiteBackend
+
+    shared_memory = Memory(backend=SQLiteBackend("memory_example.sqlite"))
+    shared_memory.add_turn("bob", "user", "Remember that my pump is model X-200.")
+    shared_memory.close()
+    reopened_memory = Memory(backend=SQLiteBackend("memory_example.sqlite"))
+    print("History after restart:", [turn.content for turn in reopened_memory.get_history("bob")])
+    reopened_memory.close()
+    os.remove("memory_example.sqlite")
@@ -0,0 +1,269 @@
+import re
+import time
+from collections import deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+import numpy as np
+
+class Turn(NamedTuple):
+    """
+    One message of a conversation, with its embedding if recall is enabled.
+    """
+    role: str
+    content: str
+    timestamp: float
+    vector: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the content in UTF-8 bytes.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return len(self.content.encode("utf-8"))
+
+    @property
+    def archived_size(self) -> int:
+        """
+        Size of the content plus the embedding in bytes, as held in a recall archive.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return self.size + (self.vector.nbytes if self.vector is not None else 0)
+
+def truncate_utf8(text: str, max_bytes: int, marker: str = "...") -> str:
+    """
+    Cut text to at most ``max_bytes`` UTF-8 bytes, ending it with a marker if cut.
+
+    Args:
+        text (str): The text.
+        max_bytes (int): Maximum size in bytes.
+        marker (str): Appended to cut text. Defaults to '...'.
+
+    Returns:
+        str: The text, unchanged if it fits.
+    """
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    room = max(max_bytes - len(marker.encode("utf-8")), 0)
+    return encoded[:room].decode("utf-8", errors="ignore") + marker[:max_bytes]
+
+def extractive_summary(turns: List[Turn], previous_summary: str, max_chars_per_turn: int = 200) -> str:
+    """
+    Summarize turns by keeping the first sentence of each, appended to the previous summary.
+
+    A cheap default that needs no model; pass an LLM-backed summarizer with the
+    same signature to ``Memory`` for abstractive summaries.
+
+    Args:
+        turns (List[Turn]): The turns leaving the recent window, oldest first.
+        previous_summary (str): The summary of even older turns.
+        max_chars_per_turn (int): Maximum characters kept per turn. Defaults to 200.
+
+    Returns:
+        str: The updated summary.
+    """
+    lines = [previous_summary] if previous_summary else []
+    for turn in turns:
+        first_sentence = re.split(r"(?<=[.!?])\s", turn.content.strip(), maxsplit=1)[0]
+        if len(first_sentence) > max_chars_per_turn:
+            first_sentence = first_sentence[:max_chars_per_turn].rstrip() + "..."
+        lines.append(f"{turn.role}: {first_sentence}")
+    return "\n".join(lines)
+
+class Session:
+    """
+    The bounded state of one conversation.
+
+    The most recent turns are kept verbatim until the session holds more than
+    ``max_turns`` turns or ``max_bytes`` bytes (turns plus summary); the oldest
+    turns are then folded into a running summary, which is itself trimmed to
+    ``max_summary_bytes``. A single turn larger than ``max_bytes`` is truncated.
+    Turns with embeddings stay recallable in a separate archive of at most
+    ``max_recall_turns`` entries and ``max_recall_bytes`` bytes (text plus
+    vectors), oldest dropped first.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        max_turns: int = 20,
+        max_bytes: int = 32_768,
+        max_summary_bytes: int = 4096,
+        max_recall_turns: int = 500,
+        summarizer: Optional[Callable[[List[Turn], str], str]] = None,
+        max_recall_bytes: int = 1_048_576
+    ):
+        """
+        Initialize the Session class.
+
+        Args:
+            session_id (str): The session identifier.
+            max_turns (int): Maximum number of verbatim turns. Defaults to 20.
+            max_bytes (int): Maximum UTF-8 bytes of verbatim turns plus summary. Defaults to 32768.
+            max_summary_bytes (int): Maximum UTF-8 bytes of the summary. Defaults to 4096.
+            max_recall_turns (int): Maximum number of turns kept for recall. Defaults to 500.
+            summarizer (Callable[[List[Turn], str], str], optional): Folds old turns into the
+                previous summary. Defaults to ``extractive_summary``.
+            max_recall_bytes (int): Maximum bytes of text and vectors kept for recall.
+                Defaults to 1048576.
+        """
+        if max_turns < 1:
+            raise ValueError("max_turns must be at least 1.")
+
+        self.session_id = session_id
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.max_summary_bytes = max_summary_bytes
+        self.max_recall_turns = max_recall_turns
+        self.max_recall_bytes = max_recall_bytes
+        self.summarizer = summarizer or extractive_summary
+        self.turns: Deque[Turn] = deque()
+        self.archive: Deque[Turn] = deque()
+        self.summary = ""
+        self.turn_bytes = 0
+        self.archive_bytes = 0
+        self.summarized_turns = 0
+        self.updated_at = time.time()
+
+    def __getstate__(self) -> dict:
+        # The summarizer may be a lambda or bound method; Memory re-attaches it after loading
+        state = self.__dict__.copy()
+        state["summarizer"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.summarizer = extractive_summary
+        if "archive_bytes" not in state:
+            # Sessions stored before the recall archive had a byte limit
+            self.max_recall_turns = self.archive.maxlen or 0
+            self.max_recall_bytes = 1_048_576
+            self.archive = deque(self.archive)
+            self.archive_bytes = sum(turn.archived_size for turn in self.archive)
+            self._trim_archive()
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the verbatim turns and the summary in UTF-8 bytes.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return self.turn_bytes + len(self.summary.encode("utf-8"))
+
+    @property
+    def total_size(self) -> int:
+        """
+        Size of the verbatim turns, the summary and the recall archive in bytes.
+
+        Recent turns are shared with the archive but counted in both.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return self.size + self.archive_bytes
+
+    def add(self, turn: Turn) -> Turn:
+        """
+        Append a turn and summarize the oldest turns if a limit is exceeded.
+
+        Args:
+            turn (Turn): The new turn.
+
+        Returns:
+            Turn: The stored turn, with its content truncated to ``max_bytes`` if needed.
+        """
+        if turn.size > self.max_bytes:
+            turn = turn._replace(content=truncate_utf8(turn.content, self.max_bytes))
+        self.turns.append(turn)
+        self.turn_bytes += turn.size
+        if turn.vector is not None and self.max_recall_turns > 0:
+            self.archive.append(turn)
+            self.archive_bytes += turn.archived_size
+            self._trim_archive()
+        self.updated_at = turn.timestamp
+        self._compact()
+        return turn
+
+    def recall(self, query_vector: np.ndarray, k: int = 4, exclude_recent: bool = True) -> List[Tuple[Turn, float]]:
+        """
+        Find the archived turns most similar to a query embedding.
+
+        Args:
+            query_vector (np.ndarray): The L2-normalised query embedding.
+            k (int): Number of turns to return. Defaults to 4.
+            exclude_recent (bool): Skip turns still in the verbatim window. Defaults to True.
+
+        Returns:
+            List[Tuple[Turn, float]]: (turn, cosine similarity) pairs, best first.
+        """
+        recent = {id(turn) for turn in self.turns} if exclude_recent else set()
+        candidates = [turn for turn in self.archive if id(turn) not in recent]
+        if not candidates or k <= 0:
+            return []
+
+        scores = np.stack([turn.vector for turn in candidates]) @ np.asarray(query_vector, dtype=np.float32).ravel()
+        top = np.argsort(-scores)[:k] if len(scores) <= k else np.argpartition(-scores, k)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(candidates[index], float(scores[index])) for index in top]
+
+    def _compact(self):
+        """
+        Fold the oldest turns into the summary until the session fits its limits.
+        """
+        evicted: List[Turn] = []
+        while len(self.turns) > 1 and (
+            len(self.turns) > self.max_turns or self.turn_bytes + len(self.summary.encode("utf-8")) > self.max_bytes
+        ):
+            turn = self.turns.popleft()
+            self.turn_bytes -= turn.size
+            evicted.append(turn)
+        if not evicted:
+            return
+
+        self.summary = self._trim(self.summarizer(evicted, self.summary))
+        self.summarized_turns += len(evicted)
+        # A long summary can itself push the session over its byte limit
+        while len(self.turns) > 1 and self.size > self.max_bytes:
+            turn = self.turns.popleft()
+            self.turn_bytes -= turn.size
+            self.summary = self._trim(self.summarizer([turn], self.summary))
+            self.summarized_turns += 1
+        if self.size > self.max_bytes:
+            # Only the latest turn is left; the summary gives up the rest of the room
+            self.summary = self._trim(self.summary, self.max_bytes - self.turn_bytes)
+
+    def _trim_archive(self):
+        """
+        Drop the oldest archived turns until the archive fits its turn and byte limits.
+        """
+        while self.archive and (
+            len(self.archive) > self.max_recall_turns or self.archive_bytes > self.max_recall_bytes
+        ):
+            self.archive_bytes -= self.archive.popleft().archived_size
+
+    def _trim(self, summary: str, max_bytes: Optional[int] = None) -> str:
+        """
+        Drop the oldest summary lines until the summary fits ``max_summary_bytes``.
+
+        Args:
+            summary (str): The summary.
+            max_bytes (int, optional): A tighter limit. Defaults to ``max_summary_bytes``.
+
+        Returns:
+            str: The trimmed summary.
+        """
+        limit = self.max_summary_bytes if max_bytes is None else min(max_bytes, self.max_summary_bytes)
+        if limit <= 0:
+            return ""
+        encoded = summary.encode("utf-8")
+        if len(encoded) <= limit:
+            return summary
+        trimmed = encoded[-limit:].decode("utf-8", errors="ignore")
+        newline = trimmed.find("\n")
+        return trimmed[newline + 1:] if 0 <= newline < len(trimmed) - 1 else trimmed
@@ -0,0 +1,347 @@
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import faiss
+import numpy as np
+
+class ANNIndexBuilder:
+    """
+    A class to build, train and tune FAISS indexes for approximate nearest-neighbour search.
+
+    Supported index types:
+        - 'flat': exact search; cost grows linearly with the number of vectors.
+        - 'ivf_flat': inverted lists of full vectors; searches ``nprobe`` of ``nlist`` clusters.
+        - 'ivf_pq': inverted lists of product-quantized codes; smallest memory footprint.
+        - 'hnsw': graph-based search tuned by ``ef_search``; no training, but vectors
+          cannot be removed once added.
+
+    All indexes accept explicit int64 IDs (``add_with_ids``), so IDs stay stable
+    when vectors are removed.
+    """
+
+    INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+    @staticmethod
+    def build(
+        dimension: int,
+        index_type: str = "flat",
+        metric: str = "l2",
+        num_vectors: Optional[int] = None,
+        nlist: Optional[int] = None,
+        pq_m: int = 16,
+        pq_nbits: int = 8,
+        hnsw_m: int = 32,
+        ef_construction: int = 200
+    ) -> faiss.Index:
+        """
+        Create an empty FAISS index.
+
+        Args:
+            dimension (int): Dimensionality of the vectors.
+            index_type (str): One of 'flat', 'ivf_flat', 'ivf_pq' or 'hnsw'. Defaults to 'flat'.
+            metric (str): 'l2' for Euclidean distance or 'ip' for inner product. Defaults to 'l2'.
+            num_vectors (int, optional): Expected number of vectors, used to pick ``nlist``. Defaults to None.
+            nlist (int, optional): Number of IVF clusters. Defaults to about 4 * sqrt(num_vectors).
+            pq_m (int): Number of PQ sub-quantizers; must divide ``dimension``. Defaults to 16.
+            pq_nbits (int): Bits per PQ code. Defaults to 8.
+            hnsw_m (int): Number of HNSW graph neighbours per node. Defaults to 32.
+            ef_construction (int): HNSW candidate list size while building. Defaults to 200.
+
+        Returns:
+            faiss.Index: The index. IVF indexes must be trained before vectors are added.
+        """
+        if index_type not in ANNIndexBuilder.INDEX_TYPES:
+            raise ValueError(f"Unsupported index type '{index_type}'. Choose from {ANNIndexBuilder.INDEX_TYPES}.")
+        faiss_metric = ANNIndexBuilder._faiss_metric(metric)
+
+        if index_type == "flat":
+            return faiss.IndexIDMap2(faiss.IndexFlat(dimension, faiss_metric))
+
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, hnsw_m, faiss_metric)
+            index.hnsw.efConstruction = ef_construction
+            return faiss.IndexIDMap2(index)
+
+        nlist = nlist or ANNIndexBuilder.default_nlist(num_vectors)
+        quantizer = faiss.IndexFlat(dimension, faiss_metric)
+        if index_type == "ivf_flat":
+            return faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss_metric)
+
+        if dimension % pq_m != 0:
+            raise ValueError(f"pq_m ({pq_m}) must divide the vector dimension ({dimension}).")
+        return faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, pq_nbits, faiss_metric)
+
+    @staticmethod
+    def default_nlist(num_vectors: Optional[int]) -> int:
+        """
+        Pick a number of IVF clusters for a corpus size.
+
+        Args:
+            num_vectors (Optional[int]): Expected number of vectors.
+
+        Returns:
+            int: About 4 * sqrt(num_vectors), capped so each cluster gets at least 39
+            training points as FAISS recommends, or 1024 if the size is unknown.
+        """
+        if not num_vectors:
+            return 1024
+        return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+    @staticmethod
+    def fit_to_training_set(
+        index_type: str, num_training: int, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Adjust an index configuration so it can be trained on a small sample.
+
+        An 'ivf_pq' index needs at least 2 ** ``pq_nbits`` training vectors for its
+        codebooks; with fewer it is built as 'ivf_flat' instead. An explicit
+        ``nlist`` larger than the sample is lowered to the sample size, since IVF
+        training needs at least one vector per cluster.
+
+        Args:
+            index_type (str): The requested index type.
+            num_training (int): Number of vectors the index will be trained on.
+            params (Dict[str, Any], optional): ``build`` arguments. Defaults to None.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The index type and a copy of the arguments to build with.
+        """
+        params = dict(params or {})
+        if index_type == "ivf_pq" and num_training < 2 ** params.get("pq_nbits", 8):
+            print(f"Only {num_training} training vectors, too few to train PQ; using ivf_flat.")
+            index_type = "ivf_flat"
+        if index_type in ("ivf_flat", "ivf_pq") and params.get("nlist") and params["nlist"] > num_training:
+            print(f"Only {num_training} training vectors; lowering nlist from {params['nlist']} to {num_training}.")
+            params["nlist"] = max(1, num_training)
+        return index_type, params
+
+    @staticmethod
+    def train(index: faiss.Index, vectors: np.ndarray, sample_size: int = 100_000, seed: int = 0):
+        """
+        Train an index on a random sample of vectors. Does nothing for indexes that need no training.
+
+        Args:
+            index (faiss.Index): The index to train.
+            vectors (np.ndarray): Float32 matrix of representative vectors.
+            sample_size (int): Maximum number of vectors used for training. Defaults to 100000.
+            seed (int): Seed of the sampling. Defaults to 0.
+        """
+        if index.is_trained:
+            return
+
+        try:
+            if len(vectors) > sample_size:
+                rows = np.random.default_rng(seed).choice(len(vectors), size=sample_size, replace=False)
+                vectors = vectors[np.sort(rows)]
+            index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+        except Exception as e:
+            raise RuntimeError(f"Failed to train index: {e}")
+
+    @staticmethod
+    def set_search_params(index: faiss.Index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Tune the speed/recall trade-off of an index at query time.
+
+        Args:
+            index (faiss.Index): The index to tune. ID-map wrappers are handled.
+            nprobe (int, optional): Number of IVF clusters visited per query. Defaults to None (unchanged).
+            ef_search (int, optional): HNSW candidate list size per query. Defaults to None (unchanged).
+        """
+        parameters = faiss.ParameterSpace()
+        if nprobe is not None and ANNIndexBuilder.index_type(index) in ("ivf_flat", "ivf_pq"):
+            parameters.set_index_parameter(index, "nprobe", nprobe)
+        if ef_search is not None and ANNIndexBuilder.index_type(index) == "hnsw":
+            parameters.set_index_parameter(index, "efSearch", ef_search)
+
+    @staticmethod
+    def search_parameters(index: faiss.Index, selector: faiss.IDSelector) -> faiss.SearchParameters:
+        """
+        Build per-query search parameters that restrict a search to selected IDs.
+
+        The index's current nprobe / efSearch are carried over, since explicit
+        search parameters replace the index defaults for that call.
+
+        Args:
+            index (faiss.Index): The index to search. ID-map wrappers are handled.
+            selector (faiss.IDSelector): The IDs that may be returned.
+
+        Returns:
+            faiss.SearchParameters: Parameters to pass as ``index.search(..., params=...)``.
+        """
+        inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+        index_type = ANNIndexBuilder.index_type(index)
+        if index_type in ("ivf_flat", "ivf_pq"):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=inner.nprobe)
+        if index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=inner.hnsw.efSearch)
+        return faiss.SearchParameters(sel=selector)
+
+    @staticmethod
+    def index_type(index: faiss.Index) -> str:
+        """
+        Identify the type of an index built by this class.
+
+        Args:
+            index (faiss.Index): The index.
+
+        Returns:
+            str: One of 'flat', 'ivf_flat', 'ivf_pq' or 'hnsw'.
+        """
+        if isinstance(index, faiss.IndexIDMap):
+            index = faiss.downcast_index(index.index)
+        if isinstance(index, faiss.IndexIVFPQ):
+            return "ivf_pq"
+        if isinstance(index, faiss.IndexIVF):
+            return "ivf_flat"
+        if isinstance(index, faiss.IndexHNSW):
+            return "hnsw"
+        return "flat"
+
+    @staticmethod
+    def estimate_memory_bytes(
+        index_type: str,
+        num_vectors: int,
+        dimension: int,
+        nlist: Optional[int] = None,
+        pq_m: int = 16,
+        pq_nbits: int = 8,
+        hnsw_m: int = 32
+    ) -> int:
+        """
+        Estimate the resident size of an index, excluding the docstore.
+
+        Args:
+            index_type (str): One of 'flat', 'ivf_flat', 'ivf_pq' or 'hnsw'.
+            num_vectors (int): Number of vectors in the index.
+            dimension (int): Dimensionality of the vectors.
+            nlist (int, optional): Number of IVF clusters. Defaults to the value ``build`` would pick.
+            pq_m (int): Number of PQ sub-quantizers. Defaults to 16.
+            pq_nbits (int): Bits per PQ code. Defaults to 8.
+            hnsw_m (int): Number of HNSW graph neighbours per node. Defaults to 32.
+
+        Returns:
+            int: Approximate size in bytes.
+        """
+        vector_bytes = 4 * dimension
+        id_bytes = 8
+        if index_type == "flat":
+            return num_vectors * (vector_bytes + id_bytes)
+        if index_type == "hnsw":
+            # Level 0 keeps 2 * M int32 links per node; upper levels add roughly 1 / (M - 1) of that
+            link_bytes = 4 * 2 * hnsw_m * (1 + 1 / max(1, hnsw_m - 1))
+            return int(num_vectors * (vector_bytes + link_bytes + id_bytes))
+
+        nlist = nlist or ANNIndexBuilder.default_nlist(num_vectors)
+        centroid_bytes = nlist * vector_bytes
+        if index_type == "ivf_flat":
+            return num_vectors * (vector_bytes + id_bytes) + centroid_bytes
+        if index_type == "ivf_pq":
+            code_bytes = math.ceil(pq_m * pq_nbits / 8)
+            codebook_bytes = (2 ** pq_nbits) * vector_bytes
+            return num_vectors * (code_bytes + id_bytes) + centroid_bytes + codebook_bytes
+        raise ValueError(f"Unsupported index type '{index_type}'. Choose from {ANNIndexBuilder.INDEX_TYPES}.")
+
+    @staticmethod
+    def benchmark(
+        vectors: np.ndarray,
+        queries: np.ndarray,
+        configs: List[Dict[str, Any]],
+        k: int = 10,
+        metric: str = "l2"
+    ) -> List[Dict[str, Any]]:
+        """
+        Measure recall@k and query latency of index configurations against exact search.
+
+        Each config holds ``build`` keyword arguments (including 'index_type') plus
+        optional 'nprobe' and 'ef_search' search parameters and an optional 'name'.
+
+        Args:
+            vectors (np.ndarray): Float32 matrix of corpus vectors.
+            queries (np.ndarray): Float32 matrix of query vectors.
+            configs (List[Dict[str, Any]]): The configurations to evaluate.
+            k (int): Number of neighbours per query. Defaults to 10.
+            metric (str): 'l2' or 'ip'. Defaults to 'l2'.
+
+        Returns:
+            List[Dict[str, Any]]: One row per configuration, starting with the flat baseline,
+            with 'name', 'build_seconds', 'ms_per_query', 'recall_at_k' and 'memory_bytes'.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        ids = np.arange(len(vectors), dtype=np.int64)
+        report = []
+        ground_truth = None
+
+        for config in [{"name": "flat (exact)", "index_type": "flat"}] + list(configs):
+            config = dict(config)
+            name = config.pop("name", None)
+            nprobe = config.pop("nprobe", None)
+            ef_search = config.pop("ef_search", None)
+            config.setdefault("num_vectors", len(vectors))
+
+            start = time.perf_counter()
+            index = ANNIndexBuilder.build(vectors.shape[1], metric=metric, **config)
+            ANNIndexBuilder.train(index, vectors)
+            index.add_with_ids(vectors, ids)
+            build_seconds = time.perf_counter() - start
+            ANNIndexBuilder.set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+
+            start = time.perf_counter()
+            _, labels = index.search(queries, k)
+            search_seconds = time.perf_counter() - start
+
+            if ground_truth is None:
+                ground_truth = labels
+            hits = sum(len(np.intersect1d(found, expected)) for found, expected in zip(labels, ground_truth))
+
+            memory_params = {key: config[key] for key in ("nlist", "pq_m", "pq_nbits", "hnsw_m") if key in config}
+            if name is None:
+                name = config["index_type"]
+                name += f" nprobe={nprobe}" if nprobe is not None else ""
+                name += f" ef_search={ef_search}" if ef_search is not None else ""
+            report.append({
+                "name": name,
+                "build_seconds": build_seconds,
+                "ms_per_query": 1000 * search_seconds / max(1, len(queries)),
+                "recall_at_k": hits / (k * max(1, len(queries))),
+                "memory_bytes": ANNIndexBuilder.estimate_memory_bytes(
+                    config["index_type"], len(vectors), vectors.shape[1], **memory_params
+                )
+            })
+        return report
+
+    @staticmethod
+    def _faiss_metric(metric: str) -> int:
+        """
+        Map a metric name to the FAISS metric constant.
+
+        Args:
+            metric (str): 'l2' or 'ip'.
+
+        Returns:
+            int: The FAISS metric constant.
+        """
+        if metric == "l2":
+            return faiss.METRIC_L2
+        if metric == "ip":
+            return faiss.METRIC_INNER_PRODUCT
+        raise ValueError(f"Unsupported metric '{metric}'. Choose 'l2' or 'ip'.")
+
+if __name__ == "__main__":
+    # Example usage: recall@k versus latency on random vectors
+    rng = np.random.default_rng(0)
+    corpus = rng.standard_normal((50_000, 384)).astype(np.float32)
+    sample_queries = rng.standard_normal((200, 384)).astype(np.float32)
+
+    rows = ANNIndexBuilder.benchmark(corpus, sample_queries, k=10, configs=[
+        {"index_type": "ivf_flat", "nprobe": 8},
+        {"index_type": "ivf_flat", "nprobe": 32},
+        {"index_type": "ivf_pq", "nprobe": 32, "pq_m": 48},
+        {"index_type": "hnsw", "ef_search": 64},
+    ])
+    for row in rows:
+        print(
+            f"{row['name']:<40} recall@10={row['recall_at_k']:.3f} "
+            f"{row['ms_per_query']:.3f} ms/query {row['memory_bytes'] / 2**20:.1f} MiB"
+        )
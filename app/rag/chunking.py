@@ -1,20 +1,41 @@
-from typing import Generator
+import re
+from bisect import bisect_left, bisect_right
+from typing import Generator, Iterable, List, Tuple
+
+# Positions right after a paragraph break, and right after sentence-ending punctuation
+PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
 
 class TextChunker:
     """
     A class to handle chunking of text into smaller segments for processing.
+
+    By default chunks are measured in characters. When a tokenizer is given,
+    chunks are measured in tokens of that tokenizer and cut at paragraph or
+    sentence boundaries where possible.
     """
 
-    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+    def __init__(self, chunk_size: int = 500, overlap: int = 50, tokenizer=None):
         """
         Initialize the TextChunker class.
 
         Args:
-            chunk_size (int): Maximum size of each chunk.
-            overlap (int): Number of overlapping characters between chunks.
+            chunk_size (int): Maximum size of each chunk, in characters or tokens.
+            overlap (int): Number of overlapping characters or tokens between chunks.
+            tokenizer (optional): A Hugging Face fast tokenizer, typically the embedding
+                model's (``EmbeddingGenerator.model.tokenizer``). If given, sizes are
+                measured in its tokens. Defaults to None (characters).
         """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be non-negative and smaller than chunk_size.")
+        if tokenizer is not None and not getattr(tokenizer, "is_fast", False):
+            raise ValueError("Token-aware chunking requires a fast tokenizer with offset mapping.")
+
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.tokenizer = tokenizer
 
     def chunk_text(self, text: str) -> Generator[str, None, None]:
         """
@@ -26,14 +47,126 @@ class TextChunker:
         Yields:
             str: A chunk of the text.
         """
+        for start, end in self.chunk_spans(text):
+            yield text[start:end]
+
+    def chunk_spans(self, text: str) -> Generator[Tuple[int, int], None, None]:
+        """
+        Compute the character span of each chunk of the text.
+
+        Args:
+            text (str): The input text to be chunked.
+
+        Yields:
+            Tuple[int, int]: The start (inclusive) and end (exclusive) character offsets of a chunk.
+        """
+        if self.tokenizer is None:
+            yield from self._character_spans(text)
+        elif len(text) <= self.chunk_size:
+            # A token covers at least one character, so short texts fit without tokenizing
+            if text:
+                yield 0, len(text)
+        else:
+            yield from self._token_spans(text)
+
+    def _character_spans(self, text: str) -> Generator[Tuple[int, int], None, None]:
+        """
+        Compute fixed-size character spans with overlap.
+
+        Args:
+            text (str): The input text to be chunked.
+
+        Yields:
+            Tuple[int, int]: Character offsets of each chunk.
+        """
         start = 0
         text_length = len(text)
 
         while start < text_length:
             end = min(start + self.chunk_size, text_length)
-            yield text[start:end]
+            yield start, end
+            if end == text_length:
+                break
             start = end - self.overlap  # Move start with overlap
 
+    def _token_spans(self, text: str) -> Generator[Tuple[int, int], None, None]:
+        """
+        Compute token-budgeted spans that prefer paragraph, then sentence, boundaries.
+
+        The text is tokenized once; chunks are cut by slicing the token offset
+        mapping, so the cost stays linear in the length of the text.
+
+        Args:
+            text (str): The input text to be chunked.
+
+        Yields:
+            Tuple[int, int]: Character offsets of each chunk.
+        """
+        encoding = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        offsets = encoding["offset_mapping"]
+        token_count = len(offsets)
+        if token_count == 0:
+            return
+
+        token_starts = [start for start, _ in offsets]
+        paragraph_breaks = self._boundary_tokens(PARAGRAPH_BOUNDARY, text, token_starts)
+        sentence_breaks = self._boundary_tokens(SENTENCE_BOUNDARY, text, token_starts)
+        min_chunk = max(1, self.chunk_size // 2)
+
+        start = 0
+        while start < token_count:
+            limit = min(start + self.chunk_size, token_count)
+            end = limit
+            if limit < token_count:
+                for breaks in (paragraph_breaks, sentence_breaks):
+                    index = bisect_right(breaks, limit) - 1
+                    if index >= 0 and breaks[index] >= start + min_chunk:
+                        end = breaks[index]
+                        break
+
+            yield offsets[start][0], offsets[end - 1][1]
+            if end == token_count:
+                break
+            start = max(end - self.overlap, start + 1)
+
+    @staticmethod
+    def _boundary_tokens(pattern: "re.Pattern", text: str, token_starts: List[int]) -> List[int]:
+        """
+        Map the boundary matches of a pattern to the index of the first token after each.
+
+        Args:
+            pattern (re.Pattern): The boundary pattern.
+            text (str): The text being chunked.
+            token_starts (List[int]): Start character offset of each token, in order.
+
+        Returns:
+            List[int]: Sorted, de-duplicated token indices at which a chunk may end.
+        """
+        breaks = []
+        for match in pattern.finditer(text):
+            token_index = bisect_left(token_starts, match.end())
+            if token_index < len(token_starts) and (not breaks or breaks[-1] != token_index):
+                breaks.append(token_index)
+        return breaks
+
+    def chunk_pages(
+        self, pages: Iterable[Tuple[str, int, str]]
+    ) -> Generator[Tuple[str, int, int, str], None, None]:
+        """
+        Chunk a stream of pages lazily, one page at a time.
+
+        Args:
+            pages (Iterable[Tuple[str, int, str]]): (source, page, text) records, such as
+                the ``PageRecord`` items yielded by ``DataLoader.iter_pages``.
+
+        Yields:
+            Tuple[str, int, int, str]: (source, page, character offset within the page, chunk)
+            for each chunk of each page.
+        """
+        for source, page, text in pages:
+            for start, end in self.chunk_spans(text):
+                yield source, page, start, text[start:end]
+
 if __name__ == "__main__":
     # Example usage
     sample_text = (
@@ -46,4 +179,13 @@ if __name__ == "__main__":
     chunker = TextChunker(chunk_size=100, overlap=20)
     print("Generated Chunks:")
     for i, chunk in enumerate(chunker.chunk_text(sample_text)):
+        print(f"Chunk {i + 1}: {chunk}")
+
+    # Token-aware chunking with the embedding model's tokenizer
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+    token_chunker = TextChunker(chunk_size=32, overlap=4, tokenizer=tokenizer)
+    print("Generated Token Chunks:")
+    for i, chunk in enumerate(token_chunker.chunk_text(sample_text)):
         print(f"Chunk {i + 1}: {chunk}")
\ No newline at end of file
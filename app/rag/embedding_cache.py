@@ -0,0 +1,115 @@
+import hashlib
+import os
+from typing import Dict, List, Optional
+import numpy as np
+from ..utils.cache import DiskCache, LRUCache
+
+class EmbeddingCache:
+    """
+    A two-tier cache of embedding vectors keyed by model name and text hash.
+
+    Lookups hit an in-memory LRU first and an optional SQLite store second;
+    disk hits are promoted into memory. Vectors are stored as float32 bytes.
+    """
+
+    def __init__(self, max_entries: int = 100_000, disk_path: Optional[str] = None):
+        """
+        Initialize the EmbeddingCache class.
+
+        Args:
+            max_entries (int): Maximum number of vectors kept in memory. Defaults to 100000.
+            disk_path (str, optional): Path of the SQLite file for the persistent tier. Defaults to None (memory only).
+        """
+        self.memory = LRUCache(maxsize=max_entries)
+        self.disk = DiskCache(disk_path, table="embeddings") if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        Build the cache key of a text for a given model.
+
+        Args:
+            model_name (str): Identifier of the embedding model.
+            text (str): The embedded text.
+
+        Returns:
+            str: A SHA-256 hex digest of the model name and text.
+        """
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up the vectors of several keys.
+
+        Args:
+            keys (List[str]): Keys built with ``make_key``.
+
+        Returns:
+            Dict[str, np.ndarray]: The cached vectors of the keys that were found.
+        """
+        found = {}
+        disk_keys = []
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                disk_keys.append(key)
+
+        if disk_keys and self.disk is not None:
+            for key, blob in self.disk.get_many(disk_keys).items():
+                vector = np.frombuffer(blob, dtype=np.float32)
+                self.memory.put(key, vector)
+                found[key] = vector
+
+        self.memory_hits += len(keys) - len(disk_keys)
+        self.disk_hits += len(found) - (len(keys) - len(disk_keys))
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        """
+        Store vectors in both tiers.
+
+        Args:
+            vectors (Dict[str, np.ndarray]): Vectors keyed by ``make_key`` keys.
+        """
+        items = []
+        for key, vector in vectors.items():
+            vector = np.ascontiguousarray(vector, dtype=np.float32)
+            self.memory.put(key, vector)
+            items.append((key, vector.tobytes()))
+
+        if items and self.disk is not None:
+            self.disk.put_many(items)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns:
+            Dict[str, float]: Memory hits, disk hits, misses and the overall hit rate.
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+if __name__ == "__main__":
+    # Example usage
+    cache = EmbeddingCache(max_entries=2, disk_path="embedding_cache_example.sqlite")
+    key = EmbeddingCache.make_key("example-model", "Hello world")
+    cache.put_many({key: np.ones(4, dtype=np.float32)})
+    cache.memory.clear()
+
+    print("Lookup:", cache.get_many([key]))
+    print("Stats:", cache.stats)
+    cache.disk.close()
+    os.remove("embedding_cache_example.sqlite")
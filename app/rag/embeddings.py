@@ -1,40 +1,215 @@
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Union, Generator  # Add Generator import
+from langchain_core.embeddings import Embeddings
+from typing import Dict, List, Optional, Union, Generator  # Add Generator import
+from .embedding_cache import EmbeddingCache
 
-class EmbeddingGenerator:
+class EmbeddingGenerator(Embeddings):
     """
     A class to generate embeddings using the 'sentence-transformers/all-MiniLM-L6-v2' model.
+
+    Also implements the LangChain ``Embeddings`` interface so it can be passed
+    directly to vector stores as their embedding function.
+
+    Supported inference backends:
+        - 'torch': full-precision PyTorch (default).
+        - 'int8': PyTorch with dynamic int8 quantization of the linear layers (CPU only).
+        - 'onnx': ONNX Runtime via sentence-transformers; requires ``optimum[onnxruntime]``.
     """
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    BACKENDS = ("torch", "int8", "onnx")
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        batch_size: int = 64,
+        cache: Optional[EmbeddingCache] = None,
+        backend: str = "torch",
+        onnx_file_name: Optional[str] = None,
+        normalize: bool = False
+    ):
         """
         Initialize the EmbeddingGenerator class.
 
         Args:
             model_name (str): Name of the pre-trained model to use. Defaults to 'sentence-transformers/all-MiniLM-L6-v2'.
+            batch_size (int): Number of texts encoded per forward pass. Defaults to 64.
+            cache (EmbeddingCache, optional): Cache consulted before encoding. Defaults to None.
+            backend (str): Inference backend, one of 'torch', 'int8' or 'onnx'. Defaults to 'torch'.
+            onnx_file_name (str, optional): ONNX file to load from the model repository with the
+                'onnx' backend, e.g. 'onnx/model_qint8_avx512_vnni.onnx' for a pre-quantized
+                export. Defaults to None (the standard 'onnx/model.onnx').
+            normalize (bool): L2-normalise embeddings by default, so inner product equals
+                cosine similarity. Defaults to False.
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported embedding backend '{backend}'. Choose from {self.BACKENDS}.")
+
         self.model_name = model_name
-        self.model = SentenceTransformer(self.model_name)
+        self.batch_size = batch_size
+        self.cache = cache
+        self.backend = backend
+        self.onnx_file_name = onnx_file_name
+        self.normalize = normalize
+        # Vectors from different backends differ slightly, so they are cached separately
+        self.cache_namespace = ":".join(part for part in (model_name, backend, onnx_file_name) if part)
+        self.model = self._load_model()
 
-    def generate_embeddings(self, texts: Union[List[str], Generator[str, None, None]]) -> List[List[float]]:
+    def _load_model(self) -> SentenceTransformer:
+        """
+        Load the model for the configured backend.
+
+        Returns:
+            SentenceTransformer: The loaded model.
+        """
+        try:
+            if self.backend == "onnx":
+                model_kwargs = {"file_name": self.onnx_file_name} if self.onnx_file_name else None
+                return SentenceTransformer(self.model_name, backend="onnx", model_kwargs=model_kwargs)
+
+            if self.backend == "int8":
+                import torch
+
+                model = SentenceTransformer(self.model_name, device="cpu")
+                return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+            return SentenceTransformer(self.model_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load embedding model with backend '{self.backend}': {e}")
+
+    def generate_embeddings(
+        self,
+        texts: Union[List[str], Generator[str, None, None]],
+        batch_size: int = None,
+        normalize: Optional[bool] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for a list of texts.
 
         Args:
             texts (Union[List[str], Generator[str, None, None]]): A list or generator of input texts to generate embeddings for.
+            batch_size (int, optional): Overrides the configured batch size for this call. Defaults to None.
+            normalize (bool, optional): Overrides the configured L2 normalisation for this call. Defaults to None.
 
         Returns:
-            List[List[float]]: A list of embeddings, one for each input text.
+            np.ndarray: A C-contiguous float32 matrix with one embedding row per input text,
+            ready to be passed to FAISS without conversion.
         """
         if not isinstance(texts, list):
             texts = list(texts)  # Convert generator to list
+        if normalize is None:
+            normalize = self.normalize
 
         try:
-            embeddings = self.model.encode(texts, convert_to_tensor=False)
-            return embeddings
+            if not texts:
+                return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+            if self.cache is None:
+                vectors = self._encode(texts, batch_size)
+            else:
+                vectors = self._generate_cached(texts, batch_size)
         except Exception as e:
             raise RuntimeError(f"Failed to generate embeddings: {e}")
 
+        # Cached rows may be read-only views, so normalisation works on a fresh copy
+        matrix = np.array(vectors, dtype=np.float32, order="C", copy=normalize or None)
+        if normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _encode(self, texts: List[str], batch_size: Optional[int]) -> np.ndarray:
+        """
+        Run the model on a list of texts.
+
+        Args:
+            texts (List[str]): The texts to encode.
+            batch_size (Optional[int]): Batch size override, or None for the configured one.
+
+        Returns:
+            np.ndarray: One embedding row per text.
+        """
+        return self.model.encode(texts, batch_size=batch_size or self.batch_size, convert_to_tensor=False)
+
+    def _generate_cached(self, texts: List[str], batch_size: Optional[int]) -> np.ndarray:
+        """
+        Embed texts through the cache, encoding each distinct uncached text once.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            batch_size (Optional[int]): Batch size override, or None for the configured one.
+
+        Returns:
+            np.ndarray: One float32 embedding row per text.
+        """
+        keys = [EmbeddingCache.make_key(self.cache_namespace, text) for text in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self._encode(list(missing.values()), batch_size)
+            computed = dict(zip(missing.keys(), np.asarray(vectors, dtype=np.float32)))
+            self.cache.put_many(computed)
+            found.update(computed)
+
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+    def check_parity(self, texts: List[str], min_cosine: float = 0.99) -> Dict[str, Union[float, bool]]:
+        """
+        Compare this backend's embeddings against the full-precision PyTorch model.
+
+        The cache is bypassed on both sides.
+
+        Args:
+            texts (List[str]): Sample texts to embed with both models.
+            min_cosine (float): Lowest acceptable per-text cosine similarity. Defaults to 0.99.
+
+        Returns:
+            Dict[str, Union[float, bool]]: The minimum and mean cosine similarity, and 'passed'
+            indicating whether every text reached ``min_cosine``.
+        """
+        try:
+            reference_model = self.model if self.backend == "torch" else SentenceTransformer(self.model_name, device="cpu")
+            reference = np.asarray(reference_model.encode(texts, batch_size=self.batch_size), dtype=np.float32)
+            candidate = np.asarray(self._encode(texts, None), dtype=np.float32)
+
+            reference /= np.linalg.norm(reference, axis=1, keepdims=True)
+            candidate /= np.linalg.norm(candidate, axis=1, keepdims=True)
+            cosines = np.sum(reference * candidate, axis=1)
+            return {
+                "min_cosine": float(cosines.min()),
+                "mean_cosine": float(cosines.mean()),
+                "passed": bool(cosines.min() >= min_cosine)
+            }
+        except Exception as e:
+            raise RuntimeError(f"Failed to check embedding parity: {e}")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents (LangChain ``Embeddings`` interface).
+
+        Args:
+            texts (List[str]): The documents to embed.
+
+        Returns:
+            List[List[float]]: A list of embeddings, one for each document.
+        """
+        return self.generate_embeddings(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query (LangChain ``Embeddings`` interface).
+
+        Args:
+            text (str): The query to embed.
+
+        Returns:
+            List[float]: The query embedding.
+        """
+        return self.generate_embeddings([text])[0].tolist()
+
 if __name__ == "__main__":
     # Example usage
     texts = [
@@ -43,8 +218,14 @@ if __name__ == "__main__":
         "How do embeddings work?"
     ]
 
-    generator = EmbeddingGenerator()
+    generator = EmbeddingGenerator(cache=EmbeddingCache())
     embeddings = generator.generate_embeddings(texts)
+    generator.generate_embeddings(texts)  # Served from the cache
+    print("Cache stats:", generator.cache.stats)
+
+    # Int8 CPU backend, checked against the fp32 vectors
+    quantized_generator = EmbeddingGenerator(backend="int8")
+    print("Int8 parity:", quantized_generator.check_parity(texts))
 
     print("Generated Embeddings:")
     for i, embedding in enumerate(embeddings):
@@ -1,7 +1,46 @@
+import hashlib
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Generator, Iterator, List, NamedTuple, Optional, Tuple
 from PyPDF2 import PdfReader
 
+
+class PageRecord(NamedTuple):
+    """
+    The text of one page of a loaded file.
+
+    Attributes:
+        source (str): Path of the file the page belongs to.
+        page (int): Zero-based page index. Non-PDF files are a single page 0.
+        text (str): The extracted page text.
+    """
+    source: str
+    page: int
+    text: str
+
+
+def _extract_text_range(file_path: str, start_page: Optional[int], end_page: Optional[int]) -> List[str]:
+    """
+    Extract the text of a range of PDF pages, or of a whole non-PDF file.
+
+    Runs inside worker processes, so it is defined at module level to be picklable.
+
+    Args:
+        file_path (str): Path to the file.
+        start_page (Optional[int]): First page to extract (inclusive). Ignored for non-PDF files.
+        end_page (Optional[int]): Last page to extract (exclusive). Ignored for non-PDF files.
+
+    Returns:
+        List[str]: The text of each extracted page, or a single-item list for non-PDF files.
+    """
+    if file_path.endswith(".pdf"):
+        reader = PdfReader(file_path)
+        return [reader.pages[index].extract_text() or "" for index in range(start_page, end_page)]
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [file.read()]
+
 class DataLoader:
     """
     A class to handle loading and preprocessing of data.
@@ -15,6 +54,7 @@ class DataLoader:
             data_directory (str): Path to the directory containing data files. Defaults to the specified data directory.
         """
         self.data_directory = data_directory
+        self.errors: Dict[str, str] = {}
 
     def list_files(self, extensions: List[str] = None) -> List[str]:
         """
@@ -59,19 +99,292 @@ class DataLoader:
         except Exception as e:
             raise RuntimeError(f"Failed to load file {file_path}: {e}")
 
-    def load_all_files(self, extensions: List[str] = None) -> List[str]:
+    @staticmethod
+    def fingerprint_file(file_path: str, previous: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Compute the size, modification time and SHA-256 content hash of a file.
+
+        If a previous fingerprint with the same size and mtime is given, its hash
+        is reused and the file is not read.
+
+        Args:
+            file_path (str): Path to the file.
+            previous (Dict[str, Any], optional): The file's last recorded fingerprint. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: A dict with 'size', 'mtime_ns' and 'sha256' keys.
+        """
+        try:
+            stat = os.stat(file_path)
+            if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+                return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": previous["sha256"]}
+
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+            return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+        except Exception as e:
+            raise RuntimeError(f"Failed to fingerprint file {file_path}: {e}")
+
+    @staticmethod
+    def fingerprint_date(fingerprint: Dict[str, Any]) -> str:
+        """
+        Return the modification date recorded in a fingerprint.
+
+        Args:
+            fingerprint (Dict[str, Any]): A fingerprint from ``fingerprint_file``.
+
+        Returns:
+            str: The local modification date in ISO format (YYYY-MM-DD), which sorts chronologically.
+        """
+        return datetime.fromtimestamp(fingerprint["mtime_ns"] / 1e9).date().isoformat()
+
+    def detect_changes(self, manifest_entries: Dict[str, Dict[str, Any]], extensions: List[str] = None) -> Dict[str, Any]:
+        """
+        Compare the files in the data directory against a manifest of ingested files.
+
+        Files whose size and mtime are unchanged are not hashed. Files whose mtime
+        changed but whose content hash did not are reported as unchanged.
+
+        Args:
+            manifest_entries (Dict[str, Dict[str, Any]]): Recorded fingerprints keyed by file path.
+            extensions (List[str], optional): List of file extensions to filter by. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: Lists of 'added', 'changed', 'unchanged' and 'removed' file
+            paths, plus the current 'fingerprints' keyed by file path.
+        """
+        changes = {"added": [], "changed": [], "unchanged": [], "removed": [], "fingerprints": {}}
+        current_files = self.list_files(extensions)
+
+        for file_path in current_files:
+            previous = manifest_entries.get(file_path)
+            fingerprint = self.fingerprint_file(file_path, previous)
+            changes["fingerprints"][file_path] = fingerprint
+            if previous is None:
+                changes["added"].append(file_path)
+            elif previous.get("sha256") != fingerprint["sha256"]:
+                changes["changed"].append(file_path)
+            else:
+                changes["unchanged"].append(file_path)
+
+        seen = set(current_files)
+        changes["removed"] = [file_path for file_path in manifest_entries if file_path not in seen]
+        return changes
+
+    def iter_files(
+        self,
+        file_paths: List[str],
+        workers: Optional[int] = None,
+        pages_per_task: int = 32,
+        max_in_flight: Optional[int] = None
+    ) -> Generator[Tuple[str, Optional[str], Optional[str]], None, None]:
+        """
+        Load files one by one, optionally extracting text in a process pool.
+
+        With ``workers`` set, files are split into tasks of at most ``pages_per_task``
+        PDF pages that run in parallel across files and across the pages of large
+        PDFs. At most ``max_in_flight`` tasks are queued at once, and results are
+        yielded in the order of ``file_paths``. A file that fails to load is
+        reported through its error message instead of aborting the iteration.
+
+        Args:
+            file_paths (List[str]): Paths of the files to load.
+            workers (int, optional): Number of worker processes. Defaults to None (load serially in-process).
+            pages_per_task (int): Maximum number of PDF pages extracted per task. Defaults to 32.
+            max_in_flight (int, optional): Maximum number of queued tasks. Defaults to twice the number of workers.
+
+        Yields:
+            Tuple[str, Optional[str], Optional[str]]: (file path, content, error). Content is None
+            and error holds the failure message if the file could not be loaded.
+        """
+        pages: List[str] = []
+        file_error = None
+        for file_path, _, page_texts, is_last, error in self._iter_extracted(
+            file_paths, workers, pages_per_task, max_in_flight
+        ):
+            pages.extend(page_texts)
+            file_error = file_error or error
+            if is_last:
+                if file_error:
+                    yield file_path, None, f"Failed to load file {file_path}: {file_error}"
+                else:
+                    yield file_path, "\n".join(pages), None
+                pages = []
+                file_error = None
+
+    def iter_pages(
+        self,
+        file_paths: List[str],
+        workers: Optional[int] = None,
+        pages_per_task: int = 32,
+        max_in_flight: Optional[int] = None
+    ) -> Generator[PageRecord, None, None]:
+        """
+        Lazily yield the text of each page of each file, without joining pages.
+
+        Only the pages being extracted are held in memory, so the whole corpus
+        never sits in RAM. Parallelism and ordering follow ``iter_files``. If a
+        file fails part-way, the pages already yielded stand, the rest of the file
+        is skipped and the error is recorded in ``self.errors``.
+
+        Args:
+            file_paths (List[str]): Paths of the files to load.
+            workers (int, optional): Number of worker processes. Defaults to None (load serially in-process).
+            pages_per_task (int): Maximum number of PDF pages extracted per task. Defaults to 32.
+            max_in_flight (int, optional): Maximum number of queued tasks. Defaults to twice the number of workers.
+
+        Yields:
+            PageRecord: (source, page, text) for each page, in file and page order.
+        """
+        for file_path, start_page, page_texts, _, error in self._iter_extracted(
+            file_paths, workers, pages_per_task, max_in_flight
+        ):
+            if error:
+                print(f"Failed to load file {file_path}: {error}")
+                self.errors[file_path] = f"Failed to load file {file_path}: {error}"
+            for offset, text in enumerate(page_texts):
+                yield PageRecord(file_path, start_page + offset, text)
+
+    def _iter_extracted(
+        self,
+        file_paths: List[str],
+        workers: Optional[int],
+        pages_per_task: int,
+        max_in_flight: Optional[int]
+    ) -> Iterator[Tuple[str, int, List[str], bool, Optional[str]]]:
+        """
+        Extract files as runs of consecutive pages, serially or in a process pool.
+
+        Once a file reports an error, no further pages of it are yielded; its
+        remaining runs only carry the end-of-file marker.
+
+        Args:
+            file_paths (List[str]): Paths of the files to load.
+            workers (Optional[int]): Number of worker processes, or None to extract in-process.
+            pages_per_task (int): Maximum number of PDF pages extracted per task.
+            max_in_flight (Optional[int]): Maximum number of queued tasks.
+
+        Yields:
+            Tuple[str, int, List[str], bool, Optional[str]]: (file path, index of the first page,
+            page texts, whether it is the file's last run, error).
+        """
+        if not workers:
+            for file_path in file_paths:
+                page_index = 0
+                try:
+                    if file_path.endswith(".pdf"):
+                        reader = PdfReader(file_path)
+                        page_count = len(reader.pages)
+                        if page_count == 0:
+                            yield file_path, 0, [], True, None
+                        for page_index in range(page_count):
+                            text = reader.pages[page_index].extract_text() or ""
+                            yield file_path, page_index, [text], page_index == page_count - 1, None
+                    else:
+                        yield file_path, 0, _extract_text_range(file_path, None, None), True, None
+                except Exception as e:
+                    yield file_path, page_index, [], True, str(e)
+            return
+
+        if pages_per_task < 1:
+            raise ValueError("pages_per_task must be at least 1.")
+        max_in_flight = max_in_flight or workers * 2
+        tasks = self._plan_extraction_tasks(file_paths, pages_per_task)
+        pending = deque()
+        file_failed = False
+        exhausted = False
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_in_flight:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    file_path, start_page, end_page, is_last, error = task
+                    future = None if error else pool.submit(_extract_text_range, file_path, start_page, end_page)
+                    pending.append((file_path, start_page or 0, future, is_last, error))
+
+                if not pending:
+                    break
+
+                file_path, start_page, future, is_last, error = pending.popleft()
+                page_texts: List[str] = []
+                if file_failed:
+                    if future is not None:
+                        future.cancel()
+                    error = None
+                elif future is not None:
+                    try:
+                        page_texts = future.result()
+                    except Exception as e:
+                        error = str(e)
+                file_failed = file_failed or error is not None
+
+                yield file_path, start_page, page_texts, is_last, error
+                if is_last:
+                    file_failed = False
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _plan_extraction_tasks(
+        file_paths: List[str], pages_per_task: int
+    ) -> Iterator[Tuple[str, Optional[int], Optional[int], bool, Optional[str]]]:
+        """
+        Split files into extraction tasks of bounded page count.
+
+        Args:
+            file_paths (List[str]): Paths of the files to split.
+            pages_per_task (int): Maximum number of PDF pages per task.
+
+        Yields:
+            Tuple[str, Optional[int], Optional[int], bool, Optional[str]]: (file path, start page,
+            end page, whether it is the file's last task, planning error).
+        """
+        for file_path in file_paths:
+            if not file_path.endswith(".pdf"):
+                yield file_path, None, None, True, None
+                continue
+
+            try:
+                page_count = len(PdfReader(file_path).pages)
+            except Exception as e:
+                yield file_path, None, None, True, str(e)
+                continue
+
+            starts = list(range(0, page_count, pages_per_task)) or [0]
+            for start_page in starts:
+                end_page = min(start_page + pages_per_task, page_count)
+                yield file_path, start_page, end_page, start_page == starts[-1], None
+
+    def load_all_files(self, extensions: List[str] = None, workers: Optional[int] = None) -> List[str]:
         """
         Load the content of all files in the data directory with optional filtering by extensions.
 
+        Files that fail to load are skipped and their errors recorded in ``self.errors``.
+
         Args:
             extensions (List[str], optional): List of file extensions to filter by. Defaults to None.
+            workers (int, optional): Number of worker processes for text extraction. Defaults to None (serial).
 
         Returns:
-            List[str]: List of file contents.
+            List[str]: List of file contents, in file order, for the files that loaded successfully.
         """
         try:
             file_paths = self.list_files(extensions)
-            return [self.load_file(file_path) for file_path in file_paths]
+            self.errors = {}
+            contents = []
+            for file_path, content, error in self.iter_files(file_paths, workers=workers):
+                if error:
+                    print(f"Skipping {file_path}: {error}")
+                    self.errors[file_path] = error
+                else:
+                    contents.append(content)
+            return contents
         except Exception as e:
             raise RuntimeError(f"Failed to load all files: {e}")
 
@@ -85,4 +398,12 @@ if __name__ == "__main__":
 
     print("Loading all .pdf files...")
     for pdf_file in pdf_files:
-        print(f"File path: {pdf_file}")
\ No newline at end of file
+        print(f"File path: {pdf_file}")
+
+    print("Streaming pages...")
+    for record in loader.iter_pages(pdf_files):
+        print(f"{record.source} page {record.page}: {len(record.text)} characters")
+
+    print("Loading all .pdf files in parallel...")
+    contents = loader.load_all_files(extensions=[".pdf"], workers=os.cpu_count())
+    print(f"Loaded {len(contents)} files, {len(loader.errors)} failed.")
\ No newline at end of file
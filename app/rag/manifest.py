@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+from .vector_store import DEFAULT_INDEX_DIRECTORY
+
+class FileManifest:
+    """
+    A class to track which files have been ingested and the chunks they produced.
+
+    Each entry maps a file path to its size, modification time, content hash and
+    the docstore IDs of its chunks, so re-ingestion can skip unchanged files and
+    remove the vectors of files that changed or disappeared.
+    """
+
+    def __init__(self, manifest_path: str = os.path.join(DEFAULT_INDEX_DIRECTORY, "manifest.json")):
+        """
+        Initialize the FileManifest class.
+
+        Args:
+            manifest_path (str): Path of the JSON manifest file. Defaults to 'manifest.json' in the embeddings directory.
+        """
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> "FileManifest":
+        """
+        Load the manifest from disk. A missing file yields an empty manifest.
+
+        Returns:
+            FileManifest: The manifest itself, for chaining.
+        """
+        try:
+            if os.path.isfile(self.manifest_path):
+                with open(self.manifest_path, "r", encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            else:
+                self.entries = {}
+            return self
+        except Exception as e:
+            raise RuntimeError(f"Failed to load manifest {self.manifest_path}: {e}")
+
+    def save(self):
+        """
+        Atomically write the manifest to disk.
+        """
+        try:
+            directory = os.path.dirname(self.manifest_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.manifest_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to save manifest {self.manifest_path}: {e}")
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the manifest entry of a file.
+
+        Args:
+            file_path (str): The file path.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry, or None if the file is not tracked.
+        """
+        return self.entries.get(file_path)
+
+    def update(self, file_path: str, fingerprint: Dict[str, Any], doc_ids: Optional[List[str]] = None):
+        """
+        Record the fingerprint of a file and, optionally, the IDs of its chunks.
+
+        Args:
+            file_path (str): The file path.
+            fingerprint (Dict[str, Any]): The size, mtime and hash of the file.
+            doc_ids (List[str], optional): Docstore IDs of the file's chunks. If None,
+                the previously recorded IDs are kept. Defaults to None.
+        """
+        if doc_ids is None:
+            doc_ids = self.entries.get(file_path, {}).get("doc_ids", [])
+        self.entries[file_path] = {**fingerprint, "doc_ids": list(doc_ids)}
+
+    def remove(self, file_path: str) -> List[str]:
+        """
+        Stop tracking a file.
+
+        Args:
+            file_path (str): The file path.
+
+        Returns:
+            List[str]: The docstore IDs that were recorded for the file.
+        """
+        entry = self.entries.pop(file_path, None)
+        return entry.get("doc_ids", []) if entry else []
+
+    def clear(self):
+        """
+        Remove all entries from the manifest.
+        """
+        self.entries.clear()
+
+if __name__ == "__main__":
+    # Example usage
+    manifest = FileManifest("manifest_example.json")
+    manifest.update("data/example.pdf", {"size": 1024, "mtime_ns": 0, "sha256": "abc"}, ["id-1", "id-2"])
+    manifest.save()
+
+    reloaded = FileManifest("manifest_example.json").load()
+    print("Tracked files:", list(reloaded.entries))
+    os.remove("manifest_example.json")
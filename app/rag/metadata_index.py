@@ -0,0 +1,185 @@
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+import faiss
+import numpy as np
+
+# Range operators accepted in filters, e.g. {"date": {"$gte": "2024-01-01"}}
+RANGE_OPERATORS = {
+    "$gt": lambda value, bound: value > bound,
+    "$gte": lambda value, bound: value >= bound,
+    "$lt": lambda value, bound: value < bound,
+    "$lte": lambda value, bound: value <= bound,
+}
+
+class MetadataIndex:
+    """
+    Per-field inverted indexes from metadata values to FAISS labels.
+
+    Each indexed field maps every distinct value to the set of labels whose
+    document carries it. A filter is resolved into a label set by unions
+    within a field and intersections across fields, and is then turned into a
+    FAISS ``IDSelector`` so the restriction is applied inside the index search
+    instead of by over-fetching and discarding results.
+    """
+
+    def __init__(self, fields: Iterable[str] = ("source", "page", "date")):
+        """
+        Initialize the MetadataIndex class.
+
+        Args:
+            fields (Iterable[str]): The metadata fields to index. Defaults to ('source', 'page', 'date').
+        """
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Dict[Hashable, Set[int]]] = {field: {} for field in self.fields}
+        # Indexed values of each label, so removals touch only that label's postings
+        self.label_values: Dict[int, tuple] = {}
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore, fields: Iterable[str] = ("source", "page", "date")) -> "MetadataIndex":
+        """
+        Build an index from the documents of a FAISS vector store.
+
+        Args:
+            vectorstore (FAISS): The vector store.
+            fields (Iterable[str]): The metadata fields to index. Defaults to ('source', 'page', 'date').
+
+        Returns:
+            MetadataIndex: The index over the store's FAISS labels.
+        """
+        index = cls(fields)
+        labels = list(vectorstore.index_to_docstore_id)
+        documents = [vectorstore.docstore.search(doc_id) for doc_id in vectorstore.index_to_docstore_id.values()]
+        index.add(labels, [getattr(document, "metadata", None) or {} for document in documents])
+        return index
+
+    def add(self, labels: Iterable[int], metadatas: Iterable[Dict[str, Any]]):
+        """
+        Index the metadata of newly added vectors.
+
+        Args:
+            labels (Iterable[int]): The FAISS labels of the vectors.
+            metadatas (Iterable[Dict[str, Any]]): One metadata dict per label.
+        """
+        for label, metadata in zip(labels, metadatas):
+            label = int(label)
+            values = tuple(metadata.get(field) for field in self.fields)
+            self.label_values[label] = values
+            for field, value in zip(self.fields, values):
+                if value is not None:
+                    self.postings[field].setdefault(value, set()).add(label)
+
+    def remove(self, labels: Iterable[int]):
+        """
+        Drop removed vectors from the index.
+
+        Args:
+            labels (Iterable[int]): The FAISS labels of the removed vectors.
+        """
+        for label in labels:
+            values = self.label_values.pop(int(label), None)
+            if values is None:
+                continue
+            for field, value in zip(self.fields, values):
+                postings = self.postings[field].get(value)
+                if postings is not None:
+                    postings.discard(int(label))
+                    if not postings:
+                        del self.postings[field][value]
+
+    def select(self, filter: Dict[str, Any]) -> np.ndarray:
+        """
+        Resolve a metadata filter into the labels that satisfy it.
+
+        Each filter entry maps a field to a single value, a list of accepted
+        values, or a dict of range operators ('$gt', '$gte', '$lt', '$lte').
+        All entries must match. Range operators skip values that cannot be
+        compared with the bound, e.g. string pages under a numeric range.
+
+        Args:
+            filter (Dict[str, Any]): The metadata filter.
+
+        Returns:
+            np.ndarray: The matching labels as a sorted int64 array.
+        """
+        selected: Optional[Set[int]] = None
+        for field, condition in filter.items():
+            if field not in self.postings:
+                raise ValueError(f"Metadata field '{field}' is not indexed; indexed fields: {self.fields}.")
+
+            values = self.postings[field]
+            if isinstance(condition, dict):
+                unknown = set(condition) - set(RANGE_OPERATORS)
+                if unknown:
+                    raise ValueError(f"Unsupported filter operators: {sorted(unknown)}.")
+                matched = [value for value in values if self._in_range(value, condition)]
+            elif isinstance(condition, (list, tuple, set)):
+                matched = [value for value in condition if value in values]
+            else:
+                matched = [condition] if condition in values else []
+
+            field_labels = set().union(*(values[value] for value in matched))
+            selected = field_labels if selected is None else selected & field_labels
+            if not selected:
+                break
+
+        labels = self.label_values.keys() if selected is None else selected
+        return np.array(sorted(labels), dtype=np.int64)
+
+    @staticmethod
+    def _in_range(value: Any, condition: Dict[str, Any]) -> bool:
+        """
+        Check a value against range operators, treating values of incomparable types as no match.
+
+        Args:
+            value (Any): The metadata value.
+            condition (Dict[str, Any]): Range operators mapped to their bounds.
+
+        Returns:
+            bool: True if the value satisfies every operator.
+        """
+        try:
+            return all(RANGE_OPERATORS[operator](value, bound) for operator, bound in condition.items())
+        except TypeError:
+            return False
+
+    @staticmethod
+    def to_selector(labels: np.ndarray) -> faiss.IDSelector:
+        """
+        Build a FAISS ID selector for a set of labels.
+
+        Large selections use a bitmap over the label range (one bit per label);
+        small ones use a hashed batch selector.
+
+        Args:
+            labels (np.ndarray): Sorted int64 labels.
+
+        Returns:
+            faiss.IDSelector: The selector. The label array backing it is kept
+            alive as an attribute of the selector.
+        """
+        labels = np.ascontiguousarray(labels, dtype=np.int64)
+        label_range = int(labels[-1]) + 1 if len(labels) else 0
+        if len(labels) * 64 >= label_range > 0:
+            mask = np.zeros(label_range, dtype=bool)
+            mask[labels] = True
+            bitmap = np.packbits(mask, bitorder="little")
+            selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+            selector.referenced_array = bitmap
+        else:
+            selector = faiss.IDSelectorBatch(len(labels), faiss.swig_ptr(labels))
+            selector.referenced_array = labels
+        return selector
+
+if __name__ == "__main__":
+    # Example usage
+    index = MetadataIndex()
+    index.add(
+        [0, 1, 2, 3],
+        [
+            {"source": "a.pdf", "page": 1, "date": "2024-01-05"},
+            {"source": "a.pdf", "page": 2, "date": "2024-01-05"},
+            {"source": "b.pdf", "page": 1, "date": "2024-03-10"},
+            {"source": "c.pdf", "page": 7, "date": "2023-12-31"},
+        ]
+    )
+    print("source=a.pdf:", index.select({"source": "a.pdf"}))
+    print("page in [1, 7], 2024 or later:", index.select({"page": [1, 7], "date": {"$gte": "2024-01-01"}}))
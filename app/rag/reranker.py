@@ -0,0 +1,180 @@
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+from sentence_transformers import CrossEncoder
+from langchain.schema import Document
+from ..utils.cache import LRUCache
+
+class CrossEncoderReranker:
+    """
+    A class to rerank retrieved chunks with a cross-encoder.
+
+    The cross-encoder reads each (query, chunk) pair jointly, which ranks far
+    better than comparing independent embeddings but costs one forward pass per
+    pair. To bound that cost, only the first N candidates are scored, N shrinks
+    when the measured time per pair would exceed the latency budget, and scores
+    are cached per (query, chunk ID).
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 32,
+        max_candidates: int = 20,
+        min_candidates: int = 5,
+        latency_budget_ms: Optional[float] = None,
+        cache_size: int = 10_000,
+        cache_ttl: Optional[float] = None
+    ):
+        """
+        Initialize the CrossEncoderReranker class.
+
+        Args:
+            model_name (str): Name of the cross-encoder model. Defaults to 'cross-encoder/ms-marco-MiniLM-L-6-v2'.
+            batch_size (int): Number of pairs scored per forward pass. Defaults to 32.
+            max_candidates (int): Maximum number of candidates scored per query. Defaults to 20.
+            min_candidates (int): Number of candidates always scored, even over budget. Defaults to 5.
+            latency_budget_ms (float, optional): Target scoring time per query in milliseconds.
+                Defaults to None (always score ``max_candidates``).
+            cache_size (int): Maximum number of cached (query, chunk) scores. Defaults to 10000.
+            cache_ttl (float, optional): Seconds after which a cached score expires. Defaults to None.
+        """
+        if min_candidates < 1 or max_candidates < min_candidates:
+            raise ValueError("Require 1 <= min_candidates <= max_candidates.")
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_candidates = max_candidates
+        self.min_candidates = min_candidates
+        self.latency_budget_ms = latency_budget_ms
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        # Exponentially weighted moving average of the scoring time per pair
+        self.seconds_per_pair: Optional[float] = None
+        self.smoothing = 0.2
+        self.stats: Dict[str, float] = {"queries": 0, "pairs_scored": 0, "cache_hits": 0, "candidates_cut": 0}
+        try:
+            self.model = CrossEncoder(model_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load cross-encoder model '{model_name}': {e}")
+
+    @staticmethod
+    def cache_key(query: str, document: Document) -> Tuple[str, str]:
+        """
+        Build the cache key of a (query, chunk) pair.
+
+        Args:
+            query (str): The query text.
+            document (Document): The chunk; its docstore ID is used, or a content hash if it has none.
+
+        Returns:
+            Tuple[str, str]: The cache key.
+        """
+        chunk_id = document.id or hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+        return query, chunk_id
+
+    def rerank(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Tuple[Document, float]]:
+        """
+        Reorder retrieved documents by cross-encoder relevance.
+
+        Candidates beyond the scored ones keep their retrieval order and follow
+        the reranked ones.
+
+        Args:
+            query (str): The query text.
+            documents (List[Document]): The candidates, best first by retrieval score.
+            top_k (int, optional): Number of documents to return. Defaults to all.
+
+        Returns:
+            List[Tuple[Document, float]]: (document, score) pairs, best first. Unscored
+            candidates have a score of negative infinity.
+        """
+        candidates = documents[:self._candidate_count(query, documents)]
+        scores = self.score(query, candidates)
+        ranked = sorted(zip(candidates, scores), key=lambda pair: pair[1], reverse=True)
+        ranked.extend((document, float("-inf")) for document in documents[len(candidates):])
+
+        self.stats["queries"] += 1
+        self.stats["candidates_cut"] += min(len(documents), self.max_candidates) - len(candidates)
+        return ranked[:top_k] if top_k is not None else ranked
+
+    def score(self, query: str, documents: List[Document]) -> List[float]:
+        """
+        Score (query, chunk) pairs, using cached scores where available.
+
+        Args:
+            query (str): The query text.
+            documents (List[Document]): The chunks to score.
+
+        Returns:
+            List[float]: One relevance score per document.
+        """
+        keys = [self.cache_key(query, document) for document in documents]
+        scores = [self.cache.get(key) for key in keys]
+        missing = [index for index, score in enumerate(scores) if score is None]
+        self.stats["cache_hits"] += len(documents) - len(missing)
+        if not missing:
+            return scores
+
+        pairs = [(query, documents[index].page_content) for index in missing]
+        start_time = time.perf_counter()
+        try:
+            predictions = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        except Exception as e:
+            raise RuntimeError(f"Failed to score documents with cross-encoder: {e}")
+        self._record_latency((time.perf_counter() - start_time) / len(pairs))
+
+        for index, prediction in zip(missing, predictions):
+            scores[index] = float(prediction)
+            self.cache.put(keys[index], scores[index])
+        self.stats["pairs_scored"] += len(pairs)
+        return scores
+
+    def _candidate_count(self, query: str, documents: List[Document]) -> int:
+        """
+        Pick how many candidates to score so the uncached ones fit the latency budget.
+
+        Args:
+            query (str): The query text.
+            documents (List[Document]): The candidates, best first.
+
+        Returns:
+            int: The number of leading candidates to score.
+        """
+        limit = min(len(documents), self.max_candidates)
+        if self.latency_budget_ms is None or self.seconds_per_pair is None:
+            return limit
+
+        affordable_pairs = int(self.latency_budget_ms / 1000.0 / self.seconds_per_pair)
+        count, uncached = 0, 0
+        for document in documents[:limit]:
+            if self.cache_key(query, document) not in self.cache:
+                uncached += 1
+                if uncached > affordable_pairs and count >= self.min_candidates:
+                    break
+            count += 1
+        return count
+
+    def _record_latency(self, seconds_per_pair: float):
+        """
+        Fold a new per-pair timing into the moving average.
+
+        Args:
+            seconds_per_pair (float): The measured scoring time per pair.
+        """
+        if self.seconds_per_pair is None:
+            self.seconds_per_pair = seconds_per_pair
+        else:
+            self.seconds_per_pair += self.smoothing * (seconds_per_pair - self.seconds_per_pair)
+
+if __name__ == "__main__":
+    # Example usage
+    documents = [
+        Document(id="1", page_content="FAISS is a library for efficient similarity search."),
+        Document(id="2", page_content="The pump filter must be replaced every six months."),
+        Document(id="3", page_content="Cross-encoders score a query and a passage jointly.")
+    ]
+
+    reranker = CrossEncoderReranker(latency_budget_ms=50)
+    for document, score in reranker.rerank("How often should I change the filter?", documents):
+        print(f"{score:.3f}: {document.page_content}")
+    print("Reranker stats:", reranker.stats)
@@ -1,4 +1,210 @@
-from langchain_community.vectorstores import FAISS
+import json
+from typing import Any, Dict, List, Optional
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+from pydantic import ConfigDict, Field
+from ..utils.cache import LRUCache
+from .lexical_index import InvertedIndex
+from .reranker import CrossEncoderReranker
+from .vector_store import VectorStoreManager
+
+class HybridRetriever(BaseRetriever):
+    """
+    A retriever that fuses BM25 and dense similarity results with reciprocal rank fusion.
+
+    Exact identifiers such as part numbers are matched by the lexical index even
+    when the embedding model blurs them, while paraphrased questions are still
+    answered by the vector store. Each result list contributes 1 / (rrf_k + rank)
+    per document, so the two scoring scales never need calibrating.
+    """
+
+    vectorstore: VectorStore
+    lexical_index: InvertedIndex
+    k: int = 4
+    fetch_k: int = 20
+    rrf_k: int = 60
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """
+        Retrieve the top-k documents for a query from both indexes.
+
+        Args:
+            query (str): The query text.
+            run_manager (CallbackManagerForRetrieverRun): The callback manager of the run.
+
+        Returns:
+            List[Document]: The fused results, best first.
+        """
+        dense_docs = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        lexical_ids = [doc_id for doc_id, _ in self.lexical_index.search(query, k=self.fetch_k)]
+
+        documents: Dict[str, Document] = {}
+        scores: Dict[str, float] = {}
+        for rank, doc in enumerate(dense_docs):
+            key = doc.id or doc.page_content
+            documents.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+
+        missing_ids = [doc_id for doc_id in lexical_ids if doc_id not in documents]
+        if missing_ids:
+            for doc in self.vectorstore.get_by_ids(missing_ids):
+                documents[doc.id] = doc
+        for rank, doc_id in enumerate(lexical_ids):
+            if doc_id in documents:
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:self.k]
+        return [documents[key] for key in ranked]
+
+class CachedRetriever(BaseRetriever):
+    """
+    A dense retriever that caches query results and searches many queries at once.
+
+    The cache maps (query, k) to the top-k docstore IDs together with the
+    index version they were computed against, so entries go stale as soon as
+    documents are added or removed. ``batch_retrieve`` embeds all uncached
+    queries in one forward pass and answers them with a single FAISS search.
+    A metadata filter (the ``filter`` field, or per call) is applied inside
+    that search, e.g. ``retriever.invoke(query, filter={"source": path})``.
+    """
+
+    vectorstore: VectorStore
+    k: int = 4
+    filter: Optional[Dict[str, Any]] = None
+    cache: LRUCache = Field(default_factory=lambda: LRUCache(maxsize=1024, ttl=300))
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Retrieve the top-k documents for a query, from the cache if possible.
+
+        Args:
+            query (str): The query text.
+            run_manager (CallbackManagerForRetrieverRun): The callback manager of the run.
+            filter (Dict[str, Any], optional): Metadata filter overriding the retriever's own. Defaults to None.
+
+        Returns:
+            List[Document]: The documents, best first.
+        """
+        return self.batch_retrieve([query], filter=filter)[0]
+
+    def batch_retrieve(self, queries: List[str], filter: Optional[Dict[str, Any]] = None) -> List[List[Document]]:
+        """
+        Retrieve the top-k documents for several queries.
+
+        Args:
+            queries (List[str]): The query texts.
+            filter (Dict[str, Any], optional): Metadata filter, see ``MetadataIndex.select``.
+                Defaults to the retriever's ``filter``.
+
+        Returns:
+            List[List[Document]]: The documents of each query, best first.
+        """
+        filter = filter if filter is not None else self.filter
+        filter_key = json.dumps(filter, sort_keys=True, default=str) if filter else None
+        version = VectorStoreManager.index_version(self.vectorstore)
+        results: Dict[str, List[Document]] = {}
+        misses = []
+        for query in dict.fromkeys(queries):
+            documents = self._lookup((query, self.k, filter_key), version)
+            if documents is None:
+                misses.append(query)
+            else:
+                results[query] = documents
+
+        if misses:
+            try:
+                hits = VectorStoreManager.search_by_vectors(
+                    self.vectorstore, self._embed_queries(misses), k=self.k, filter=filter
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to retrieve documents: {e}")
+            for query, query_hits in zip(misses, hits):
+                documents = [document for document, _ in query_hits]
+                results[query] = documents
+                if version is not None:
+                    self.cache.put((query, self.k, filter_key), (version, [document.id for document in documents]))
+
+        return [list(results[query]) for query in queries]
+
+    def _lookup(self, key: tuple, version) -> Optional[List[Document]]:
+        """
+        Return the cached documents of a query if they match the current index version.
+
+        Args:
+            key (tuple): The (query, k, filter) cache key.
+            version: The current index version, or None if results must not be cached.
+
+        Returns:
+            Optional[List[Document]]: The documents, or None on a cache miss.
+        """
+        if version is None:
+            return None
+        entry = self.cache.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        documents = self.vectorstore.get_by_ids(entry[1])
+        return documents if len(documents) == len(entry[1]) else None
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed queries in a single batch with the store's embeddings model.
+
+        Args:
+            queries (List[str]): The query texts.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per query.
+        """
+        embedding = self.vectorstore.embeddings
+        if hasattr(embedding, "generate_embeddings"):
+            return embedding.generate_embeddings(queries)
+        return np.asarray(embedding.embed_documents(queries), dtype=np.float32)
+
+class RerankingRetriever(BaseRetriever):
+    """
+    A retriever that reranks the candidates of another retriever with a cross-encoder.
+
+    The base retriever should return more candidates than are finally needed
+    (for example k=20); the reranker scores them and only the best k are
+    returned, so prompts carry fewer and more relevant chunks.
+    """
+
+    base_retriever: BaseRetriever
+    reranker: CrossEncoderReranker
+    k: int = 4
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """
+        Retrieve candidates with the base retriever and return the best k after reranking.
+
+        Args:
+            query (str): The query text.
+            run_manager (CallbackManagerForRetrieverRun): The callback manager of the run.
+
+        Returns:
+            List[Document]: The reranked documents, best first.
+        """
+        candidates = self.base_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        return [document for document, _ in self.reranker.rerank(query, candidates, top_k=self.k)]
 
 class RetrieverManager:
     """
@@ -6,12 +212,12 @@ class RetrieverManager:
     """
 
     @staticmethod
-    def get_retriever(vectorstore: FAISS):
+    def get_retriever(vectorstore: VectorStore):
         """
         Create a retriever from a vector store.
 
         Args:
-            vectorstore (FAISS): The FAISS vector store instance.
+            vectorstore (VectorStore): The vector store instance, e.g. a FAISS or sharded store.
 
         Returns:
             A retriever instance from the vector store.
@@ -21,6 +227,83 @@ class RetrieverManager:
         except Exception as e:
             raise RuntimeError(f"Failed to create retriever: {e}")
 
+    @staticmethod
+    def get_cached_retriever(
+        vectorstore: VectorStore,
+        k: int = 4,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 300,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> CachedRetriever:
+        """
+        Create a dense retriever with a query result cache and batched multi-query search.
+
+        Args:
+            vectorstore (VectorStore): The vector store instance.
+            k (int): Number of documents to return per query. Defaults to 4.
+            maxsize (int): Maximum number of cached queries. Defaults to 1024.
+            ttl (float, optional): Seconds after which a cached result expires. Defaults to 300.
+            filter (Dict[str, Any], optional): Metadata filter applied to every search, e.g.
+                {"source": "manual.pdf"} or {"date": {"$gte": "2024-01-01"}}. Defaults to None.
+
+        Returns:
+            CachedRetriever: The cached retriever.
+        """
+        try:
+            return CachedRetriever(
+                vectorstore=vectorstore, k=k, cache=LRUCache(maxsize=maxsize, ttl=ttl), filter=filter
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create cached retriever: {e}")
+
+    @staticmethod
+    def get_reranking_retriever(
+        base_retriever: BaseRetriever, reranker: Optional[CrossEncoderReranker] = None, k: int = 4
+    ) -> RerankingRetriever:
+        """
+        Add a cross-encoder reranking stage on top of a retriever.
+
+        Args:
+            base_retriever (BaseRetriever): The retriever producing candidates, e.g. from
+                ``get_hybrid_retriever`` with k=20.
+            reranker (CrossEncoderReranker, optional): The reranker. Defaults to a
+                ``CrossEncoderReranker`` with default settings.
+            k (int): Number of documents to return after reranking. Defaults to 4.
+
+        Returns:
+            RerankingRetriever: The reranking retriever.
+        """
+        try:
+            return RerankingRetriever(
+                base_retriever=base_retriever, reranker=reranker or CrossEncoderReranker(), k=k
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create reranking retriever: {e}")
+
+    @staticmethod
+    def get_hybrid_retriever(
+        vectorstore: VectorStore, lexical_index: InvertedIndex, k: int = 4, fetch_k: int = 20, rrf_k: int = 60
+    ) -> HybridRetriever:
+        """
+        Create a retriever that combines BM25 and dense search.
+
+        Args:
+            vectorstore (VectorStore): The vector store instance.
+            lexical_index (InvertedIndex): A BM25 index over the same document IDs as the store.
+            k (int): Number of documents to return. Defaults to 4.
+            fetch_k (int): Number of candidates taken from each index before fusion. Defaults to 20.
+            rrf_k (int): Reciprocal rank fusion constant. Defaults to 60.
+
+        Returns:
+            HybridRetriever: The hybrid retriever.
+        """
+        try:
+            return HybridRetriever(
+                vectorstore=vectorstore, lexical_index=lexical_index, k=k, fetch_k=fetch_k, rrf_k=rrf_k
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create hybrid retriever: {e}")
+
 if __name__ == "__main__":
     # Example usage
     from sentence_transformers import SentenceTransformer
@@ -42,4 +325,11 @@ if __name__ == "__main__":
 
     # Create retriever
     retriever = RetrieverManager.get_retriever(vector_store)
-    print("Retriever created successfully.")
\ No newline at end of file
+    print("Retriever created successfully.")
+
+    # Create a hybrid retriever over the same documents
+    lexical_index = InvertedIndex()
+    lexical_index.add_many(vector_store.index_to_docstore_id.values(), [doc.page_content for doc in documents])
+    lexical_index.commit()
+    hybrid_retriever = RetrieverManager.get_hybrid_retriever(vector_store, lexical_index, k=2)
+    print("Hybrid results:", hybrid_retriever.invoke("FAISS vector search"))
\ No newline at end of file
@@ -0,0 +1,464 @@
+import hashlib
+import heapq
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain.schema import Document
+from .vector_store import DEFAULT_INDEX_DIRECTORY, VectorStoreManager
+
+class ShardedVectorStore(VectorStore):
+    """
+    A vector store that partitions chunks across several FAISS sub-indexes.
+
+    Chunks are assigned to a shard by hashing their source document (or their
+    text if they have no source), so all chunks of a file live in one shard.
+    Queries are sent to every shard concurrently on a thread pool (FAISS
+    releases the GIL while searching) and the per-shard top-k lists are merged
+    with a heap. It is a LangChain ``VectorStore``, so ``as_retriever()`` and
+    ``RetrieverManager.get_retriever`` work unchanged.
+
+    IVF shards are trained on the vectors they receive first, so chunks routed
+    to an empty IVF shard are buffered until it has 'train_size' (default
+    100000) of them, as ``IngestionPipeline`` does for a single index. ``flush``
+    builds the remaining shards from whatever they have buffered; searches,
+    lookups, deletes and ``save`` flush first so buffered chunks are never
+    missing from results. Call ``close`` (or use the store as a context
+    manager) to stop the search threads.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        num_shards: int = 4,
+        normalized: bool = False,
+        index_type: str = "flat",
+        index_params: Optional[Dict[str, Any]] = None,
+        shards: Optional[List[Optional[FAISS]]] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize the ShardedVectorStore class.
+
+        Args:
+            embedding (Embeddings): The embeddings model used for queries.
+            num_shards (int): Number of shards. Defaults to 4.
+            normalized (bool): Whether stored vectors are L2-normalised (inner-product search). Defaults to False.
+            index_type (str): Index type of each shard, see ``ANNIndexBuilder``. Defaults to 'flat'.
+            index_params (Dict[str, Any], optional): Index parameters of each shard. Defaults to None.
+            shards (List[Optional[FAISS]], optional): Existing shards; empty shards are None. Defaults to None.
+            max_workers (int, optional): Threads used for fan-out search. Defaults to the number of shards.
+        """
+        if shards is not None:
+            num_shards = len(shards)
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+
+        self.embedding = embedding
+        self.num_shards = num_shards
+        self.normalized = normalized
+        self.index_type = index_type
+        self.index_params = dict(index_params or {})
+        self.shards: List[Optional[FAISS]] = list(shards) if shards is not None else [None] * num_shards
+        self.max_workers = max_workers or num_shards
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Buffered (texts, vectors, metadatas, ids) batches of shards not created yet
+        self._pending: Dict[int, List[Tuple[List[str], np.ndarray, List[Dict[str, Any]], List[str]]]] = {}
+
+    def __enter__(self) -> "ShardedVectorStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.embedding
+
+    def shard_for(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Pick the shard of a chunk from a hash of its source document.
+
+        Args:
+            text (str): The chunk text, hashed if the chunk has no source.
+            metadata (Dict[str, Any], optional): The chunk metadata. Defaults to None.
+
+        Returns:
+            int: The shard index.
+        """
+        key = (metadata or {}).get("source") or text
+        digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.num_shards
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Add texts with precomputed vectors, routing each to its shard.
+
+        Empty shards are created on first use. Chunks for an empty IVF shard are
+        buffered until the shard has 'train_size' vectors to train on, see ``flush``.
+
+        Args:
+            texts (Sequence[str]): The chunk texts to add.
+            vectors (np.ndarray): A float32 matrix with one embedding row per text.
+            metadatas (List[Dict[str, Any]], optional): One metadata dict per text. Defaults to None.
+            ids (List[str], optional): One docstore ID per text. Defaults to random IDs.
+
+        Returns:
+            List[str]: The docstore IDs of the added texts.
+        """
+        vectors = VectorStoreManager.as_matrix(vectors)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [uuid.uuid4().hex for _ in texts]
+
+        rows_by_shard: Dict[int, List[int]] = {}
+        for row, (text, metadata) in enumerate(zip(texts, metadatas)):
+            rows_by_shard.setdefault(self.shard_for(text, metadata), []).append(row)
+
+        needs_training = self.index_type in ("ivf_flat", "ivf_pq")
+        train_size = self.index_params.get("train_size", 100_000) if needs_training else 0
+        for shard_index, rows in rows_by_shard.items():
+            shard_texts = [texts[row] for row in rows]
+            shard_metadatas = [metadatas[row] for row in rows]
+            shard_ids = [ids[row] for row in rows]
+            shard_vectors = vectors[rows]
+            if self.shards[shard_index] is None:
+                pending = self._pending.setdefault(shard_index, [])
+                pending.append((shard_texts, shard_vectors, shard_metadatas, shard_ids))
+                if sum(len(item[0]) for item in pending) >= train_size:
+                    self._create_shard(shard_index)
+            else:
+                VectorStoreManager.add_embeddings(
+                    self.shards[shard_index], shard_texts, shard_vectors, metadatas=shard_metadatas, ids=shard_ids
+                )
+        return ids
+
+    def flush(self):
+        """
+        Create every shard that still has buffered chunks, training it on all of them.
+
+        An 'ivf_pq' shard with fewer vectors than PQ codes (2 ** 'pq_nbits') cannot
+        be trained and is built as 'ivf_flat' instead.
+        """
+        for shard_index in list(self._pending):
+            self._create_shard(shard_index)
+
+    def add_texts(
+        self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, *, ids: Optional[List[str]] = None, **kwargs: Any
+    ) -> List[str]:
+        """
+        Embed and add texts (LangChain ``VectorStore`` interface).
+
+        Args:
+            texts (Iterable[str]): The texts to add.
+            metadatas (List[dict], optional): One metadata dict per text. Defaults to None.
+            ids (List[str], optional): One docstore ID per text. Defaults to random IDs.
+
+        Returns:
+            List[str]: The docstore IDs of the added texts.
+        """
+        texts = list(texts)
+        return self.add_embeddings(texts, self._embed_texts(texts), metadatas=metadatas, ids=ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        Remove documents from whichever shards hold them.
+
+        Args:
+            ids (List[str], optional): Docstore IDs of the documents to remove. Defaults to None.
+
+        Returns:
+            Optional[bool]: True once the removal is done.
+        """
+        if not ids:
+            return False
+        self.flush()
+        for shard in self.shards:
+            if shard is not None:
+                VectorStoreManager.delete(shard, ids)
+        return True
+
+    def index_version(self) -> Tuple:
+        """
+        Return a token that changes whenever any shard changes, see ``VectorStoreManager.index_version``.
+
+        Returns:
+            Tuple: The version tokens of all shards.
+        """
+        self.flush()
+        return tuple(None if shard is None else VectorStoreManager.index_version(shard) for shard in self.shards)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """
+        Look up documents by docstore ID across all shards.
+
+        Args:
+            ids (Sequence[str]): The docstore IDs.
+
+        Returns:
+            List[Document]: The documents found, in the order of ``ids``.
+        """
+        self.flush()
+        found = {}
+        for shard in self.shards:
+            if shard is None:
+                continue
+            for document in shard.get_by_ids([doc_id for doc_id in ids if doc_id not in found]):
+                found[document.id] = document
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+
+    def search_by_vectors(
+        self, query_vectors: np.ndarray, k: int = 4, filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Search every shard concurrently with a matrix of query vectors and merge the results.
+
+        Args:
+            query_vectors (np.ndarray): A float32 matrix with one query embedding per row.
+            k (int): Number of results per query. Defaults to 4.
+            filter (Dict[str, Any], optional): Metadata filter applied inside each shard's
+                search, see ``VectorStoreManager.search_by_vectors``. Defaults to None.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: For each query, the best (document, score) pairs
+            across all shards, best first.
+        """
+        query_vectors = VectorStoreManager.as_matrix(query_vectors)
+        self.flush()
+        shards = [shard for shard in self.shards if shard is not None]
+        if not shards:
+            return [[] for _ in range(len(query_vectors))]
+
+        if len(shards) == 1:
+            per_shard = [VectorStoreManager.search_by_vectors(shards[0], query_vectors, k, filter=filter)]
+        else:
+            per_shard = list(self._get_pool().map(
+                lambda shard: VectorStoreManager.search_by_vectors(shard, query_vectors, k, filter=filter), shards
+            ))
+
+        select = heapq.nlargest if self.normalized else heapq.nsmallest
+        return [
+            select(k, (hit for shard_results in per_shard for hit in shard_results[row]), key=lambda hit: hit[1])
+            for row in range(len(query_vectors))
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Return the documents closest to an embedding, with their scores.
+
+        Args:
+            embedding (List[float]): The query embedding.
+            k (int): Number of documents to return. Defaults to 4.
+            **kwargs: 'filter' restricts the search to documents with matching metadata.
+
+        Returns:
+            List[Tuple[Document, float]]: (document, score) pairs, best first.
+        """
+        return self.search_by_vectors(np.asarray([embedding], dtype=np.float32), k, filter=kwargs.get("filter"))[0]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """
+        Return the documents closest to a query, with their scores.
+
+        Args:
+            query (str): The query text.
+            k (int): Number of documents to return. Defaults to 4.
+            **kwargs: 'filter' restricts the search to documents with matching metadata.
+
+        Returns:
+            List[Tuple[Document, float]]: (document, score) pairs, best first.
+        """
+        return self.search_by_vectors(self._embed_texts([query]), k, filter=kwargs.get("filter"))[0]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        """
+        Return the documents closest to a query (LangChain ``VectorStore`` interface).
+
+        Args:
+            query (str): The query text.
+            k (int): Number of documents to return. Defaults to 4.
+
+        Returns:
+            List[Document]: The documents, best first.
+        """
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        """
+        Return the documents closest to an embedding.
+
+        Args:
+            embedding (List[float]): The query embedding.
+            k (int): Number of documents to return. Defaults to 4.
+
+        Returns:
+            List[Document]: The documents, best first.
+        """
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        if self.normalized:
+            return self._max_inner_product_relevance_score_fn
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> "ShardedVectorStore":
+        """
+        Create a sharded store from texts (LangChain ``VectorStore`` interface).
+
+        Args:
+            texts (List[str]): The texts to add.
+            embedding (Embeddings): The embeddings model.
+            metadatas (List[dict], optional): One metadata dict per text. Defaults to None.
+            ids (List[str], optional): One docstore ID per text. Defaults to random IDs.
+            **kwargs (Any): Arguments for ``ShardedVectorStore.__init__``.
+
+        Returns:
+            ShardedVectorStore: The new store.
+        """
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    def save(self, directory: str = DEFAULT_INDEX_DIRECTORY, index_name: str = "index"):
+        """
+        Save every shard to its own sub-directory, plus a JSON layout file.
+
+        Args:
+            directory (str): Target directory. Defaults to the project's embeddings directory.
+            index_name (str): Base name of the saved files. Defaults to 'index'.
+        """
+        try:
+            self.flush()
+            os.makedirs(directory, exist_ok=True)
+            for shard_index, shard in enumerate(self.shards):
+                if shard is not None:
+                    VectorStoreManager.save(shard, os.path.join(directory, f"shard_{shard_index}"), index_name)
+
+            layout = {
+                "num_shards": self.num_shards,
+                "present": [shard is not None for shard in self.shards],
+                "normalized": self.normalized,
+                "index_type": self.index_type,
+                "index_params": self.index_params
+            }
+            with open(os.path.join(directory, f"{index_name}.shards.json"), "w", encoding="utf-8") as file:
+                json.dump(layout, file, indent=2)
+        except Exception as e:
+            raise RuntimeError(f"Failed to save sharded vector store: {e}")
+
+    @classmethod
+    def load(
+        cls, embedding: Embeddings, directory: str = DEFAULT_INDEX_DIRECTORY, index_name: str = "index", mmap: bool = True
+    ) -> "ShardedVectorStore":
+        """
+        Load a sharded store written by ``save``, memory-mapping each shard's index by default.
+
+        Args:
+            embedding (Embeddings): The embeddings model used for queries.
+            directory (str): Directory the store was saved to. Defaults to the project's embeddings directory.
+            index_name (str): Base name of the saved files. Defaults to 'index'.
+            mmap (bool): Memory-map the shard indexes instead of reading them into RAM. Defaults to True.
+
+        Returns:
+            ShardedVectorStore: The loaded store.
+        """
+        try:
+            with open(os.path.join(directory, f"{index_name}.shards.json"), "r", encoding="utf-8") as file:
+                layout = json.load(file)
+
+            shards = [
+                VectorStoreManager.load(embedding, os.path.join(directory, f"shard_{shard_index}"), index_name, mmap)
+                if present else None
+                for shard_index, present in enumerate(layout["present"])
+            ]
+            return cls(
+                embedding,
+                normalized=layout["normalized"],
+                index_type=layout["index_type"],
+                index_params=layout["index_params"],
+                shards=shards
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to load sharded vector store from {directory}: {e}")
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as a float32 matrix, avoiding list conversion when the model supports it.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: One embedding row per text.
+        """
+        if hasattr(self.embedding, "generate_embeddings"):
+            return self.embedding.generate_embeddings(texts)
+        return np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+
+    def close(self):
+        """
+        Shut down the search thread pool. A later search starts a new one.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _create_shard(self, shard_index: int):
+        """
+        Create a shard from its buffered chunks.
+
+        Args:
+            shard_index (int): The shard index.
+        """
+        pending = self._pending.pop(shard_index)
+        texts = [text for batch_texts, _, _, _ in pending for text in batch_texts]
+        vectors = np.concatenate([batch_vectors for _, batch_vectors, _, _ in pending])
+        metadatas = [metadata for _, _, batch_metadatas, _ in pending for metadata in batch_metadatas]
+        ids = [doc_id for _, _, _, batch_ids in pending for doc_id in batch_ids]
+
+        self.shards[shard_index] = VectorStoreManager.create_vectorstore_from_embeddings(
+            texts, vectors, self.embedding, metadatas=metadatas, ids=ids,
+            normalized=self.normalized, index_type=self.index_type, index_params=self.index_params
+        )
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="shard-search")
+        return self._pool
+
+if __name__ == "__main__":
+    # Example usage
+    from .embeddings import EmbeddingGenerator
+    from .retriever import RetrieverManager
+
+    generator = EmbeddingGenerator(normalize=True)
+    store = ShardedVectorStore(generator, num_shards=2, normalized=True)
+    store.add_texts(
+        ["This is the first document.", "This is the second document.", "FAISS is great for vector search."],
+        metadatas=[{"source": "a.pdf"}, {"source": "b.pdf"}, {"source": "c.pdf"}]
+    )
+
+    retriever = RetrieverManager.get_retriever(store)
+    print("Results:", retriever.invoke("vector search"))
+    store.close()
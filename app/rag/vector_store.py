@@ -1,12 +1,36 @@
+import os
+import pickle
+import uuid
+import weakref
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain.schema import Document
-from typing import List
+from langchain_core.vectorstores import VectorStore
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from .ann_index import ANNIndexBuilder
+from .metadata_index import MetadataIndex
+
+# Project-level ``embeddings/`` directory used to persist the index between runs
+DEFAULT_INDEX_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "embeddings"
+)
 
 class VectorStoreManager:
     """
     A class to manage the creation and usage of a FAISS-based vector store.
+
+    Operations on stores other than a single FAISS store (such as
+    ``ShardedVectorStore``) are delegated to the store's method of the same name.
     """
 
+    # Mutation counters of FAISS stores changed through this class, see ``index_version``
+    _versions: "weakref.WeakKeyDictionary[FAISS, int]" = weakref.WeakKeyDictionary()
+    # Metadata indexes of FAISS stores with the store version they were built at, see ``metadata_index``
+    _metadata_indexes: "weakref.WeakKeyDictionary[FAISS, Tuple[Hashable, MetadataIndex]]" = weakref.WeakKeyDictionary()
+
     @staticmethod
     def create_vectorstore(docs: List[Document], embeddings) -> FAISS:
         """
@@ -24,6 +48,448 @@ class VectorStoreManager:
         except Exception as e:
             raise RuntimeError(f"Failed to create vector store: {e}")
 
+    @staticmethod
+    def create_vectorstore_from_embeddings(
+        texts: Sequence[str],
+        vectors: np.ndarray,
+        embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        normalized: bool = False,
+        index_type: str = "flat",
+        index_params: Optional[Dict[str, Any]] = None
+    ) -> FAISS:
+        """
+        Create a FAISS vector store from texts whose vectors were already computed.
+
+        Unlike ``create_vectorstore`` this does not re-embed the texts, and the
+        vector matrix is handed to the FAISS index as-is. Indexes that need
+        training (IVF) are trained on a sample of ``vectors``, so the first batch
+        should be representative of the corpus. A sample too small for 'ivf_pq'
+        builds an 'ivf_flat' index instead (see ``ANNIndexBuilder.fit_to_training_set``).
+
+        Args:
+            texts (Sequence[str]): The chunk texts to store.
+            vectors (np.ndarray): A float32 matrix with one precomputed embedding row per text.
+            embeddings: The embeddings model used for queries against the store.
+            metadatas (List[Dict[str, Any]], optional): One metadata dict per text. Defaults to None.
+            ids (List[str], optional): One docstore ID per text. Defaults to random IDs.
+            normalized (bool): Whether the vectors are L2-normalised. If so, an inner-product
+                index is used, so scores are cosine similarities. Defaults to False.
+            index_type (str): One of 'flat', 'ivf_flat', 'ivf_pq' or 'hnsw'. Defaults to 'flat'.
+            index_params (Dict[str, Any], optional): ``ANNIndexBuilder.build`` arguments, plus
+                'nprobe', 'ef_search' and 'train_size' (maximum training sample). Defaults to None.
+
+        Returns:
+            FAISS: A FAISS vector store instance.
+        """
+        try:
+            vectors = VectorStoreManager.as_matrix(vectors)
+            build_params = dict(index_params or {})
+            nprobe = build_params.pop("nprobe", None)
+            ef_search = build_params.pop("ef_search", None)
+            train_size = build_params.pop("train_size", 100_000)
+            build_params.setdefault("num_vectors", len(vectors))
+            index_type, build_params = ANNIndexBuilder.fit_to_training_set(
+                index_type, min(len(vectors), train_size), build_params
+            )
+
+            index = ANNIndexBuilder.build(
+                vectors.shape[1], index_type, metric="ip" if normalized else "l2", **build_params
+            )
+            ANNIndexBuilder.train(index, vectors, sample_size=train_size)
+            ANNIndexBuilder.set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+            if normalized:
+                distance_strategy = DistanceStrategy.MAX_INNER_PRODUCT
+            else:
+                distance_strategy = DistanceStrategy.EUCLIDEAN_DISTANCE
+
+            vectorstore = FAISS(embeddings, index, InMemoryDocstore(), {}, distance_strategy=distance_strategy)
+        except Exception as e:
+            raise RuntimeError(f"Failed to create vector store: {e}")
+
+        VectorStoreManager.add_embeddings(vectorstore, texts, vectors, metadatas=metadatas, ids=ids)
+        return vectorstore
+
+    @staticmethod
+    def add_embeddings(
+        vectorstore: FAISS,
+        texts: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Append texts with precomputed vectors to an existing FAISS vector store.
+
+        The vector matrix is added to the FAISS index directly, without the
+        per-vector Python list conversion of ``FAISS.add_embeddings``. Indexes
+        that accept explicit IDs get stable, never-renumbered labels.
+
+        Args:
+            vectorstore (FAISS): The vector store to extend.
+            texts (Sequence[str]): The chunk texts to add.
+            vectors (np.ndarray): A float32 matrix with one precomputed embedding row per text.
+            metadatas (List[Dict[str, Any]], optional): One metadata dict per text. Defaults to None.
+            ids (List[str], optional): One docstore ID per text. Defaults to random IDs.
+
+        Returns:
+            List[str]: The docstore IDs of the added texts.
+        """
+        if not isinstance(vectorstore, FAISS):
+            return vectorstore.add_embeddings(texts, vectors, metadatas=metadatas, ids=ids)
+
+        try:
+            vectors = VectorStoreManager.as_matrix(vectors)
+            if len(texts) != vectors.shape[0]:
+                raise ValueError(f"Got {len(texts)} texts but {vectors.shape[0]} vectors.")
+
+            ids = ids or [uuid.uuid4().hex for _ in texts]
+            metadatas = metadatas or [{} for _ in texts]
+            vectorstore.docstore.add({
+                doc_id: Document(id=doc_id, page_content=text, metadata=metadata)
+                for doc_id, text, metadata in zip(ids, texts, metadatas)
+            })
+
+            metadata_index = VectorStoreManager._current_metadata_index(vectorstore)
+            index = vectorstore.index
+            if VectorStoreManager._has_stable_ids(index):
+                # Labels only grow, so the most recently inserted label is the largest
+                start = next(reversed(vectorstore.index_to_docstore_id), -1) + 1
+                index.add_with_ids(vectors, np.arange(start, start + len(ids), dtype=np.int64))
+            else:
+                start = index.ntotal
+                index.add(vectors)
+            vectorstore.index_to_docstore_id.update({start + offset: doc_id for offset, doc_id in enumerate(ids)})
+            VectorStoreManager._bump_version(vectorstore)
+            if metadata_index is not None:
+                metadata_index.add(range(start, start + len(ids)), metadatas)
+                VectorStoreManager._metadata_indexes[vectorstore] = (
+                    VectorStoreManager.index_version(vectorstore), metadata_index
+                )
+            return ids
+        except Exception as e:
+            raise RuntimeError(f"Failed to add embeddings to vector store: {e}")
+
+    @staticmethod
+    def search_by_vectors(
+        vectorstore: FAISS, query_vectors: np.ndarray, k: int = 4, filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Search the index with a matrix of query vectors in a single FAISS call.
+
+        A metadata filter is resolved into the matching FAISS labels and applied
+        inside the search through an ID selector, so results never need to be
+        over-fetched and post-filtered. Flat indexes return exactly k matching
+        results (fewer only if fewer documents match); approximate indexes return
+        at most k, as IVF only scans 'nprobe' clusters and HNSW only explores its
+        'ef_search' candidate list, which may hold fewer matches under a
+        selective filter.
+
+        Args:
+            vectorstore (FAISS): The vector store to search.
+            query_vectors (np.ndarray): A float32 matrix with one query embedding per row.
+            k (int): Number of results per query. Defaults to 4.
+            filter (Dict[str, Any], optional): Metadata filter, see ``MetadataIndex.select``,
+                e.g. {"source": "manual.pdf", "page": [1, 2]}. Defaults to None.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: For each query, (document, score) pairs ordered
+            best first. Scores are raw FAISS distances or inner products.
+        """
+        if not isinstance(vectorstore, FAISS):
+            return vectorstore.search_by_vectors(query_vectors, k, filter=filter)
+
+        try:
+            query_vectors = VectorStoreManager.as_matrix(query_vectors)
+            if filter:
+                selected = VectorStoreManager.metadata_index(vectorstore).select(filter)
+                if not len(selected):
+                    return [[] for _ in range(len(query_vectors))]
+                params = ANNIndexBuilder.search_parameters(vectorstore.index, MetadataIndex.to_selector(selected))
+                scores, labels = vectorstore.index.search(query_vectors, k, params=params)
+            else:
+                scores, labels = vectorstore.index.search(query_vectors, k)
+        except Exception as e:
+            raise RuntimeError(f"Failed to search vector store: {e}")
+
+        results = []
+        for row_scores, row_labels in zip(scores, labels):
+            hits = []
+            for score, label in zip(row_scores, row_labels):
+                if label == -1:
+                    continue
+                document = vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(label)])
+                hits.append((document, float(score)))
+            results.append(hits)
+        return results
+
+    @staticmethod
+    def index_version(vectorstore: VectorStore) -> Optional[Hashable]:
+        """
+        Return a token that changes whenever the contents of a vector store change.
+
+        Query caches compare it with the token stored alongside a cached result
+        to detect stale entries. For FAISS stores it combines the number of
+        changes made through this class with the vector count, so vectors added
+        directly through LangChain are noticed as well.
+
+        Args:
+            vectorstore (VectorStore): The vector store.
+
+        Returns:
+            Optional[Hashable]: The version token, or None if the store cannot report one.
+        """
+        if not isinstance(vectorstore, FAISS):
+            version = getattr(vectorstore, "index_version", None)
+            return version() if callable(version) else None
+        return VectorStoreManager._versions.get(vectorstore, 0), vectorstore.index.ntotal
+
+    @staticmethod
+    def metadata_index(vectorstore: FAISS) -> MetadataIndex:
+        """
+        Return the metadata index of a FAISS store, building it on first use.
+
+        The index is kept up to date by ``add_embeddings`` and ``delete`` and is
+        rebuilt from the docstore if the store was changed by other means.
+
+        Args:
+            vectorstore (FAISS): The vector store.
+
+        Returns:
+            MetadataIndex: The per-field index from metadata values to FAISS labels.
+        """
+        metadata_index = VectorStoreManager._current_metadata_index(vectorstore)
+        if metadata_index is None:
+            try:
+                metadata_index = MetadataIndex.from_vectorstore(vectorstore)
+            except Exception as e:
+                raise RuntimeError(f"Failed to build metadata index: {e}")
+            VectorStoreManager._metadata_indexes[vectorstore] = (
+                VectorStoreManager.index_version(vectorstore), metadata_index
+            )
+        return metadata_index
+
+    @staticmethod
+    def _current_metadata_index(vectorstore: FAISS) -> Optional[MetadataIndex]:
+        """
+        Return the cached metadata index of a store if it matches the store's current version.
+
+        Args:
+            vectorstore (FAISS): The vector store.
+
+        Returns:
+            Optional[MetadataIndex]: The metadata index, or None if there is none or it is stale.
+        """
+        entry = VectorStoreManager._metadata_indexes.get(vectorstore)
+        if entry is None or entry[0] != VectorStoreManager.index_version(vectorstore):
+            return None
+        return entry[1]
+
+    @staticmethod
+    def _bump_version(vectorstore: FAISS):
+        """
+        Record that a FAISS store has been modified.
+
+        Args:
+            vectorstore (FAISS): The modified vector store.
+        """
+        VectorStoreManager._versions[vectorstore] = VectorStoreManager._versions.get(vectorstore, 0) + 1
+
+    @staticmethod
+    def _has_stable_ids(index: faiss.Index) -> bool:
+        """
+        Check whether an index stores explicit IDs that survive removals.
+
+        Plain flat indexes (as created by LangChain) renumber vectors on removal instead.
+
+        Args:
+            index (faiss.Index): The index.
+
+        Returns:
+            bool: True for ID-mapped and IVF indexes.
+        """
+        return isinstance(index, (faiss.IndexIDMap, faiss.IndexIVF))
+
+    @staticmethod
+    def as_matrix(vectors) -> np.ndarray:
+        """
+        View vectors as a 2-D C-contiguous float32 matrix, copying only if required.
+
+        Args:
+            vectors: A matrix or a sequence of vectors.
+
+        Returns:
+            np.ndarray: The vectors as a float32 matrix.
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        return matrix
+
+    @staticmethod
+    def delete(vectorstore: FAISS, ids: List[str]):
+        """
+        Remove documents and their vectors from a FAISS vector store.
+
+        IDs that are not present in the store are ignored. HNSW graphs do not
+        support removal, so an HNSW index is rebuilt from its remaining vectors
+        (keeping their labels); batch deletions to pay for this once.
+
+        Args:
+            vectorstore (FAISS): The vector store to modify. Must not be memory-mapped.
+            ids (List[str]): Docstore IDs of the documents to remove.
+        """
+        if not isinstance(vectorstore, FAISS):
+            vectorstore.delete(ids)
+            return
+
+        ids = set(ids)
+        labels = [label for label, doc_id in vectorstore.index_to_docstore_id.items() if doc_id in ids]
+        if not labels:
+            return
+
+        try:
+            metadata_index = VectorStoreManager._current_metadata_index(vectorstore)
+            VectorStoreManager._bump_version(vectorstore)
+            if not VectorStoreManager._has_stable_ids(vectorstore.index):
+                # Remaining vectors are renumbered, so the metadata index is rebuilt on next use
+                vectorstore.delete([vectorstore.index_to_docstore_id[label] for label in labels])
+                return
+
+            if ANNIndexBuilder.index_type(vectorstore.index) == "hnsw":
+                vectorstore.index = VectorStoreManager._rebuild_hnsw(vectorstore.index, labels)
+            else:
+                vectorstore.index.remove_ids(np.array(labels, dtype=np.int64))
+            removed_ids = [vectorstore.index_to_docstore_id.pop(label) for label in labels]
+            vectorstore.docstore.delete(removed_ids)
+            if metadata_index is not None:
+                metadata_index.remove(labels)
+                VectorStoreManager._metadata_indexes[vectorstore] = (
+                    VectorStoreManager.index_version(vectorstore), metadata_index
+                )
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete from vector store: {e}")
+
+    @staticmethod
+    def _rebuild_hnsw(index: faiss.IndexIDMap, removed_labels: List[int]) -> faiss.IndexIDMap2:
+        """
+        Build a copy of an ID-mapped HNSW index without some of its vectors.
+
+        Args:
+            index (faiss.IndexIDMap): The ID-mapped HNSW index.
+            removed_labels (List[int]): The FAISS labels to leave out.
+
+        Returns:
+            faiss.IndexIDMap2: A new index with the same parameters and the remaining labels.
+        """
+        hnsw = faiss.downcast_index(index.index)
+        labels = faiss.vector_to_array(index.id_map).astype(np.int64)
+        keep = ~np.isin(labels, np.asarray(removed_labels, dtype=np.int64))
+        # Vectors are stored in insertion order, matching the ID map
+        vectors = hnsw.reconstruct_n(0, hnsw.ntotal)[keep]
+
+        rebuilt = faiss.IndexHNSWFlat(hnsw.d, hnsw.hnsw.nb_neighbors(1), hnsw.metric_type)
+        rebuilt.hnsw.efConstruction = hnsw.hnsw.efConstruction
+        rebuilt.hnsw.efSearch = hnsw.hnsw.efSearch
+        rebuilt = faiss.IndexIDMap2(rebuilt)
+        if len(vectors):
+            rebuilt.add_with_ids(np.ascontiguousarray(vectors), labels[keep])
+        return rebuilt
+
+    @staticmethod
+    def exists(directory: str = DEFAULT_INDEX_DIRECTORY, index_name: str = "index") -> bool:
+        """
+        Check whether a saved vector store is present in a directory.
+
+        Args:
+            directory (str): Directory the store was saved to. Defaults to the project's embeddings directory.
+            index_name (str): Base name of the saved files. Defaults to 'index'.
+
+        Returns:
+            bool: True if both the index and the docstore files exist.
+        """
+        if os.path.isfile(os.path.join(directory, f"{index_name}.shards.json")):
+            return True
+        return (
+            os.path.isfile(os.path.join(directory, f"{index_name}.faiss"))
+            and os.path.isfile(os.path.join(directory, f"{index_name}.pkl"))
+        )
+
+    @staticmethod
+    def save(vectorstore: FAISS, directory: str = DEFAULT_INDEX_DIRECTORY, index_name: str = "index"):
+        """
+        Save the FAISS index and its docstore to a directory.
+
+        Writes ``<index_name>.faiss`` (the raw index) and ``<index_name>.pkl``
+        (the docstore and the index-to-docstore ID mapping).
+
+        Args:
+            vectorstore (FAISS): The vector store to save.
+            directory (str): Target directory. Defaults to the project's embeddings directory.
+            index_name (str): Base name of the saved files. Defaults to 'index'.
+        """
+        if not isinstance(vectorstore, FAISS):
+            vectorstore.save(directory, index_name)
+            return
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            vectorstore.save_local(directory, index_name=index_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to save vector store: {e}")
+
+    @staticmethod
+    def load(embeddings, directory: str = DEFAULT_INDEX_DIRECTORY, index_name: str = "index", mmap: bool = True) -> VectorStore:
+        """
+        Load a vector store previously written by ``save``.
+
+        With ``mmap`` the index file is memory-mapped read-only, so loading is
+        near-instant and pages are shared between processes. Memory-mapped
+        indexes cannot be modified; load with ``mmap=False`` to add or delete
+        vectors. Index types that FAISS cannot map are read into memory instead.
+
+        Args:
+            embeddings: The embeddings model used for queries against the store.
+            directory (str): Directory the store was saved to. Defaults to the project's embeddings directory.
+            index_name (str): Base name of the saved files. Defaults to 'index'.
+            mmap (bool): Memory-map the index instead of reading it into RAM. Defaults to True.
+
+        Returns:
+            VectorStore: The loaded FAISS vector store instance, or a ``ShardedVectorStore``
+            if a sharded store was saved to the directory.
+        """
+        if os.path.isfile(os.path.join(directory, f"{index_name}.shards.json")):
+            from .sharded_store import ShardedVectorStore
+
+            return ShardedVectorStore.load(embeddings, directory, index_name, mmap)
+
+        index_path = os.path.join(directory, f"{index_name}.faiss")
+        docstore_path = os.path.join(directory, f"{index_name}.pkl")
+
+        try:
+            index = None
+            if mmap:
+                try:
+                    index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                except RuntimeError:
+                    index = None
+            if index is None:
+                index = faiss.read_index(index_path)
+
+            # The docstore file is written by this project, so unpickling it is trusted
+            with open(docstore_path, "rb") as file:
+                docstore, index_to_docstore_id = pickle.load(file)
+
+            # The distance strategy is not saved; derive it from the index metric
+            if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                distance_strategy = DistanceStrategy.MAX_INNER_PRODUCT
+            else:
+                distance_strategy = DistanceStrategy.EUCLIDEAN_DISTANCE
+            return FAISS(embeddings, index, docstore, index_to_docstore_id, distance_strategy=distance_strategy)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load vector store from {directory}: {e}")
+
 if __name__ == "__main__":
     # Example usage
     from sentence_transformers import SentenceTransformer
@@ -41,4 +507,9 @@ if __name__ == "__main__":
 
     # Create vector store
     vector_store = VectorStoreManager.create_vectorstore(documents, embeddings_model)
-    print("Vector store created successfully.")
\ No newline at end of file
+    print("Vector store created successfully.")
+
+    # Persist and reload the vector store
+    VectorStoreManager.save(vector_store)
+    reloaded_store = VectorStoreManager.load(embeddings_model)
+    print(f"Reloaded vector store with {reloaded_store.index.ntotal} vectors.")
\ No newline at end of file
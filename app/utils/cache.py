@@ -0,0 +1,281 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    A thread-safe in-memory LRU cache with optional time-to-live and hit/miss counters.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """
+        Initialize the LRUCache class.
+
+        Args:
+            maxsize (int): Maximum number of entries kept. Defaults to 1024.
+            ttl (float, optional): Seconds after which an entry expires. Defaults to None (never).
+            on_evict (Callable[[Hashable, Any], None], optional): Called with the key and value of
+                every entry dropped for size or age. Defaults to None.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value and mark it as most recently used.
+
+        Args:
+            key (Hashable): The key to look up.
+            default (Any, optional): Returned if the key is missing or expired. Defaults to None.
+
+        Returns:
+            Any: The cached value, or ``default``.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._evicted(key, value)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (Hashable): The key to store the value under.
+            value (Any): The value to store.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (value, expires_at)
+            while len(self._entries) > self.maxsize:
+                old_key, (old_value, _) = self._entries.popitem(last=False)
+                self._evicted(old_key, old_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove an entry without counting it as an eviction.
+
+        Args:
+            key (Hashable): The key to remove.
+            default (Any, optional): Returned if the key is missing. Defaults to None.
+
+        Returns:
+            Any: The removed value, or ``default``.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        """
+        Remove all entries. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Snapshot the entries from least to most recently used, without touching recency.
+
+        Returns:
+            List[Tuple[Hashable, Any]]: (key, value) pairs.
+        """
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            return entry is not _MISSING and not (entry[1] and entry[1] <= time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, current size and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def _evicted(self, key: Hashable, value: Any):
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+
+class DiskCache:
+    """
+    A persistent key/value store for binary values backed by a SQLite table.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    _MAX_PARAMS = 900
+
+    def __init__(self, path: str, table: str = "cache"):
+        """
+        Initialize the DiskCache class.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            table (str): Name of the table holding the entries. Defaults to 'cache'.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            self._connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to open disk cache {path}: {e}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a value by key.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            Optional[bytes]: The stored value, or None if the key does not exist.
+        """
+        with self._lock:
+            row = self._connection.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Get the values of several keys in as few queries as possible.
+
+        Args:
+            keys (List[str]): The keys to look up.
+
+        Returns:
+            Dict[str, bytes]: The stored values of the keys that exist.
+        """
+        found = {}
+        with self._lock:
+            for offset in range(0, len(keys), self._MAX_PARAMS):
+                chunk = keys[offset:offset + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                )
+                found.update(rows)
+        return found
+
+    def put(self, key: str, value: bytes):
+        """
+        Store a value under a key, replacing any existing value.
+
+        Args:
+            key (str): The key.
+            value (bytes): The value.
+        """
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, bytes]]):
+        """
+        Store several values in a single transaction.
+
+        Args:
+            items (Iterable[Tuple[str, bytes]]): (key, value) pairs.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)", items
+                )
+
+    def delete(self, key: str):
+        """
+        Delete a key if it exists.
+
+        Args:
+            key (str): The key to delete.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        Delete all entries.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+if __name__ == "__main__":
+    # Example usage
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # Evicts "b", the least recently used entry
+    print("Keys:", [key for key, _ in cache.items()])
+    print("Stats:", cache.stats)
+
+    disk_cache = DiskCache(":memory:")
+    disk_cache.put_many([("x", b"1"), ("y", b"2")])
+    print("Disk lookup:", disk_cache.get_many(["x", "y", "z"]))